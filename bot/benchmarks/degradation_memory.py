@@ -0,0 +1,80 @@
+import sys
+import time
+import pybamm
+import resource
+import multiprocessing
+from plotting.degradation_comparison_generator import DegradationComparisonGenerator
+
+
+def solve_degradation_comparison(summary_only, number):
+    """
+    Solves a Mohtat2020 "degradation comparison" and measures the peak memory of
+    the process. Should be called in a fresh (spawned) process.
+
+    Parameters
+    ----------
+        summary_only : bool
+            Passed to :class:`DegradationComparisonGenerator`.
+        number : int
+            Number of cycles.
+
+    Returns
+    -------
+        peak_memory : float
+            Peak resident set size in MB.
+        solve_time : float
+            Wall clock time in seconds.
+    """
+    chemistry = pybamm.parameter_sets.Mohtat2020
+    model = pybamm.lithium_ion.SPM(options={"SEI": "electron-migration limited"})
+    param_values = []
+    for value in [0.05, 0.09]:
+        parameter_values = pybamm.ParameterValues(chemistry=chemistry)
+        parameter_values["Inner SEI open-circuit potential [V]"] = value
+        param_values.append(parameter_values)
+    cycle = [
+        (
+            "Charge at 1 C until 4.2 V",
+            "Hold at 4.2 V until C/10",
+            "Rest for 5 minutes",
+            "Discharge at 1 C until 2.8 V",
+            "Rest for 5 minutes",
+        )
+    ]
+
+    start = time.perf_counter()
+    degradation_comparison_generator = DegradationComparisonGenerator(
+        model,
+        chemistry,
+        param_values,
+        "Inner SEI open-circuit potential [V]",
+        cycle,
+        number,
+        summary_only=summary_only,
+    )
+    degradation_comparison_generator.solve()
+    solve_time = time.perf_counter() - start
+
+    # kilobytes on Linux and bytes on macOS
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_memory /= 1024**2 if sys.platform == "darwin" else 1024
+
+    return peak_memory, solve_time
+
+
+if __name__ == "__main__":
+    # usage (from the bot directory) - python -m benchmarks.degradation_memory 500
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    # a fresh process for every run, so that the peak memory of a run does not
+    # include the memory of the previous one
+    context = multiprocessing.get_context("spawn")
+    for summary_only in [False, True]:
+        with context.Pool(1) as pool:
+            peak_memory, solve_time = pool.apply(
+                solve_degradation_comparison, (summary_only, number)
+            )
+        print(
+            f"summary_only={summary_only}, {number} cycles: "
+            f"peak memory {peak_memory:.1f} MB, solve time {solve_time:.1f} s"
+        )
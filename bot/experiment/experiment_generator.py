@@ -3,7 +3,7 @@ from utils.desired_decimal_point_generator import desired_decimal_point_generato
 import logging
 
 
-def experiment_generator(testing={"rest1": False, "rest2": False}):
+def experiment_generator(testing={"rest1": False, "rest2": False}, rng=random):
     """
     This function generates a random experiment with the template
     ["Discharge", "Rest?", "Charge", "Hold", "Rest?"].
@@ -15,6 +15,10 @@ def experiment_generator(testing={"rest1": False, "rest2": False}):
             default : {"rest1": False, "rest2": False}
             This should only be used while testing, to generate some
             not so random experiments.
+        rng : :class:`random.Random`
+            default : random
+            Random number generator, the global one of the `random` module if not
+            provided.
 
     Returns
     -------
@@ -25,11 +29,11 @@ def experiment_generator(testing={"rest1": False, "rest2": False}):
     rest = []
     hold = []
 
-    vmin = desired_decimal_point_generator(3.2, 3.7, 1)
-    vmax = desired_decimal_point_generator(3.7, 4.2, 1)
-    ccharge = random.randint(1, 3)
-    cdischarge = random.randint(1, 3)
-    ccutoff = random.randint(1, 100)
+    vmin = desired_decimal_point_generator(3.2, 3.7, 1, rng)
+    vmax = desired_decimal_point_generator(3.7, 4.2, 1, rng)
+    ccharge = rng.randint(1, 3)
+    cdischarge = rng.randint(1, 3)
+    ccutoff = rng.randint(1, 100)
 
     discharge.append(
         "Discharge at " + str(cdischarge) + " C until " + str(vmin) + " V",
@@ -41,8 +45,8 @@ def experiment_generator(testing={"rest1": False, "rest2": False}):
 
     rest.append(
         [
-            "Rest for " + str(random.randint(1, 10)) + " minutes",
-            "Rest for " + str(random.randint(1, 10)) + " minutes",
+            "Rest for " + str(rng.randint(1, 10)) + " minutes",
+            "Rest for " + str(rng.randint(1, 10)) + " minutes",
         ]
     )
 
@@ -50,16 +54,16 @@ def experiment_generator(testing={"rest1": False, "rest2": False}):
         "Hold at " + str(vmax) + " V until " + str(ccutoff) + " mA",
     )
 
-    random.shuffle(rest)
+    rng.shuffle(rest)
 
     cycle = []
 
     cycle.append(discharge[0])
-    if random.randint(0, 1) == 1 or testing["rest1"]:
+    if rng.randint(0, 1) == 1 or testing["rest1"]:
         cycle.append(rest[0][0])
     cycle.append(charge[0])
     cycle.append(hold[0])
-    if random.randint(0, 1) == 1 or testing["rest2"]:
+    if rng.randint(0, 1) == 1 or testing["rest2"]:
         cycle.append(rest[0][1])
 
     logging.basicConfig(level=logging.INFO)
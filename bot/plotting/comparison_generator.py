@@ -1,8 +1,22 @@
 import os
 import pybamm
+import numpy as np
 import random
+import multiprocessing
+from itertools import product
 from utils.resize_gif import resize_gif
-from utils.parameter_value_generator import parameter_value_generator
+from utils.parameter_value_generator import parameter_value_generator, FunctionLike
+from utils.experiment_cache import get_experiment
+from utils.initial_conditions import (
+    save_initial_conditions,
+    restore_initial_conditions,
+)
+from utils.parameter_constraints import check_parameter_value
+from plotting.gif_renderer import (
+    extract_plot_data,
+    render_gif_to_budget,
+    sample_solution,
+)
 
 
 class ComparisonGenerator:
@@ -49,6 +63,47 @@ class ComparisonGenerator:
             default : None
             A list of varied values which will override the default random values. To be
             used while replying.
+        model_cache : :class:`utils.model_cache.ModelCache`
+            default : None
+            Cache of built models. If provided, the built models are fetched from
+            (and stored in) the cache instead of being built by `pybamm.BatchStudy`.
+        processes : int
+            default : None
+            Number of worker processes used to solve the permutations of the
+            comparison, and to render the frames of a GIF rendered from the plotted
+            variables, in parallel. The permutations are solved (and the frames
+            rendered) one after another in this process if not provided.
+        sweep : bool
+            default : False
+            If True, "parameter comparison" builds the model only once, with the
+            varied parameter as an input parameter, and solves it for every varied
+            value.
+        solution_cache : :class:`utils.solution_cache.SolutionCache`
+            default : None
+            Cache of solved outputs. If provided, the plotted variables are stored
+            in the cache, and a configuration which has been solved before is
+            rendered from the cached plotted variables. Used only by the "direct"
+            renderer.
+        points_per_frame : int
+            default : None
+            If provided, a comparison without an experiment is solved on a uniform
+            time grid with about this many points per GIF frame. With a solution
+            cache, the solutions of an experiment are sampled on such a grid right
+            after they are solved (in the worker process, if any), keeping the time
+            steps around the step changes, and the full solutions are discarded. The
+            time steps of the solutions are kept if not provided.
+        experiment : :class:`pybamm.Experiment`
+            default : None
+            The experiment built from the cycle and the number, if it has already
+            been built (for example, to validate a reply). Fetched from
+            `utils.experiment_cache` if not provided.
+        renderer : str
+            default : "direct"
+            Can be "direct" or "quickplot". "direct" renders the plotted variables
+            with `plotting.gif_renderer`, with the layout of `pybamm.QuickPlot`,
+            directly at the size of the GIF and with the best encoding which fits
+            in Twitter's 15 MB limit. "quickplot" creates the GIF with
+            `pybamm.QuickPlot` and resizes it for Twitter.
     """
 
     def __init__(
@@ -61,7 +116,18 @@ class ComparisonGenerator:
         number=None,
         param_to_vary_info=None,
         varied_values_override=None,
+        model_cache=None,
+        processes=None,
+        sweep=False,
+        solution_cache=None,
+        points_per_frame=None,
+        experiment=None,
+        renderer="direct",
     ):
+        if renderer not in ["direct", "quickplot"]:
+            raise ValueError(
+                f"renderer must be 'direct' or 'quickplot', not '{renderer}'"
+            )
         self.models_for_comp = models_for_comp
         self.chemistry = chemistry
         self.is_experiment = is_experiment
@@ -82,19 +148,30 @@ class ComparisonGenerator:
             if param_to_vary_info is not None
             else None
         )
-        self.parameter_values = pybamm.ParameterValues(chemistry=self.chemistry)
+        if experiment is None and self.cycle is not None:
+            experiment = get_experiment(self.cycle, self.number)
         self.experiment = (
-            dict(list(enumerate([pybamm.Experiment(self.cycle * self.number)])))
-            if self.cycle is not None
-            else None
+            dict(list(enumerate([experiment]))) if experiment is not None else None
         )
         self.comparison_dict = {}
         self.params = params
         self.varied_values_override = varied_values_override
+        self.model_cache = model_cache
+        self.processes = processes
+        self.sweep = sweep
+        self.solution_cache = solution_cache
+        self.points_per_frame = points_per_frame
+        self.renderer = renderer
 
-    def calculate_t_end(self, parameter_values_for_comp, force=False):
+    def calculate_t_end(self, parameter_values_for_comp):
         """
-        Calculates the t_end for t_eval (t_eval=[0, t_end]).
+        Calculates the t_end for t_eval (t_eval=[0, t_end]) of a constant current
+        comparison. The solver stops every permutation at its voltage cut-off
+        event, hence t_end is only an upper bound, twice the time in which the
+        slowest permutation discharges its nominal capacity. The plotting range is
+        then set by the actual termination times of the permutations. A permutation
+        with a zero or negative current never discharges the cell, and is bounded by
+        the fixed t_end of 3700 seconds used before.
 
         Parameters
         ----------
@@ -104,57 +181,220 @@ class ComparisonGenerator:
                     0: pybamm.ParameterValues,
                     1: pybamm.ParameterValues
                 }
-            force : bool
-                default : False
-                To be used to force the calculation of t_end.
         """
-        # find the minimum value for "Current function [A]"
-        if self.param_to_vary == "Current function [A]" or force:
-            # find the minimum value for "Current function [A]"
-            min_curr_value = min(
-                [
-                    item["Current function [A]"]
-                    for k, item in parameter_values_for_comp.items()
-                ]
-            )
-            factor = min_curr_value / self.parameter_values["Current function [A]"]
-            t_end = (1 / factor * 1.1) * 3600
-        else:
-            t_end = 3700
+        t_end = max(
+            [
+                2
+                * item["Nominal cell capacity [A.h]"]
+                / item["Current function [A]"]
+                * 3600
+                if item["Current function [A]"] > 0
+                else 3700
+                for k, item in parameter_values_for_comp.items()
+            ]
+        )
 
         return t_end
 
-    def create_gif(self, batch_study, testing=False):
+    def solve_batch_study(self, batch_study, t_eval=None, number_of_points=None):
         """
-        Create and resize a GIF.
+        Solves all the permutations of a BatchStudy. If a model cache, a number of
+        worker processes or a number of points is provided, the permutations are
+        solved using `solve_permutation` and the solutions are stored in
+        `batch_study.sims`, in the same order as `pybamm.BatchStudy` would have
+        solved them.
 
         Parameters
         ----------
-        batch_study : :class:`pybamm.BatchStudy`
-            Object of BatchStudy.
-        testing : bool
-            default : False
-            To be used while testing to generate less number of plots.
+            batch_study : :class:`pybamm.BatchStudy`
+                Object of BatchStudy.
+            t_eval : list or numpy.ndarray
+                default : None
+                Should be of the form - [0, t_end], or a time grid from 0 to t_end.
+                Provide only when the comparison does not include an experiment.
+            number_of_points : int
+                default : None
+                If provided, the solutions are replaced by their samples on a
+                uniform time grid with this many points. See
+                `plotting.gif_renderer.sample_solution`.
         """
-        if not testing:
-            batch_study.create_gif()
+        # the eSOH calculation fails for Ai2020 parameters with an experiment
+        calc_esoh = not (
+            self.is_experiment and self.chemistry == pybamm.parameter_sets.Ai2020
+        )
+
+        if (
+            self.model_cache is None
+            and self.processes is None
+            and number_of_points is None
+        ):
+            batch_study.solve(t_eval, calc_esoh=calc_esoh)
+            return
+
+        experiments = batch_study.experiments or {None: None}
+        permutations = [
+            (
+                model,
+                self.chemistry,
+                parameter_values,
+                experiment,
+                t_eval,
+                calc_esoh,
+                self.model_cache,
+                number_of_points,
+            )
+            for model, parameter_values, experiment in product(
+                batch_study.models.values(),
+                batch_study.parameter_values.values(),
+                experiments.values(),
+            )
+        ]
+
+        if self.processes is None:
+            batch_study.sims = [solve_permutation(*args) for args in permutations]
         else:
-            batch_study.create_gif(number_of_images=3, duration=1)
+            # every permutation is solved in its own worker process, and the
+            # solutions are collected in order
+            with multiprocessing.Pool(min(self.processes, len(permutations))) as pool:
+                batch_study.sims = pool.starmap(solve_permutation, permutations)
 
-        # resizing the GIF for Twitter
-        resize_gif("plot.gif", resize_to=(1440, 1440))
+    def solve_sweep(self, batch_study, param_list, t_eval=None, number_of_points=None):
+        """
+        Builds the model once, with `self.param_to_vary` as an input parameter, and
+        solves it for the varied value of every parameter set. Without an
+        experiment, and if a number of worker processes is provided, all the varied
+        values are solved in a single call of the solver, spread across the worker
+        processes, unless the initial conditions depend on the input parameters
+        (the solver sets them up once for all the inputs). The solutions are stored
+        in `batch_study.sims`, in the same order as the parameter sets.
 
-        if os.path.getsize("plot.gif") >= 15728640:  # pragma: no cover
-            resize_gif("plot.gif", resize_to=(1080, 1080))
+        Parameters
+        ----------
+            batch_study : :class:`pybamm.BatchStudy`
+                Object of BatchStudy.
+            param_list : list
+                Parameter values which differ only in `self.param_to_vary`. Should be
+                of the form - [:class:`pybamm.ParameterValues`]
+            t_eval : list or numpy.ndarray
+                default : None
+                Should be of the form - [0, t_end], or a time grid from 0 to t_end.
+                Provide only when the comparison does not include an experiment.
+            number_of_points : int
+                default : None
+                If provided, the solutions are replaced by their samples on a
+                uniform time grid with this many points.
 
-    def model_comparison(self, testing=False):
+        Returns
+        -------
+            is_solved : bool
+                False if the model could not be built with the varied parameter as
+                an input parameter (for example, for a geometric parameter).
         """
-        Generates a comparison GIF with 2 or more models.
+        sweep_params = self.params.copy()
+        inputs = []
+        for params in param_list:
+            value = params[self.param_to_vary]
+            # scaled functions keep the function and scale it with the input
+            if isinstance(value, FunctionLike):
+                sweep_params[self.param_to_vary] = FunctionLike(
+                    value.fun, pybamm.InputParameter(self.param_to_vary)
+                )
+                inputs.append({self.param_to_vary: value.parameter})
+            else:
+                sweep_params[self.param_to_vary] = "[input]"
+                inputs.append({self.param_to_vary: value})
+
+        model = list(self.models_for_comp.values())[0]
+        experiment = self.experiment[0] if self.experiment is not None else None
+        try:
+            if self.model_cache is not None:
+                sim, cached_inputs = self.model_cache.get_simulation(
+                    model, self.chemistry, sweep_params, experiment
+                )
+                inputs = [
+                    {**cached_inputs, **sweep_inputs} for sweep_inputs in inputs
+                ]
+            else:
+                sim = pybamm.Simulation(
+                    model, experiment=experiment, parameter_values=sweep_params
+                )
+                if experiment is None:
+                    sim.build()
+                else:
+                    sim.build_for_experiment()
+        except Exception:
+            return False
+
+        if (
+            experiment is None
+            and self.processes is not None
+            and len(inputs) > 1
+            and not has_input_initial_conditions(sim.built_model)
+        ):
+            # a single solver call solves the built model for all the inputs in
+            # worker processes, and returns the solutions in the order of the inputs
+            solutions = sim.solver.solve(
+                sim.built_model,
+                t_eval,
+                inputs=inputs,
+                nproc=min(self.processes, len(inputs)),
+            )
+        else:
+            # the eSOH calculation fails for Ai2020 parameters with an experiment,
+            # and pybamm solves the eSOH model without the inputs
+            calc_esoh = not (
+                self.is_experiment and self.chemistry == pybamm.parameter_sets.Ai2020
+            ) and (experiment is None or not esoh_has_inputs(sim.parameter_values))
+            # solving an experiment replaces the initial conditions of the step
+            # models
+            initial_conditions = (
+                save_initial_conditions(sim) if experiment is not None else {}
+            )
+            solutions = []
+            for sweep_inputs in inputs:
+                restore_initial_conditions(initial_conditions)
+                sim.solve(t_eval, calc_esoh=calc_esoh, inputs=sweep_inputs)
+                solutions.append(sim.solution)
+
+        if number_of_points is None:
+            batch_study.sims = solutions
+        else:
+            batch_study.sims = [
+                sample_solution(solution, number_of_points=number_of_points)
+                for solution in solutions
+            ]
+
+        return True
+
+    def solve(self, parameter_values_for_comp, number_of_points=None, sample=True):
         """
-        # convert the list containing parameter values to a
-        # dictionary for pybamm.BatchStudy
-        parameter_values_for_comp = dict(list(enumerate([self.params])))
+        Solves all the permutations of the comparison. If a number of points is
+        provided, a comparison without an experiment is solved on a uniform time
+        grid, and the solutions of an experiment are sampled right after they are
+        solved.
+
+        Parameters
+        ----------
+            parameter_values_for_comp : dict
+                Of the form -
+                {
+                    0: pybamm.ParameterValues,
+                    1: pybamm.ParameterValues
+                }
+            number_of_points : int
+                default : None
+                Number of points of the uniform time grid in the plotted range. See
+                `plotting.gif_renderer.sample_solution`.
+            sample : bool
+                default : True
+                If False, the full solutions of an experiment are kept (for
+                example, for `pybamm.QuickPlot`).
 
+        Returns
+        -------
+            batch_study : :class:`pybamm.BatchStudy`
+                Object of BatchStudy, with the solutions in `batch_study.sims`.
+        """
         batch_study = pybamm.BatchStudy(
             models=self.models_for_comp,
             parameter_values=parameter_values_for_comp,
@@ -163,15 +403,173 @@ class ComparisonGenerator:
         )
 
         if self.is_experiment:
-            if self.chemistry == pybamm.parameter_sets.Ai2020:
-                batch_study.solve(calc_esoh=False)
-            else:
-                batch_study.solve()
+            t_eval = None
+            if not sample:
+                number_of_points = None
         else:
-            t_end = self.calculate_t_end(parameter_values_for_comp, force=True)
-            batch_study.solve([0, t_end])
+            # the solver stops at the voltage cut-off events before t_end
+            t_end = self.calculate_t_end(parameter_values_for_comp)
+            if number_of_points is None:
+                t_eval = [0, t_end]
+            else:
+                # t_end is twice the discharge time of the slowest permutation, the
+                # solver returns the solutions on the grid and nothing is sampled
+                t_eval = np.linspace(0, t_end, 2 * number_of_points)
+                number_of_points = None
+
+        # fall back to solving every parameter set separately if the varied
+        # parameter cannot be an input parameter
+        if (
+            not self.sweep
+            or self.param_to_vary is None
+            or not self.solve_sweep(
+                batch_study,
+                list(parameter_values_for_comp.values()),
+                t_eval,
+                number_of_points,
+            )
+        ):
+            self.solve_batch_study(batch_study, t_eval, number_of_points)
 
-        self.create_gif(batch_study, testing)
+        return batch_study
+
+    def number_of_points(self, number_of_images):
+        """
+        Returns the number of points of the uniform time grid of the solutions.
+
+        Parameters
+        ----------
+            number_of_images : int
+                Number of frames in the GIF.
+
+        Returns
+        -------
+            number_of_points : int or None
+                None if the time steps of the solutions are kept.
+        """
+        if self.points_per_frame is None:
+            return None
+        return number_of_images * self.points_per_frame
+
+    def generate_plot_data(self, parameter_values_for_comp, labels, testing=False):
+        """
+        Solves the comparison and extracts the plotted variables. If a solution cache
+        is provided, the plotted variables of a configuration which has been solved
+        before are loaded from the cache instead.
+
+        Parameters
+        ----------
+            parameter_values_for_comp : dict
+                Of the form -
+                {
+                    0: pybamm.ParameterValues,
+                    1: pybamm.ParameterValues
+                }
+            labels : list
+                Legend labels of the permutations.
+            testing : bool
+                default : False
+                To be used while testing to generate less number of plots.
+
+        Returns
+        -------
+            plot_data : dict
+                See `plotting.gif_renderer.extract_plot_data`.
+        """
+        number_of_images = 80 if not testing else 3
+        number_of_points = self.number_of_points(number_of_images)
+
+        if self.solution_cache is not None:
+            key = self.solution_cache.key(
+                self.chemistry,
+                list(self.models_for_comp.values()),
+                self.cycle,
+                self.number,
+                parameter_values_for_comp,
+                labels,
+                number_of_images,
+                number_of_points,
+            )
+            plot_data = self.solution_cache.get(key)
+            if plot_data is not None:
+                return plot_data
+
+        batch_study = self.solve(parameter_values_for_comp, number_of_points)
+        plot_data = extract_plot_data(batch_study.sims, labels, number_of_images)
+
+        if self.solution_cache is not None:
+            self.solution_cache.put(key, plot_data)
+
+        return plot_data
+
+    def create_gif(self, parameter_values_for_comp, labels, testing=False):
+        """
+        Solves the comparison and creates the GIF with `self.renderer`.
+
+        Parameters
+        ----------
+        parameter_values_for_comp : dict
+            Of the form -
+            {
+                0: pybamm.ParameterValues,
+                1: pybamm.ParameterValues
+            }
+        labels : list
+            Legend labels of the permutations.
+        testing : bool
+            default : False
+            To be used while testing to generate less number of plots.
+        """
+        if self.renderer == "quickplot":
+            number_of_images = 80 if not testing else 3
+            batch_study = self.solve(
+                parameter_values_for_comp,
+                self.number_of_points(number_of_images),
+                sample=False,
+            )
+
+            # call the plot method first to pass labels
+            batch_study.plot(labels=labels, testing=True)
+
+            if not testing:
+                batch_study.create_gif()
+            else:
+                batch_study.create_gif(
+                    number_of_images=number_of_images, duration=1
+                )
+
+            # resizing the GIF for Twitter
+            resize_gif("plot.gif", resize_to=(1440, 1440))
+
+            if os.path.getsize("plot.gif") >= 15728640:  # pragma: no cover
+                resize_gif("plot.gif", resize_to=(1080, 1080))
+            return
+
+        plot_data = self.generate_plot_data(parameter_values_for_comp, labels, testing)
+        duration = 0.1 if not testing else 1
+
+        # the size of the GIF is predicted from a sample of frames, so that the
+        # full GIF is encoded only once
+        render_gif_to_budget(
+            plot_data,
+            duration=duration,
+            max_bytes=15728640,
+            processes=self.processes,
+        )
+
+    def model_comparison(self, testing=False):
+        """
+        Generates a comparison GIF with 2 or more models.
+        """
+        # convert the list containing parameter values to a
+        # dictionary for pybamm.BatchStudy
+        parameter_values_for_comp = dict(list(enumerate([self.params])))
+
+        self.create_gif(
+            parameter_values_for_comp,
+            [model.name for model in self.models_for_comp.values()],
+            testing,
+        )
 
         self.comparison_dict.update(
             {
@@ -209,6 +607,9 @@ class ComparisonGenerator:
                 )
             else:
                 params = self.params.copy()
+                check_parameter_value(
+                    params, self.param_to_vary, self.varied_values_override[i]
+                )
                 params[self.param_to_vary] = self.varied_values_override[i]
 
             # append the varied values in `labels` which will be used
@@ -246,27 +647,113 @@ class ComparisonGenerator:
         # for pybamm.BatchStudy
         parameter_values_for_comp = dict(list(enumerate(param_list)))
 
-        batch_study = pybamm.BatchStudy(
-            models=self.models_for_comp,
-            parameter_values=parameter_values_for_comp,
-            experiments=self.experiment,
-            permutations=True,
+        # the drawn values are known even if the comparison fails to solve
+        self.comparison_dict.update(
+            {"varied_values": varied_values, "params": parameter_values_for_comp}
         )
 
-        if self.is_experiment:
-            if self.chemistry == pybamm.parameter_sets.Ai2020:
-                batch_study.solve(calc_esoh=False)
-            else:
-                batch_study.solve()
-        else:
-            t_end = self.calculate_t_end(parameter_values_for_comp)
-            batch_study.solve([0, t_end])
+        self.create_gif(parameter_values_for_comp, labels, testing)
+
 
-        # call the plot method first to pass labels
-        batch_study.plot(labels=labels, testing=True)
+def has_input_initial_conditions(model):
+    """
+    Checks if the initial conditions of a built model depend on an input
+    parameter.
 
-        self.create_gif(batch_study, testing)
+    Parameters
+    ----------
+        model : :class:`pybamm.BaseModel`
 
-        self.comparison_dict.update(
-            {"varied_values": varied_values, "params": parameter_values_for_comp}
+    Returns
+    -------
+        has_input_initial_conditions : bool
+    """
+    return any(
+        isinstance(symbol, pybamm.InputParameter)
+        for symbol in model.concatenated_initial_conditions.pre_order()
+    )
+
+
+def esoh_has_inputs(parameter_values):
+    """
+    Checks if the eSOH model, which pybamm solves while solving an experiment,
+    depends on an input parameter. The eSOH model is solved without the inputs of
+    the simulation, and its calculation fails if it depends on one (for example,
+    on a varied voltage cut-off).
+
+    Parameters
+    ----------
+        parameter_values : :class:`pybamm.ParameterValues`
+            Parameter values of the simulation, with the input parameters.
+
+    Returns
+    -------
+        esoh_has_inputs : bool
+    """
+    # the voltage cut-offs are read from the parameter values
+    for name in ["Lower voltage cut-off [V]", "Upper voltage cut-off [V]"]:
+        if isinstance(parameter_values[name], pybamm.InputParameter):
+            return True
+
+    model = pybamm.lithium_ion.ElectrodeSOH()
+    processed_model = parameter_values.process_model(model, inplace=False)
+
+    def input_names(model):
+        return {
+            symbol.name
+            for equation in [*model.algebraic.values(), *model.variables.values()]
+            for symbol in equation.pre_order()
+            if isinstance(symbol, pybamm.InputParameter)
+        }
+
+    # the inputs of the eSOH model itself are provided by pybamm
+    return bool(input_names(processed_model) - input_names(model))
+
+
+def solve_permutation(
+    model,
+    chemistry,
+    parameter_values,
+    experiment,
+    t_eval,
+    calc_esoh,
+    model_cache,
+    number_of_points=None,
+):
+    """
+    Solves a single permutation of a comparison. Defined at the module level so
+    that it can be sent to worker processes.
+
+    Parameters
+    ----------
+        model : :class:`pybamm.BaseBatteryModel`
+        chemistry : dict
+        parameter_values : :class:`pybamm.ParameterValues`
+        experiment : :class:`pybamm.Experiment` or None
+        t_eval : list or None
+        calc_esoh : bool
+        model_cache : :class:`utils.model_cache.ModelCache` or None
+            If provided, the built model is taken from the cache.
+        number_of_points : int
+            default : None
+            If provided, only the sample of the solution on a uniform time grid
+            with this many points is returned.
+
+    Returns
+    -------
+        solution : :class:`pybamm.Solution` or dict
+    """
+    inputs = {}
+    if model_cache is not None:
+        sim, inputs = model_cache.get_simulation(
+            model, chemistry, parameter_values, experiment
         )
+    else:
+        sim = pybamm.Simulation(
+            model, experiment=experiment, parameter_values=parameter_values
+        )
+    sim.solve(t_eval, calc_esoh=calc_esoh, inputs=inputs)
+
+    if number_of_points is not None:
+        return sample_solution(sim.solution, number_of_points=number_of_points)
+    return sim.solution
@@ -0,0 +1,250 @@
+import random
+import pybamm
+import numpy as np
+from plotting.config_generator import (
+    chemistries,
+    model_classes,
+    particle_mechanics_list,
+    sei_list,
+    param_to_vary_dict,
+    create_model,
+)
+from experiment.experiment_generator import experiment_generator
+from utils.parameter_value_generator import parameter_bounds, set_parameter_value
+from utils.parameter_constraints import check_parameter_value
+from utils.degradation_parameter_generator import degradation_parameter_dict
+
+
+def config_batch_generator(choice, number_of_configs, seed=None):
+    """
+    Generates a batch of random configurations to plot, with the same structure as
+    the configurations generated by `config_generator`. All the random numbers are
+    drawn at once, from an independent random number generator, so that the same
+    seed always gives the same batch. As in `config_generator`, the values of the
+    parameter varied in a "parameter comparison" are not a part of the
+    configuration, they are drawn by `ComparisonGenerator.parameter_comparison`
+    (which draws only physical values).
+
+    Parameters
+    ----------
+        choice : str
+            Can be "model comparison", "parameter comparison" or
+            "degradation comparison".
+        number_of_configs : int
+            Number of configurations in the batch.
+        seed : int
+            default : None
+            Seed of the random number generator.
+
+    Returns
+    -------
+        configs : list
+            Of the form - [dict]
+    """
+    rng = np.random.default_rng(seed)
+    n = number_of_configs
+
+    if choice == "degradation comparison":
+        return degradation_configs(rng, n)
+
+    # categorical draws
+    chemistry_indices = rng.integers(len(chemistries), size=n)
+    is_experiment = rng.integers(2, size=n).astype(bool)
+    if choice == "model comparison":
+        number_of_comp = rng.integers(2, 4, size=n)
+    else:
+        number_of_comp = np.ones(n, dtype=int)
+    # a random permutation of the models for every configuration
+    model_orders = np.argsort(rng.random((n, len(model_classes))), axis=1)
+    cycles, numbers = experiment_draws(rng, n)
+
+    # numerical draws, scaled to the bounds of every configuration
+    temperatures = np.round(rng.uniform(265, 355, size=n), 5)
+    current_scales = rng.random(n)
+    param_to_vary_indices = rng.integers(len(param_to_vary_dict), size=n)
+
+    configs = []
+    for i in range(n):
+        chemistry = chemistries[chemistry_indices[i]]
+        params = pybamm.ParameterValues(chemistry=chemistry)
+        params["Ambient temperature [K]"] = float(temperatures[i])
+        if not is_experiment[i]:
+            lower_bound, upper_bound = parameter_bounds(
+                params, "Current function [A]", (None, None)
+            )
+            params["Current function [A]"] = round(
+                lower_bound + current_scales[i] * (upper_bound - lower_bound), 5
+            )
+
+        models_for_comp = dict(
+            list(
+                enumerate(
+                    [
+                        create_model((model_classes[j], None))
+                        for j in model_orders[i][: number_of_comp[i]]
+                    ]
+                )
+            )
+        )
+
+        if choice == "parameter comparison":
+            param_to_vary = list(param_to_vary_dict.keys())[param_to_vary_indices[i]]
+            param_to_vary_info = {
+                param_to_vary: dict(param_to_vary_dict[param_to_vary])
+            }
+        else:
+            param_to_vary_info = None
+
+        configs.append(
+            {
+                "chemistry": chemistry,
+                "models_for_comp": models_for_comp,
+                "is_experiment": bool(is_experiment[i]),
+                "cycle": cycles[i] if is_experiment[i] else None,
+                "number": int(numbers[i]) if is_experiment[i] else None,
+                "param_to_vary_info": param_to_vary_info,
+                "params": params,
+                "varied_values_override": None,
+            }
+        )
+
+    return configs
+
+
+def degradation_configs(rng, n):
+    """
+    Generates a batch of random "degradation comparison" configurations.
+
+    Parameters
+    ----------
+        rng : :class:`numpy.random.Generator`
+        n : int
+            Number of configurations in the batch.
+
+    Returns
+    -------
+        configs : list
+            Of the form - [dict]
+    """
+    # use only Mohtat2020 and SPM till others are fixed, as in `config_generator`
+    chemistry = pybamm.parameter_sets.Mohtat2020
+    is_sei = rng.integers(2, size=n).astype(bool)
+    sei_indices = rng.integers(len(sei_list), size=n)
+    sei_porosity_change = rng.integers(2, size=n).astype(bool)
+    cycles, _ = experiment_draws(rng, n)
+    number_of_comp = rng.integers(2, 4, size=n)
+    degradation_parameter_scales = rng.random(n)
+    varied_value_scales = rng.random((n, 3))
+
+    configs = []
+    for i in range(n):
+        if is_sei[i]:
+            degradation_mode = "SEI"
+            degradation_value = sei_list[sei_indices[i]]
+        else:
+            degradation_mode = "particle mechanics"
+            degradation_value = particle_mechanics_list[0]
+        model_options = {
+            degradation_mode: degradation_value,
+            "loss of active material": "none" if is_sei[i] else "stress-driven",
+            "SEI porosity change": (
+                "true" if is_sei[i] and sei_porosity_change[i] else "false"
+            ),
+        }
+
+        params, degradation_parameters = degradation_parameter_dict(
+            chemistry, degradation_mode, degradation_value
+        )
+        degradation_parameter = list(degradation_parameters.keys())[
+            int(degradation_parameter_scales[i] * len(degradation_parameters))
+        ]
+        values = varied_values(
+            params,
+            degradation_parameter,
+            degradation_parameters[degradation_parameter]["bounds"],
+            varied_value_scales[i][: number_of_comp[i]],
+        )
+        param_values = []
+        for value in values:
+            varied_params = params.copy()
+            varied_params[degradation_parameter] = value
+            param_values.append(varied_params)
+
+        configs.append(
+            {
+                "model": create_model((pybamm.lithium_ion.SPM, model_options)),
+                "chemistry": chemistry,
+                "cycle": cycles[i],
+                "number": 500,
+                "degradation_mode": degradation_mode,
+                "degradation_value": degradation_value,
+                "param_values": param_values,
+                "degradation_parameter": degradation_parameter,
+                "varied_values": [
+                    varied_params[degradation_parameter]
+                    for varied_params in param_values
+                ],
+            }
+        )
+
+    return configs
+
+
+def experiment_draws(rng, n):
+    """
+    Generates a batch of random experiments with `experiment_generator`, from a
+    random number generator seeded by rng.
+
+    Parameters
+    ----------
+        rng : :class:`numpy.random.Generator`
+        n : int
+            Number of experiments in the batch.
+
+    Returns
+    -------
+        cycles : list
+            Of the form - [[tuple]]
+        numbers : numpy.ndarray
+            Number with which every cycle is multiplied in a comparison.
+    """
+    experiment_rng = random.Random(int(rng.integers(2**32)))
+    cycles = [experiment_generator(rng=experiment_rng) for _ in range(n)]
+    numbers = rng.integers(1, 4, size=n)
+
+    return cycles, numbers
+
+
+def varied_values(params, parameter, bounds, scales):
+    """
+    Scales uniform random numbers to the bounds of a parameter, clamped to its
+    physical domain.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+        bounds : tuple
+            Of the form - (lower_bound, upper_bound), where lower_bound and
+            upper_bound can be either numerical or None.
+        scales : numpy.ndarray
+            Uniform random numbers in [0, 1).
+
+    Returns
+    -------
+        values : list
+            Values of the parameter, a function is scaled by the values.
+    """
+    lower_bound, upper_bound = parameter_bounds(params, parameter, bounds)
+    values = []
+    for value in np.clip(
+        np.round(lower_bound + scales * (upper_bound - lower_bound), 5),
+        lower_bound,
+        upper_bound,
+    ):
+        check_parameter_value(params, parameter, float(value))
+        varied_params = {parameter: params[parameter]}
+        set_parameter_value(varied_params, parameter, float(value))
+        values.append(varied_params[parameter])
+
+    return values
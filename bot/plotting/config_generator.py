@@ -11,6 +11,13 @@ chemistries = [
     pybamm.parameter_sets.Marquis2019,
 ]
 
+# possible models for the bot, a model is only created once it is selected
+model_classes = [
+    pybamm.lithium_ion.DFN,
+    pybamm.lithium_ion.SPM,
+    pybamm.lithium_ion.SPMe,
+]
+
 # possible "particle mechanics" for the bot, to be used with Ai2020 parameters
 particle_mechanics_list = [
     "swelling only",
@@ -74,6 +81,9 @@ def config_generator(
         "number_of_comp": None,
         "degradation_mode": None,
     },
+    cost_estimator=None,
+    max_attempts=10,
+    failure_memo=None,
 ):
     """
     Generates a random configuration to plot.
@@ -86,11 +96,46 @@ def config_generator(
         test_config : dict
             Should be used while testing to deterministically test this
             function.
+        cost_estimator : :class:`utils.cost_estimator.CostEstimator`
+            default : None
+            If provided, configurations which are predicted to take longer than
+            the budget of the estimator are resampled.
+        max_attempts : int
+            default : 10
+            Maximum number of configurations generated when a cost estimator or a
+            failure memo is provided. The configuration least likely to fail, and
+            then the cheapest one, is returned if all of them are rejected.
+        failure_memo : :class:`utils.failure_memo.FailureMemo`
+            default : None
+            If provided, configurations similar to the ones which often failed to
+            solve are skipped or down-weighted.
 
     Returns
     -------
         config: dict
     """
+    if cost_estimator is not None or failure_memo is not None:
+        configs = []
+        for _ in range(max_attempts):
+            config = config_generator(choice, test_config)
+            if (
+                cost_estimator is None or cost_estimator.is_affordable(config, choice)
+            ) and (failure_memo is None or failure_memo.accept(config, choice)):
+                return config
+            configs.append(config)
+
+        return min(
+            configs,
+            key=lambda config: (
+                failure_memo.failure_rate(config, choice)
+                if failure_memo is not None
+                else 0,
+                cost_estimator.predict(config, choice)
+                if cost_estimator is not None
+                else 0,
+            ),
+        )
+
     config = {}
     model_options = {}
 
@@ -151,12 +196,8 @@ def config_generator(
     else:
         model_options = None
 
-    # list of all the possible models
-    models = [
-        pybamm.lithium_ion.DFN(options=model_options),
-        pybamm.lithium_ion.SPM(options=model_options),
-        pybamm.lithium_ion.SPMe(options=model_options),
-    ]
+    # specs of all the possible models, of the form - (model class, options)
+    model_specs = [(model_class, model_options) for model_class in model_classes]
 
     # choose random configuration for no degradation
     if choice == "model comparison" or choice == "parameter comparison":
@@ -171,8 +212,10 @@ def config_generator(
             number_of_comp = 1
 
         # selecting the models for comparison
-        random.shuffle(models)
-        models_for_comp = models[:number_of_comp]
+        random.shuffle(model_specs)
+        models_for_comp = [
+            create_model(model_spec) for model_spec in model_specs[:number_of_comp]
+        ]
         models_for_comp = dict(list(enumerate(models_for_comp)))
 
         # if the comparison should be made with an experiment
@@ -236,7 +279,7 @@ def config_generator(
     elif choice == "degradation comparison":
 
         # choosing a random model
-        model = models[1]
+        model = create_model(model_specs[1])
 
         # choosing a random experiment
         cycle = experiment_generator()
@@ -270,3 +313,20 @@ def config_generator(
         )
 
     return config
+
+
+def create_model(model_spec):
+    """
+    Creates a model from its spec.
+
+    Parameters
+    ----------
+        model_spec : tuple
+            Of the form - (model class, options)
+
+    Returns
+    -------
+        model : :class:`pybamm.BaseBatteryModel`
+    """
+    model_class, options = model_spec
+    return model_class(options=options)
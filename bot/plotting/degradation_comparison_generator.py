@@ -1,6 +1,14 @@
 import pybamm
 import numpy as np
+import multiprocessing
 import matplotlib.pyplot as plt
+from utils.experiment_cache import get_experiment
+from utils.custom_process import available_cpus
+from utils.parameter_value_generator import FunctionLike
+from utils.initial_conditions import (
+    save_initial_conditions,
+    restore_initial_conditions,
+)
 
 
 class DegradationComparisonGenerator:
@@ -27,6 +35,30 @@ class DegradationComparisonGenerator:
             Experiment cycle to be used in the comparison.
         number : numerical
             Number with which the cycle is multiplied.
+        processes : int
+            default : None
+            Number of worker processes used to solve the parameter values in
+            parallel, bounded by the number of available cores. Only the summary
+            variables are sent back from the workers. The parameter values are
+            solved one after another in this process if not provided.
+        solution_cache : :class:`utils.solution_cache.SolutionCache`
+            default : None
+            Cache of solved outputs. If provided, the plotted summary variables of a
+            configuration which has been solved before are loaded from the cache.
+        summary_only : bool
+            default : False
+            If True, only the summary variables and the full solutions of the
+            first and the last solved cycle are stored, instead of the full
+            solution of every cycle. The last solved cycle is solved again if the
+            capacity termination stops the experiment early, see
+            `solve_last_cycle`.
+        sweep : bool
+            default : False
+            If True, the model and the experiment step models are built only once,
+            with the degradation parameter as an input parameter, and solved for
+            every varied value (in the worker processes, if a number of processes
+            is provided). Falls back to a simulation for every parameter values if
+            the degradation parameter cannot be an input parameter.
     """
 
     def __init__(
@@ -37,6 +69,10 @@ class DegradationComparisonGenerator:
         degradation_parameter,
         cycle,
         number,
+        processes=None,
+        solution_cache=None,
+        summary_only=False,
+        sweep=False,
     ):
         self.model = model
         self.chemistry = chemistry
@@ -44,6 +80,23 @@ class DegradationComparisonGenerator:
         self.degradation_parameter = degradation_parameter
         self.cycle = cycle
         self.number = number
+        self.processes = processes
+        self.solution_cache = solution_cache
+        self.summary_only = summary_only
+        self.sweep = sweep
+
+    def save_at_cycles(self):
+        """
+        Returns the cycles of which the full solutions are stored while solving.
+        The last cycle of an experiment which stops early is not one of them, see
+        `solve_last_cycle`.
+
+        Returns
+        -------
+            save_at_cycles : list or None
+                None if all the cycles are stored.
+        """
+        return [1, self.number] if self.summary_only else None
 
     def create_simulation(self, experiment):
         """
@@ -70,56 +123,309 @@ class DegradationComparisonGenerator:
         # simulation every time
         for i in range(0, len(self.param_values)):
 
-            sim = pybamm.Simulation(
-                model=self.model,
-                experiment=experiment,
-                parameter_values=self.param_values[i],
+            sim = solve_degradation_simulation(
+                self.model,
+                self.chemistry,
+                self.param_values[i],
+                experiment,
+                self.save_at_cycles(),
             )
-            if self.chemistry == pybamm.parameter_sets.Ai2020:  # pragma: no cover
-                sim.solve(calc_esoh=False)
-            elif self.chemistry == pybamm.parameter_sets.Mohtat2020:
-                sim.solve(initial_soc=1)
-            else:  # pragma: no cover
-                sim.solve()
+            if self.summary_only:
+                solve_last_cycle(sim)
             solution = sim.solution
 
             # storing solution with the corresponding label
-            val = self.param_values[i][self.degradation_parameter]
             solutions_and_labels.append(
                 [
                     solution,
-                    self.degradation_parameter
-                    + ": "
-                    + ("{:.5e}".format(val) if val > 10 or val < 1 else str(val)),
+                    degradation_label(
+                        self.degradation_parameter,
+                        self.param_values[i][self.degradation_parameter],
+                    ),
                 ]
             )
         return sim, solutions_and_labels
 
+    def build_sweep(self, experiment):
+        """
+        Builds the simulation once, with `self.degradation_parameter` as an input
+        parameter.
+
+        Parameters
+        ----------
+            experiment : :class:`pybamm.Experiment`
+                The experiment to be simulated.
+
+        Returns
+        -------
+            sim : :class:`pybamm.Simulation` or None
+                None if the simulation could not be built with the degradation
+                parameter as an input parameter.
+            inputs : list
+                Values of the input parameter for every parameter values. Should be
+                of the form - [dict, dict]
+        """
+        sweep_params = self.param_values[0].copy()
+        inputs = []
+        for params in self.param_values:
+            value = params[self.degradation_parameter]
+            # scaled functions keep the function and scale it with the input
+            if isinstance(value, FunctionLike):
+                sweep_params[self.degradation_parameter] = FunctionLike(
+                    value.fun, pybamm.InputParameter(self.degradation_parameter)
+                )
+                inputs.append({self.degradation_parameter: value.parameter})
+            else:
+                sweep_params[self.degradation_parameter] = "[input]"
+                inputs.append({self.degradation_parameter: value})
+
+        # only the build falls back, the errors of the solver are raised
+        try:
+            # the initial state of charge is set before building, solving with
+            # `initial_soc` would build the simulation again
+            if self.chemistry == pybamm.parameter_sets.Mohtat2020:
+                set_initial_soc(sweep_params, 1)
+            sim = pybamm.Simulation(
+                model=self.model,
+                experiment=experiment,
+                parameter_values=sweep_params,
+            )
+            sim.build_for_experiment()
+        except Exception:
+            return None, inputs
+
+        return sim, inputs
+
+    def solve_sweep(self, experiment):
+        """
+        Builds the simulation once, with `self.degradation_parameter` as an input
+        parameter, and solves it for the varied value of every parameter values.
+
+        Parameters
+        ----------
+            experiment : :class:`pybamm.Experiment`
+                The experiment to be simulated.
+
+        Returns
+        -------
+            solutions_and_labels : list or None
+                Of the form -
+                [
+                    [:class:`pybamm.Solution`, label],
+                    [:class:`pybamm.Solution`, label]
+                ]
+                None if the simulation could not be built with the degradation
+                parameter as an input parameter.
+        """
+        sim, inputs = self.build_sweep(experiment)
+        if sim is None:
+            return None
+        initial_conditions = save_initial_conditions(sim)
+
+        solutions_and_labels = []
+        for params, sweep_inputs in zip(self.param_values, inputs):
+            restore_initial_conditions(initial_conditions)
+            solve_degradation(
+                sim,
+                self.chemistry,
+                self.save_at_cycles(),
+                sweep_inputs,
+                initial_soc_is_set=True,
+            )
+            if self.summary_only:
+                solve_last_cycle(sim, sweep_inputs)
+            solutions_and_labels.append(
+                [
+                    sim.solution,
+                    degradation_label(
+                        self.degradation_parameter,
+                        params[self.degradation_parameter],
+                    ),
+                ]
+            )
+
+        return solutions_and_labels
+
+    def solve_sweep_in_pool(self, experiment):
+        """
+        Builds the simulation once, with `self.degradation_parameter` as an input
+        parameter, and solves it for the varied values in a process pool. Every
+        worker process receives the built simulation once.
+
+        Parameters
+        ----------
+            experiment : :class:`pybamm.Experiment`
+                The experiment to be simulated.
+
+        Returns
+        -------
+            summary_variables_and_labels : list or None
+                Of the form -
+                [
+                    [dict, label],
+                    [dict, label]
+                ]
+                None if the simulation could not be built with the degradation
+                parameter as an input parameter.
+        """
+        sim, inputs = self.build_sweep(experiment)
+        if sim is None:
+            return None
+
+        processes = min(self.processes, len(inputs), available_cpus())
+        with multiprocessing.Pool(
+            processes, initializer=init_sweep_simulation, initargs=(sim,)
+        ) as pool:
+            summary_variables_and_labels = pool.starmap(
+                solve_sweep_summary_variables,
+                [
+                    (
+                        self.chemistry,
+                        sweep_inputs,
+                        self.save_at_cycles(),
+                        degradation_label(
+                            self.degradation_parameter,
+                            params[self.degradation_parameter],
+                        ),
+                    )
+                    for params, sweep_inputs in zip(self.param_values, inputs)
+                ],
+            )
+
+        return summary_variables_and_labels
+
+    def create_simulations_in_pool(self, experiment):
+        """
+        Solves the simulations for all the parameter values in a process pool.
+
+        Parameters
+        ----------
+            experiment : :class:`pybamm.Experiment`
+                The experiment to be simulated.
+
+        Returns
+        -------
+            summary_variables_and_labels : list
+                Of the form -
+                [
+                    [dict, label],
+                    [dict, label]
+                ]
+        """
+        processes = min(
+            self.processes, len(self.param_values), available_cpus()
+        )
+
+        with multiprocessing.Pool(processes) as pool:
+            summary_variables_and_labels = pool.starmap(
+                solve_summary_variables,
+                [
+                    (
+                        self.model,
+                        self.chemistry,
+                        parameter_values,
+                        self.degradation_parameter,
+                        experiment,
+                        self.save_at_cycles(),
+                    )
+                    for parameter_values in self.param_values
+                ],
+            )
+
+        return summary_variables_and_labels
+
     def solve(self):
         """
         Solves an experiment with the given configuration.
         """
+        if self.solution_cache is not None:
+            key = self.solution_cache.key(
+                self.model,
+                self.chemistry,
+                self.param_values,
+                self.degradation_parameter,
+                self.cycle,
+                self.number,
+            )
+            arrays = self.solution_cache.get(key)
+            if arrays is not None:
+                self.solutions = None
+                self.labels = list(arrays["labels"])
+                self.summary_variables = [
+                    {
+                        var: arrays[f"y{i}_{j}"]
+                        for j, var in enumerate(arrays["variables"])
+                    }
+                    for i in range(len(self.labels))
+                ]
+                return
+
         if self.chemistry == pybamm.parameter_sets.Ai2020:  # pragma: no cover
-            experiment = pybamm.Experiment(self.cycle * self.number)
+            experiment = get_experiment(self.cycle, self.number)
         else:
-            experiment = pybamm.Experiment(
-                self.cycle * self.number, termination="80% capacity"
+            experiment = get_experiment(
+                self.cycle, self.number, termination="80% capacity"
             )
 
-        # create a simulation
-        sim, solutions_and_labels = self.create_simulation(experiment)
+        # fall back to a simulation for every parameter values if the degradation
+        # parameter cannot be an input parameter
+        solutions_and_labels = None
+        summary_variables_and_labels = None
+        if self.sweep and self.processes is None:
+            solutions_and_labels = self.solve_sweep(experiment)
+        elif self.sweep:
+            summary_variables_and_labels = self.solve_sweep_in_pool(experiment)
 
-        # sort the solutions and labels in ascending order of the varied value
-        solutions_and_labels_sorted = sorted(
-            solutions_and_labels, key=lambda x: float(x[1].split(":")[1])
-        )
+        if summary_variables_and_labels is None and (
+            solutions_and_labels is not None or self.processes is None
+        ):
+            if solutions_and_labels is None:
+                # create a simulation
+                sim, solutions_and_labels = self.create_simulation(experiment)
 
-        self.solutions = [x[0] for x in solutions_and_labels_sorted]
-        self.labels = [x[1] for x in solutions_and_labels_sorted]
+            # sort the solutions and labels in ascending order of the varied value
+            solutions_and_labels_sorted = sorted(
+                solutions_and_labels, key=lambda x: float(x[1].split(":")[1])
+            )
 
-    def generate_summary_variables(self):
+            self.solutions = [x[0] for x in solutions_and_labels_sorted]
+            self.labels = [x[1] for x in solutions_and_labels_sorted]
+            self.summary_variables = [
+                solution.summary_variables for solution in self.solutions
+            ]
+        else:
+            if summary_variables_and_labels is None:
+                summary_variables_and_labels = self.create_simulations_in_pool(
+                    experiment
+                )
+
+            # sort the summary variables and labels in ascending order of the
+            # varied value
+            summary_variables_and_labels_sorted = sorted(
+                summary_variables_and_labels, key=lambda x: float(x[1].split(":")[1])
+            )
+
+            # the full solutions stay in the worker processes
+            self.solutions = None
+            self.labels = [x[1] for x in summary_variables_and_labels_sorted]
+            self.summary_variables = [x[0] for x in summary_variables_and_labels_sorted]
+
+        if self.solution_cache is not None:
+            # store only the plotted summary variables
+            variables = ["Cycle number"] + self.summary_variables_to_plot()
+            arrays = {"labels": np.array(self.labels), "variables": np.array(variables)}
+            for i, summary_variables in enumerate(self.summary_variables):
+                for j, var in enumerate(variables):
+                    arrays[f"y{i}_{j}"] = np.asarray(summary_variables[var])
+            self.solution_cache.put(key, arrays)
+
+    def summary_variables_to_plot(self):
         """
-        Creates and saves a picture of summary variable comparison plot.
+        Returns the summary variables plotted for the chemistry.
+
+        Returns
+        -------
+            vars_to_plot : list
         """
         if self.chemistry == pybamm.parameter_sets.Ai2020:  # pragma: no cover
             vars_to_plot = [
@@ -140,6 +446,14 @@ class DegradationComparisonGenerator:
                 "y_0",
             ]
 
+        return vars_to_plot
+
+    def generate_summary_variables(self):
+        """
+        Creates and saves a picture of summary variable comparison plot.
+        """
+        vars_to_plot = self.summary_variables_to_plot()
+
         # config for subplots
         length = len(vars_to_plot)
         n = int(length // np.sqrt(length))
@@ -150,18 +464,18 @@ class DegradationComparisonGenerator:
         # find max cycle number
         x_max = max(
             [
-                solution.summary_variables["Cycle number"][-1]
-                for solution in self.solutions
+                summary_variables["Cycle number"][-1]
+                for summary_variables in self.summary_variables
             ]
         )
 
         # plot the summary variables
         for var, ax in zip(vars_to_plot, axes.flat):
-            # iterate through the solutions
-            for solution in self.solutions:
+            # iterate through the summary variables of all the solutions
+            for summary_variables in self.summary_variables:
                 ax.plot(
-                    solution.summary_variables["Cycle number"],
-                    solution.summary_variables[var],
+                    summary_variables["Cycle number"],
+                    summary_variables[var],
                 )
             ax.set_xlabel("Cycle number")
             ax.set_ylabel(var)
@@ -171,3 +485,240 @@ class DegradationComparisonGenerator:
         fig.tight_layout()
         fig.legend(self.labels, loc="lower left", bbox_to_anchor=(0.77, -0.08))
         plt.savefig("plot.png", dpi=300, bbox_inches="tight")
+
+
+def degradation_label(degradation_parameter, val):
+    """
+    Generates the legend label for a varied degradation parameter.
+
+    Parameters
+    ----------
+        degradation_parameter : str
+        val : numerical
+
+    Returns
+    -------
+        label : str
+    """
+    return (
+        degradation_parameter
+        + ": "
+        + ("{:.5e}".format(val) if val > 10 or val < 1 else str(val))
+    )
+
+
+def solve_degradation_simulation(
+    model, chemistry, parameter_values, experiment, save_at_cycles=None
+):
+    """
+    Creates and solves a simulation for a single set of parameter values.
+
+    Parameters
+    ----------
+        model : :class:`pybamm.BaseBatteryModel`
+        chemistry : dict
+        parameter_values : :class:`pybamm.ParameterValues`
+        experiment : :class:`pybamm.Experiment`
+        save_at_cycles : list
+            default : None
+            Cycles of which the full solutions are stored, the summary variables
+            are stored for every cycle. All the cycles are stored if not provided.
+
+    Returns
+    -------
+        sim : :class:`pybamm.Simulation`
+    """
+    sim = pybamm.Simulation(
+        model=model,
+        experiment=experiment,
+        parameter_values=parameter_values,
+    )
+    solve_degradation(sim, chemistry, save_at_cycles)
+
+    return sim
+
+
+def solve_degradation(
+    sim, chemistry, save_at_cycles=None, inputs=None, initial_soc_is_set=False
+):
+    """
+    Solves a degradation simulation with the solver options of the chemistry. A
+    built simulation is not built again.
+
+    Parameters
+    ----------
+        sim : :class:`pybamm.Simulation`
+        chemistry : dict
+        save_at_cycles : list
+            default : None
+            Cycles of which the full solutions are stored, the summary variables
+            are stored for every cycle. All the cycles are stored if not provided.
+        inputs : dict
+            default : None
+            Values of the input parameters of the simulation.
+        initial_soc_is_set : bool
+            default : False
+            If the initial state of charge of the chemistry has already been set in
+            the parameter values of the simulation, see `set_initial_soc`.
+    """
+    # pybamm expects a dictionary of inputs when solving an experiment
+    inputs = inputs if inputs is not None else {}
+    if chemistry == pybamm.parameter_sets.Ai2020:  # pragma: no cover
+        sim.solve(calc_esoh=False, save_at_cycles=save_at_cycles, inputs=inputs)
+    elif chemistry == pybamm.parameter_sets.Mohtat2020:
+        sim.solve(
+            initial_soc=None if initial_soc_is_set else 1,
+            save_at_cycles=save_at_cycles,
+            inputs=inputs,
+        )
+    else:  # pragma: no cover
+        sim.solve(save_at_cycles=save_at_cycles, inputs=inputs)
+
+
+def solve_last_cycle(sim, inputs=None):
+    """
+    Stores the full solution of the last solved cycle of a degradation simulation
+    solved with `save_at_cycles`. pybamm decides whether to store a cycle before
+    solving it, so the last cycle is not stored when the capacity termination
+    stops the experiment early. The cycle is solved again from its first state.
+
+    Parameters
+    ----------
+        sim : :class:`pybamm.Simulation`
+            A solved degradation simulation, its solution is updated in place.
+        inputs : dict
+            default : None
+            Values of the input parameters of the simulation.
+    """
+    solution = sim.solution
+    if solution is None or solution.cycles[-1] is not None:
+        return
+
+    cycle = sim.experiment.operating_conditions_cycles[len(solution.cycles) - 1]
+    model = sim.model.new_copy()
+    model.set_initial_conditions_from(solution.all_first_states[-1])
+    cycle_sim = pybamm.Simulation(
+        model=model,
+        experiment=get_experiment([cycle], 1),
+        parameter_values=sim.parameter_values.copy(),
+    )
+    # pybamm expects a dictionary of inputs when solving an experiment
+    cycle_sim.solve(calc_esoh=False, inputs=inputs if inputs is not None else {})
+    solution.cycles[-1] = cycle_sim.solution.cycles[0]
+
+
+def set_initial_soc(parameter_values, initial_soc):
+    """
+    Sets the initial concentrations in the electrodes for an initial state of
+    charge, as `pybamm.Simulation.solve` does with `initial_soc`.
+
+    Parameters
+    ----------
+        parameter_values : :class:`pybamm.ParameterValues`
+            Updated in place.
+        initial_soc : numerical
+            Between 0 and 1.
+    """
+    param = pybamm.LithiumIonParameters()
+    c_n_max = parameter_values.evaluate(param.c_n_max)
+    c_p_max = parameter_values.evaluate(param.c_p_max)
+    x, y = pybamm.lithium_ion.get_initial_stoichiometries(
+        initial_soc, parameter_values
+    )
+    parameter_values.update(
+        {
+            "Initial concentration in negative electrode [mol.m-3]": x * c_n_max,
+            "Initial concentration in positive electrode [mol.m-3]": y * c_p_max,
+        }
+    )
+
+
+# built sweep simulation of a worker process, and its initial conditions, see
+# `DegradationComparisonGenerator.solve_sweep_in_pool`
+_sweep_simulation = None
+_sweep_initial_conditions = None
+
+
+def init_sweep_simulation(sim):
+    """
+    Stores the built sweep simulation of a worker process.
+
+    Parameters
+    ----------
+        sim : :class:`pybamm.Simulation`
+            Built with the degradation parameter as an input parameter.
+    """
+    global _sweep_simulation, _sweep_initial_conditions
+    _sweep_simulation = sim
+    _sweep_initial_conditions = save_initial_conditions(sim)
+
+
+def solve_sweep_summary_variables(chemistry, inputs, save_at_cycles, label):
+    """
+    Solves the built sweep simulation of the worker process for a single varied
+    value and returns only its summary variables. Defined at the module level so
+    that it can be sent to worker processes.
+
+    Parameters
+    ----------
+        chemistry : dict
+        inputs : dict
+            Value of the degradation parameter.
+        save_at_cycles : list or None
+        label : str
+
+    Returns
+    -------
+        summary_variables_and_label : list
+            Of the form - [dict, label]
+    """
+    restore_initial_conditions(_sweep_initial_conditions)
+    solve_degradation(
+        _sweep_simulation,
+        chemistry,
+        save_at_cycles,
+        inputs,
+        initial_soc_is_set=True,
+    )
+
+    return [_sweep_simulation.solution.summary_variables, label]
+
+
+def solve_summary_variables(
+    model,
+    chemistry,
+    parameter_values,
+    degradation_parameter,
+    experiment,
+    save_at_cycles=None,
+):
+    """
+    Solves a simulation for a single set of parameter values and returns only
+    its summary variables, so that the full solution is not pickled when this
+    function runs in a worker process.
+
+    Parameters
+    ----------
+        model : :class:`pybamm.BaseBatteryModel`
+        chemistry : dict
+        parameter_values : :class:`pybamm.ParameterValues`
+        degradation_parameter : str
+        experiment : :class:`pybamm.Experiment`
+        save_at_cycles : list
+            default : None
+
+    Returns
+    -------
+        summary_variables_and_label : list
+            Of the form - [dict, label]
+    """
+    sim = solve_degradation_simulation(
+        model, chemistry, parameter_values, experiment, save_at_cycles
+    )
+
+    return [
+        sim.solution.summary_variables,
+        degradation_label(
+            degradation_parameter, parameter_values[degradation_parameter]
+        ),
+    ]
@@ -0,0 +1,652 @@
+import os
+import pybamm
+import collections
+import multiprocessing
+import imageio
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from pybamm.plotting.quick_plot import split_long_string
+from utils.custom_process import available_cpus
+
+# the default colors and line styles of the solutions in `pybamm.QuickPlot`
+line_colors = ["r", "b", "k", "g", "m", "c"]
+line_styles = ["-", ":", "--", "-."]
+
+
+def sample_solution(solution, output_variables=None, number_of_points=None):
+    """
+    Extracts the plotted variables of a single solution. To be used right after
+    solving, so that only the sampled variables are kept and the full solution
+    can be discarded.
+
+    Parameters
+    ----------
+        solution : :class:`pybamm.Solution` or :class:`pybamm.Simulation`
+        output_variables : list
+            default : None
+            Variables to plot. The default quick plot variables of the model are
+            used if not provided.
+        number_of_points : int
+            default : None
+            Number of points of the uniform time grid on which the variables are
+            sampled, along with the time steps around the step changes of an
+            experiment. The time steps of the solution are kept if not provided.
+
+    Returns
+    -------
+        sample : dict
+            Of the form -
+            {
+                "variables": numpy.ndarray,
+                "t": numpy.ndarray,
+                "y0": numpy.ndarray,
+                "y1": numpy.ndarray,
+                "x1": numpy.ndarray,
+                "xlabel1": numpy.ndarray,
+                "boundaries1": numpy.ndarray,
+                ...
+            }
+            where "y{j}" is the variable j, of the shape (n_t,) for a 0D variable
+            and (n_t, n_x) for a 1D variable, "x{j}" the spatial points of a 1D
+            variable and "boundaries{j}" the boundaries between its subdomains.
+    """
+    if isinstance(solution, pybamm.Simulation):
+        solution = solution.solution
+    if output_variables is None:
+        output_variables = solution.all_models[0].default_quick_plot_variables
+
+    t_solution = solution["Time [s]"].entries
+    if number_of_points is None:
+        t = t_solution
+    else:
+        t = np.linspace(t_solution[0], t_solution[-1], num=number_of_points)
+        # keep the time steps of the solver around the step changes of an
+        # experiment, interpolating across them would smooth out the jumps
+        step_ends = [
+            step["Time [s]"].entries[-1]
+            for cycle in getattr(solution, "cycles", None) or []
+            if cycle is not None
+            for step in cycle.steps
+        ]
+        if step_ends:
+            idx = np.searchsorted(t_solution, step_ends)
+            idx = np.concatenate([idx - 1, idx, idx + 1])
+            idx = np.clip(idx, 0, len(t_solution) - 1)
+            t = np.union1d(t, t_solution[idx])
+
+    sample = {"variables": np.array(output_variables), "t": t}
+    for j, name in enumerate(output_variables):
+        variable = solution[name]
+        if variable.dimensions == 0:
+            sample[f"y{j}"] = (
+                variable.entries
+                if number_of_points is None
+                else np.interp(t, t_solution, variable.entries)
+            )
+        elif variable.dimensions == 1:
+            # evaluated at the plotted spatial points (the edges of the mesh for
+            # some pybamm versions), as pybamm.QuickPlot does
+            x = variable.first_dim_pts
+            sample[f"y{j}"] = variable(
+                t, **{variable.first_dimension: x}, warn=False
+            ).T
+            # spatial points in micrometres
+            sample[f"x{j}"] = x * 1e6
+            sample[f"xlabel{j}"] = np.array(variable.first_dimension)
+            sample[f"boundaries{j}"] = np.array(variable.internal_boundaries) * 1e6
+        else:  # pragma: no cover
+            raise NotImplementedError(
+                f"Cannot plot '{name}', only 0D and 1D variables can be plotted."
+            )
+
+    return sample
+
+
+def extract_plot_data(solutions, labels, number_of_images=80, output_variables=None):
+    """
+    Extracts the plotted variables of the given solutions as compact arrays. The
+    0D variables are stored over the whole time range and the 1D variables only at
+    the time stamps of the GIF frames.
+
+    Parameters
+    ----------
+        solutions : list
+            Of the form - [:class:`pybamm.Solution` or :class:`pybamm.Simulation`
+            or dict], where a dict is a sample returned by `sample_solution`.
+        labels : list
+            Legend labels of the solutions.
+        number_of_images : int
+            default : 80
+            Number of frames in the GIF.
+        output_variables : list
+            default : None
+            Variables to plot. The default quick plot variables of the first model
+            (or the variables of the first sample) are used if not provided.
+
+    Returns
+    -------
+        plot_data : dict
+            Of the form -
+            {
+                "labels": numpy.ndarray,
+                "variables": numpy.ndarray,
+                "frame_times": numpy.ndarray,
+                "t0": numpy.ndarray,
+                "y0_0": numpy.ndarray,
+                "limits0_0": numpy.ndarray,
+                "x0_1": numpy.ndarray,
+                ...
+            }
+            where "t{i}" is the time of solution i, "y{i}_{j}" is the variable j of
+            solution i, "limits{i}_{j}" its y-axis limits over the whole time
+            range, and "x{i}_{j}" the spatial points of a 1D variable.
+    """
+    if output_variables is None and isinstance(solutions[0], dict):
+        output_variables = list(solutions[0]["variables"])
+    samples = [
+        (
+            solution
+            if isinstance(solution, dict)
+            else sample_solution(solution, output_variables)
+        )
+        for solution in solutions
+    ]
+    output_variables = list(samples[0]["variables"])
+
+    frame_times = np.linspace(
+        min(sample["t"][0] for sample in samples),
+        max(sample["t"][-1] for sample in samples),
+        num=number_of_images,
+    )
+
+    plot_data = {
+        "labels": np.array(labels),
+        "variables": np.array(output_variables),
+        "frame_times": frame_times,
+    }
+    for i, sample in enumerate(samples):
+        t = sample["t"]
+        plot_data[f"t{i}"] = t
+        for j in range(len(output_variables)):
+            y = sample[f"y{j}"]
+            plot_data[f"limits{i}_{j}"] = np.array([ax_min(y), ax_max(y)])
+            if y.ndim == 1:
+                plot_data[f"y{i}_{j}"] = y
+            else:
+                # interpolate every spatial point at the frame time stamps, the
+                # lines disappear after the end of a solution
+                plot_data[f"y{i}_{j}"] = np.array(
+                    [
+                        np.interp(frame_times, t, entries, right=np.nan)
+                        for entries in y.T
+                    ]
+                ).T
+                plot_data[f"x{i}_{j}"] = sample[f"x{j}"]
+                plot_data[f"xlabel{j}"] = sample[f"xlabel{j}"]
+                if f"boundaries{j}" in sample:
+                    plot_data[f"boundaries{j}"] = sample[f"boundaries{j}"]
+
+    return plot_data
+
+
+def ax_min(data):
+    """
+    Lower y-axis limit of the data, with the margin of `pybamm.QuickPlot`.
+
+    Parameters
+    ----------
+        data : numpy.ndarray
+
+    Returns
+    -------
+        y_min : float
+    """
+    data_min, data_max = np.nanmin(data), np.nanmax(data)
+    return data_max - 1.05 * (data_max - data_min)
+
+
+def ax_max(data):
+    """
+    Upper y-axis limit of the data, with the margin of `pybamm.QuickPlot`.
+
+    Parameters
+    ----------
+        data : numpy.ndarray
+
+    Returns
+    -------
+        y_max : float
+    """
+    data_min, data_max = np.nanmin(data), np.nanmax(data)
+    return data_min + 1.05 * (data_max - data_min)
+
+
+def plot_frame(fig, axes, plot_data, frame, limits):
+    """
+    Plots a single frame of the GIF, as `pybamm.QuickPlot` plots it. Solution i is
+    plotted with the color and the line style i of `line_colors` and
+    `line_styles`.
+
+    Parameters
+    ----------
+        fig : :class:`matplotlib.figure.Figure`
+        axes : numpy.ndarray
+            Axes of the subplots.
+        plot_data : dict
+            See `extract_plot_data`.
+        frame : int
+            Index of the frame.
+        limits : list
+            y-axis limits of the variables. Should be of the form -
+            [(y_min, y_max), (y_min, y_max)]
+    """
+    labels = list(plot_data["labels"])
+    variables = list(plot_data["variables"])
+    frame_times = plot_data["frame_times"]
+    t = frame_times[frame]
+
+    # time in hours for simulations longer than an hour
+    if frame_times[-1] >= 3600:
+        time_scaling_factor, time_unit = 3600, "h"
+    else:
+        time_scaling_factor, time_unit = 1, "s"
+
+    for ax in axes.flat:
+        ax.clear()
+    for ax in axes.flat[len(variables):]:
+        ax.axis("off")
+
+    for j, (name, ax) in enumerate(zip(variables, axes.flat)):
+        y_min, y_max = limits[j]
+        for i in range(len(labels)):
+            y = plot_data[f"y{i}_{j}"]
+            style = {
+                "color": line_colors[i % len(line_colors)],
+                "linestyle": line_styles[i % len(line_styles)],
+            }
+            if y.ndim == 1:
+                ax.plot(plot_data[f"t{i}"] / time_scaling_factor, y, **style)
+            else:
+                ax.plot(plot_data[f"x{i}_{j}"], y[frame], zorder=10, **style)
+        if plot_data[f"y0_{j}"].ndim == 1:
+            ax.set_xlim(
+                frame_times[0] / time_scaling_factor,
+                frame_times[-1] / time_scaling_factor,
+            )
+            ax.plot([t / time_scaling_factor] * 2, [y_min, y_max], "k--", lw=1.5)
+            ax.set_xlabel(f"Time [{time_unit}]")
+        else:
+            x = plot_data[f"x0_{j}"]
+            ax.set_xlim(x[0], x[-1])
+            for boundary in plot_data.get(f"boundaries{j}", []):
+                ax.axvline(boundary, color="0.5", lw=1, zorder=0)
+            ax.set_xlabel(f"{plot_data[f'xlabel{j}']} [$\\mu$m]")
+        ax.set_ylim(y_min, y_max)
+        ax.xaxis.set_major_locator(MaxNLocator(3))
+        ax.set_title(split_long_string(name), fontsize="medium")
+
+
+def variable_limits(plot_data, j):
+    """
+    Fixed y-axis limits of a variable, over all the solutions and time stamps.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        j : int
+            Index of the variable.
+
+    Returns
+    -------
+        limits : tuple
+    """
+    number_of_solutions = len(plot_data["labels"])
+    if all(f"limits{i}_{j}" in plot_data for i in range(number_of_solutions)):
+        y_min = min(plot_data[f"limits{i}_{j}"][0] for i in range(number_of_solutions))
+        y_max = max(plot_data[f"limits{i}_{j}"][1] for i in range(number_of_solutions))
+    else:
+        # the plot data cached before the limits were stored
+        y_min = min(ax_min(plot_data[f"y{i}_{j}"]) for i in range(number_of_solutions))
+        y_max = max(ax_max(plot_data[f"y{i}_{j}"]) for i in range(number_of_solutions))
+    if y_min == y_max:
+        y_min, y_max = y_min - 1, y_max + 1
+    return y_min, y_max
+
+
+class FrameRenderer:
+    """
+    Renders the frames of the plot data on its own Agg figure, directly at the
+    given size, with the layout of `pybamm.QuickPlot`.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        size : int
+            default : 1440
+            Width of the frames in pixels, the height keeps the aspect ratio of
+            the figure.
+    """
+
+    def __init__(self, plot_data, size=1440):
+        self.plot_data = plot_data
+        length = len(plot_data["variables"])
+        n_rows = int(length // np.sqrt(length))
+        n_cols = int(np.ceil(length / n_rows))
+        self.limits = [variable_limits(plot_data, j) for j in range(length)]
+        figsize = (min(15, 4 * n_cols), min(8, 1 + 3 * n_rows))
+        self.fig = Figure(figsize=figsize, dpi=size / figsize[0])
+        # the frames are copied from the pixel buffer of the canvas
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.axes = self.fig.subplots(n_rows, n_cols, squeeze=False)
+
+        # the layout of the first frame is used for every frame, so that the
+        # frames rendered by different renderers line up
+        plot_frame(self.fig, self.axes, plot_data, 0, self.limits)
+        legend_top = 0
+        labels = list(plot_data["labels"])
+        if len(labels) > 1:
+            legend = self.fig.legend(
+                [
+                    Line2D(
+                        [],
+                        [],
+                        color=line_colors[i % len(line_colors)],
+                        linestyle=line_styles[i % len(line_styles)],
+                    )
+                    for i in range(len(labels))
+                ],
+                labels,
+                loc="lower right",
+            )
+            # leave space for the legend below the subplots
+            legend_top = (
+                legend.get_window_extent(renderer=self.canvas.get_renderer()).y1
+                / self.fig.bbox.height
+            )
+        self.fig.tight_layout(rect=(0, legend_top, 1, 1))
+
+    def render(self, frame):
+        """
+        Renders a single frame.
+
+        Parameters
+        ----------
+            frame : int
+                Index of the frame.
+
+        Returns
+        -------
+            image : numpy.ndarray
+                RGBA pixels of the frame.
+        """
+        plot_frame(self.fig, self.axes, self.plot_data, frame, self.limits)
+        self.canvas.draw()
+        # a copy, as the buffer is redrawn for the next frame
+        return np.array(self.canvas.buffer_rgba())
+
+
+# renderer of a worker process, see `render_frames`
+_frame_renderer = None
+
+
+def init_frame_renderer(plot_data, size):
+    """
+    Creates the renderer of a worker process.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        size : int
+            See :class:`FrameRenderer`.
+    """
+    global _frame_renderer
+    _frame_renderer = FrameRenderer(plot_data, size)
+
+
+def render_frame_slice(frames):
+    """
+    Renders a slice of frames with the renderer of the worker process. Defined at
+    the module level so that it can be sent to worker processes.
+
+    Parameters
+    ----------
+        frames : list
+            Indices of the frames.
+
+    Returns
+    -------
+        images : list
+            RGBA pixels of the frames.
+    """
+    return [_frame_renderer.render(frame) for frame in frames]
+
+
+def render_frames(plot_data, size=1440, frames=None, processes=None, slice_size=4):
+    """
+    Renders the frames of the plot data directly at the given size. If a number
+    of worker processes is provided, the frames are split into slices of
+    consecutive frames, which are rendered by the worker processes (each with
+    its own figure), and yielded in order. Only a couple of slices per worker
+    process are held in memory at a time.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        size : int
+            default : 1440
+            Width of the frames in pixels, the height keeps the aspect ratio of
+            the figure.
+        frames : list
+            default : None
+            Indices of the rendered frames. All the frames are rendered if not
+            provided.
+        processes : int
+            default : None
+            Number of worker processes. The frames are rendered one after
+            another in this process if not provided.
+        slice_size : int
+            default : 4
+            Number of frames rendered by a worker process at a time.
+
+    Yields
+    ------
+        image : numpy.ndarray
+            RGBA pixels of a frame.
+    """
+    if frames is None:
+        frames = range(len(plot_data["frame_times"]))
+    frames = list(frames)
+    slices = [
+        frames[start:start + slice_size] for start in range(0, len(frames), slice_size)
+    ]
+
+    if processes is None or processes < 2 or len(slices) < 2:
+        frame_renderer = FrameRenderer(plot_data, size)
+        for frame in frames:
+            yield frame_renderer.render(frame)
+        return
+
+    # the CPUs available to this process, not all the CPUs of the machine
+    processes = min(processes, len(slices), available_cpus())
+    with multiprocessing.Pool(
+        processes,
+        initializer=init_frame_renderer,
+        initargs=(plot_data, size),
+    ) as pool:
+        # the next slices are rendered while the current one is being used
+        pending = collections.deque()
+        for frame_slice in slices:
+            pending.append(pool.apply_async(render_frame_slice, (frame_slice,)))
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def render_gif(
+    plot_data,
+    output_filename="plot.gif",
+    duration=0.1,
+    size=1440,
+    palette_size=256,
+    frame_step=1,
+    processes=None,
+):
+    """
+    Renders the frames of the plot data and writes them to a GIF. The frames are
+    drawn directly at the given size and encoded once, without resizing the GIF
+    afterwards.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        output_filename : str
+            default : "plot.gif"
+        duration : numerical
+            default : 0.1
+            Duration of a single frame in seconds.
+        size : int
+            default : 1440
+            Width of the frames in pixels, the height keeps the aspect ratio of
+            the figure.
+        palette_size : int
+            default : 256
+            Number of colours of a frame.
+        frame_step : int
+            default : 1
+            Only every `frame_step`-th frame is written, and shown for
+            `frame_step` times longer, so that the GIF keeps its length.
+        processes : int
+            default : None
+            Number of worker processes rendering the frames, see `render_frames`.
+    """
+    frames = range(0, len(plot_data["frame_times"]), frame_step)
+
+    with imageio.get_writer(
+        output_filename,
+        mode="I",
+        duration=duration * frame_step,
+        palettesize=palette_size,
+    ) as writer:
+        for image in render_frames(plot_data, size, frames, processes):
+            writer.append_data(image)
+
+
+# encodings of a GIF in the order of their quality, of the form -
+# (size, palette_size, frame_step), see `render_gif`
+gif_encodings = [
+    (1440, 256, 1),
+    (1440, 128, 1),
+    (1080, 256, 1),
+    (1080, 128, 1),
+    (720, 256, 1),
+    (720, 128, 2),
+    (540, 64, 2),
+]
+
+
+def predict_gif_sizes(plot_data, number_of_samples=4):
+    """
+    Predicts the size in bytes of the GIF for the encodings in `gif_encodings`,
+    one after another, by encoding a sample of evenly spaced frames. The sample is
+    rendered only once for every size, and only when an encoding of that size is
+    predicted.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        number_of_samples : int
+            default : 4
+            Number of sampled frames.
+
+    Yields
+    ------
+        predicted_size : float
+            Predicted size in bytes, in the order of `gif_encodings`.
+    """
+    number_of_frames = len(plot_data["frame_times"])
+    samples = np.unique(
+        np.linspace(
+            0, number_of_frames - 1, min(number_of_samples, number_of_frames)
+        ).astype(int)
+    )
+
+    images = {}
+    for size, palette_size, frame_step in gif_encodings:
+        if size not in images:
+            # only the sample of the current size is kept
+            images = {size: list(render_frames(plot_data, size, samples))}
+        encoded = imageio.mimwrite(
+            "<bytes>", images[size], format="GIF", palettesize=palette_size
+        )
+        yield len(encoded) / len(samples) * len(range(0, number_of_frames, frame_step))
+
+
+def render_gif_to_budget(
+    plot_data,
+    output_filename="plot.gif",
+    duration=0.1,
+    max_bytes=15728640,
+    safety_factor=0.9,
+    processes=None,
+):
+    """
+    Renders the GIF with the best encoding in `gif_encodings` which is predicted
+    to fit in a byte budget, so that the full GIF is (almost always) encoded only
+    once.
+
+    Parameters
+    ----------
+        plot_data : dict
+            See `extract_plot_data`.
+        output_filename : str
+            default : "plot.gif"
+        duration : numerical
+            default : 0.1
+            Duration of a single frame in seconds.
+        max_bytes : int
+            default : 15728640
+            Size limit of the GIF in bytes, 15 MB for Twitter.
+        safety_factor : float
+            default : 0.9
+            Fraction of the budget which the predicted size can fill, as the
+            frames which are not sampled can be larger.
+        processes : int
+            default : None
+            Number of worker processes rendering the frames of the full GIF, see
+            `render_frames`.
+
+    Returns
+    -------
+        encoding : tuple
+            The chosen encoding, of the form - (size, palette_size, frame_step).
+    """
+    for index, predicted_size in enumerate(predict_gif_sizes(plot_data)):
+        if predicted_size <= safety_factor * max_bytes:
+            break
+
+    # fall back to the next encoding if the prediction was too optimistic
+    for encoding in gif_encodings[index:]:
+        size, palette_size, frame_step = encoding
+        render_gif(
+            plot_data,
+            output_filename,
+            duration,
+            size=size,
+            palette_size=palette_size,
+            frame_step=frame_step,
+            processes=processes,
+        )
+        if os.path.getsize(output_filename) < max_bytes:
+            break
+
+    return encoding
@@ -1,3 +1,4 @@
+import time
 import pybamm
 import logging
 from plotting.config_generator import config_generator
@@ -5,7 +6,20 @@ from plotting.comparison_generator import ComparisonGenerator
 from plotting.degradation_comparison_generator import DegradationComparisonGenerator
 
 
-def random_plot_generator(return_dict, choice, reply_config=None, testing=False):
+def random_plot_generator(
+    return_dict,
+    choice,
+    reply_config=None,
+    testing=False,
+    model_cache=None,
+    processes=None,
+    sweep=False,
+    solution_cache=None,
+    points_per_frame=None,
+    summary_only=False,
+    cost_estimator=None,
+    failure_memo=None,
+):
     """
     Generates a random plot.
 
@@ -18,7 +32,42 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
             "degradation comparison".
         reply_config : dict
             Should be passed when the bot is replying to a requested
-            simulation tweet.
+            simulation tweet. A random configuration which fails is replaced by a
+            new one, a failing reply configuration raises the error.
+        model_cache : :class:`utils.model_cache.ModelCache`
+            default : None
+            Cache of built models to be used in "model comparison" and
+            "parameter comparison".
+        processes : int
+            default : None
+            Number of worker processes used to solve the permutations of the
+            comparison in parallel.
+        sweep : bool
+            default : False
+            If True, "parameter comparison" and "degradation comparison" build the
+            model once and solve it for every varied value.
+        solution_cache : :class:`utils.solution_cache.SolutionCache`
+            default : None
+            Cache of solved outputs, a configuration which has been solved before is
+            rendered without solving it again.
+        points_per_frame : int
+            default : None
+            If provided, the solutions of "model comparison" and "parameter
+            comparison" are sampled with this many points per GIF frame right after
+            they are solved.
+        summary_only : bool
+            default : False
+            If True, "degradation comparison" stores only the summary variables and
+            the full solutions of the first and the last cycle.
+        cost_estimator : :class:`utils.cost_estimator.CostEstimator`
+            default : None
+            If provided, random configurations which are predicted to take too long
+            are resampled, and the wall time of every solved configuration is
+            recorded to calibrate the estimator.
+        failure_memo : :class:`utils.failure_memo.FailureMemo`
+            default : None
+            If provided, every solved and every failed configuration is recorded,
+            and random configurations which often failed are skipped.
     """
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger()
@@ -26,12 +75,19 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
 
     while True:
 
+        config = None
+        comparison_generator = None
         try:
             if reply_config is None:
-                config = config_generator(choice)
+                config = config_generator(
+                    choice, cost_estimator=cost_estimator, failure_memo=failure_memo
+                )
             else:
                 config = reply_config
 
+            start = time.perf_counter()
+            cache_hits = solution_cache.hits if solution_cache is not None else 0
+
             if not testing:
                 pybamm.set_logging_level("NOTICE")
                 logger.info(config)
@@ -45,6 +101,10 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
                     config["degradation_parameter"],
                     config["cycle"],
                     config["number"],
+                    processes=processes,
+                    solution_cache=solution_cache,
+                    summary_only=summary_only,
+                    sweep=sweep,
                 )
 
                 # solving the configuration and creating the plot
@@ -66,6 +126,15 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
                     }
                 )
 
+                record_run(
+                    cost_estimator,
+                    failure_memo,
+                    config,
+                    choice,
+                    time.perf_counter() - start,
+                    solution_cache is not None and solution_cache.hits > cache_hits,
+                )
+
                 return
 
             else:
@@ -81,6 +150,12 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
                     config["number"],
                     config["param_to_vary_info"],
                     config["varied_values_override"],
+                    model_cache=model_cache,
+                    processes=processes,
+                    sweep=sweep,
+                    solution_cache=solution_cache,
+                    points_per_frame=points_per_frame,
+                    experiment=config.get("experiment"),
                 )
 
                 # create a GIF
@@ -107,7 +182,81 @@ def random_plot_generator(return_dict, choice, reply_config=None, testing=False)
                     }
                 )
 
+                record_run(
+                    cost_estimator,
+                    failure_memo,
+                    config,
+                    choice,
+                    time.perf_counter() - start,
+                    solution_cache is not None and solution_cache.hits > cache_hits,
+                    drawn_values(comparison_generator, choice),
+                )
+
                 return
 
         except Exception as e:  # pragma: no cover
             print(e)
+            if failure_memo is not None and config is not None:
+                failure_memo.record(
+                    config,
+                    choice,
+                    failed=True,
+                    varied_values=drawn_values(comparison_generator, choice),
+                )
+            # a requested configuration fails the same way every time
+            if reply_config is not None:
+                raise
+
+
+def record_run(
+    cost_estimator,
+    failure_memo,
+    config,
+    choice,
+    wall_time,
+    is_cached,
+    varied_values=None,
+):
+    """
+    Records the wall time of a solved configuration in the cost estimator and the
+    successful run in the failure memo, if provided. The wall times of the
+    configurations loaded from the solution cache are not recorded.
+
+    Parameters
+    ----------
+        cost_estimator : :class:`utils.cost_estimator.CostEstimator` or None
+        failure_memo : :class:`utils.failure_memo.FailureMemo` or None
+        config : dict
+        choice : str
+        wall_time : numerical
+        is_cached : bool
+        varied_values : list
+            default : None
+            Values of the varied parameter drawn while solving, see
+            `drawn_values`.
+    """
+    if cost_estimator is not None and not is_cached:
+        cost_estimator.record(config, choice, wall_time)
+    if failure_memo is not None:
+        failure_memo.record(config, choice, failed=False, varied_values=varied_values)
+
+
+def drawn_values(comparison_generator, choice):
+    """
+    Returns the values of the varied parameter of a "parameter comparison", which
+    are drawn by the comparison generator if the configuration does not provide
+    them.
+
+    Parameters
+    ----------
+        comparison_generator : :class:`plotting.comparison_generator.ComparisonGenerator`
+            or None
+        choice : str
+
+    Returns
+    -------
+        varied_values : list or None
+    """
+    if choice != "parameter comparison" or comparison_generator is None:
+        return None
+    return comparison_generator.comparison_dict.get("varied_values")
@@ -1,11 +1,15 @@
 import os
+import sys
 import time
 import random
 import datetime
 import multiprocessing
 import matplotlib.pyplot as plt
 from twitter_api.upload import Upload
-from utils.custom_process import Process
+from utils.custom_process import Process, available_cpus
+from utils.cost_estimator import CostEstimator
+from utils.failure_memo import FailureMemo
+from utils.render_queue import RenderQueue
 from plotting.random_plot_generator import random_plot_generator
 from utils.tweet_text_generator import tweet_text_generator
 
@@ -22,74 +26,39 @@ class Tweet(Upload):
             To be used while testing. Can be "model comparison",
             "parameter comparison" or "degradation comparison
             (summary variables)".
+        processes : int
+            default : None
+            Number of worker processes used to solve the comparisons in parallel.
+        render_queue : :class:`utils.render_queue.RenderQueue`
+            default : None
+            Queue of pre-rendered plots. If provided and not empty, the oldest
+            pre-rendered plot is tweeted instead of rendering a new one, and is
+            removed from the queue once it has been tweeted.
     """
 
-    def __init__(self, testing=False, choice=None):
+    def __init__(self, testing=False, choice=None, processes=None, render_queue=None):
         """
         Defines video tweet properties
         """
         super().__init__()
-        # create a random GIF
-        while True:
-            manager = multiprocessing.Manager()
-            return_dict = manager.dict()
-
-            choice_list = [
-                "degradation comparison",
-                "model comparison",
-                "parameter comparison",
-            ]
-            if choice is None:
-                choice = random.choice(choice_list)
-
-            p = Process(
-                target=random_plot_generator, args=(return_dict, choice, None, testing)
+        self.testing = testing
+        self.render_queue = render_queue
+        # use a pre-rendered plot if there is one, it stays in the queue until it
+        # has been tweeted
+        self.entry = None
+        queued = render_queue.first() if render_queue is not None else None
+        if queued is not None:
+            self.entry, self.plot, description = queued
+        else:
+            self.plot, choice, return_dict = render_random_plot(
+                choice, testing, processes
             )
+            description = describe_plot(choice, return_dict)
 
-            p.start()
-            # time-out
-            p.join(1200)
-
-            if p.is_alive():  # pragma: no cover
-                print(
-                    "Simulation is taking too long, "
-                    + "KILLING IT and starting a NEW ONE."
-                )
-                p.kill()
-                p.join()
-            else:  # pragma: no cover
-                break
-
-        if os.path.exists("plot.gif"):
-            self.plot = "plot.gif"
-        elif os.path.exists("plot.png"):
-            self.plot = "plot.png"
         self.total_bytes = os.path.getsize(self.plot)
-        self.config = None
-        self.model = return_dict["model"]
-        self.chemistry = return_dict["chemistry"]
-        self.is_experiment = return_dict["is_experiment"]
-        self.cycle = return_dict["cycle"]
-        self.number = return_dict["number"]
-        self.is_comparison = return_dict["is_comparison"]
-        self.param_to_vary = return_dict["param_to_vary"]
-        self.varied_values = return_dict["varied_values"]
-        self.params = (
-            return_dict["params"]
-            if choice == "model comparison" or choice == "parameter comparison"
-            else None
-        )
-        self.degradation_mode = (
-            return_dict["degradation_mode"]
-            if "degradation_mode" in return_dict
-            else None
-        )
-        self.degradation_value = (
-            return_dict["degradation_value"]
-            if "degradation_value" in return_dict
-            else None
-        )
-        self.testing = testing
+        self.config = description["config"]
+        self.status = description["status"]
+        self.experiment = description["experiment"]
 
     def write_config(self, filename, append=False):  # pragma: no cover
         """
@@ -104,21 +73,6 @@ class Tweet(Upload):
                 default: False
                 If the file has to be opened up in append mode.
         """
-        # the configuration for the GIF
-        self.config = {
-            "model": str(self.model),
-            "model options": self.model.options
-            if not isinstance(self.model, dict)
-            else None,
-            "chemistry": self.chemistry,
-            "is_experiment": self.is_experiment,
-            "cycle": self.cycle,
-            "number": self.number,
-            "is_comparison": self.is_comparison,
-            "param_to_vary": self.param_to_vary,
-            "varied_values": self.varied_values,
-        }
-
         # append to data.txt and write to config.txt
         if not append:
             f = open(filename, "w")
@@ -137,36 +91,27 @@ class Tweet(Upload):
         """
         Publishes Tweet with attached plot
         """
-        # generate a text for the tweet
-        tweet_status, experiment = tweet_text_generator(
-            self.chemistry,
-            self.model,
-            self.is_experiment,
-            self.cycle,
-            self.number,
-            self.is_comparison,
-            self.param_to_vary,
-            self.params,
-            self.degradation_mode,
-            self.degradation_value,
-        )
-        print(tweet_status)
+        print(self.status)
 
         # data for the GIF tweet
-        request_data = {"status": tweet_status, "media_ids": self.media_id}
+        request_data = {"status": self.status, "media_ids": self.media_id}
 
         if not self.testing:
             # tweet the GIF
             req = self.post_request(self.post_tweet_url, request_data, self.oauth)
 
+            # the pre-rendered plot has been tweeted
+            if self.entry is not None:  # pragma: no cover
+                self.render_queue.remove(self.entry)
+
             # write the config in txt files for users to reproduce
             self.write_config("config.txt")
             self.write_config("data.txt", append=True)
 
             # reply to the posted tweet
-            if experiment is not None:  # pragma: no cover
+            if self.experiment is not None:  # pragma: no cover
                 reply = {
-                    "status": experiment,
+                    "status": self.experiment,
                     "in_reply_to_status_id": req.json()["id"],
                     "auto_populate_reply_metadata": True,
                 }
@@ -181,8 +126,167 @@ class Tweet(Upload):
         plt.close()
 
 
+def describe_plot(choice, return_dict):
+    """
+    Generates the texts of the tweet of a rendered plot, and the configuration
+    written for the users to reproduce it. Holds only plain Python data, so that
+    it can be stored in a `utils.render_queue.RenderQueue`.
+
+    Parameters
+    ----------
+        choice : str
+            Can be "model comparison", "parameter comparison" or "degradation
+            comparison".
+        return_dict : dict
+            Information about the plotted configuration, returned by
+            `plotting.random_plot_generator`.
+
+    Returns
+    -------
+        description : dict
+            Of the form - {"config": dict, "status": str, "experiment": str or
+            None}, where status is the text of the tweet and experiment the text
+            of the reply with the experiment, see
+            `utils.tweet_text_generator.tweet_text_generator`.
+    """
+    model = return_dict["model"]
+    status, experiment = tweet_text_generator(
+        return_dict["chemistry"],
+        model,
+        return_dict["is_experiment"],
+        return_dict["cycle"],
+        return_dict["number"],
+        return_dict["is_comparison"],
+        return_dict["param_to_vary"],
+        return_dict["params"]
+        if choice == "model comparison" or choice == "parameter comparison"
+        else None,
+        return_dict.get("degradation_mode"),
+        return_dict.get("degradation_value"),
+    )
+
+    # the configuration for the GIF
+    config = {
+        "model": str(model),
+        "model options": dict(model.options) if not isinstance(model, dict) else None,
+        "chemistry": return_dict["chemistry"],
+        "is_experiment": return_dict["is_experiment"],
+        "cycle": return_dict["cycle"],
+        "number": return_dict["number"],
+        "is_comparison": return_dict["is_comparison"],
+        "param_to_vary": return_dict["param_to_vary"],
+        "varied_values": return_dict["varied_values"],
+    }
+
+    return {"config": config, "status": status, "experiment": experiment}
+
+
+def render_random_plot(choice=None, testing=False, processes=None):
+    """
+    Renders a random plot in a separate process, starting a new one every time
+    the rendering takes longer than the time-out.
+
+    Parameters
+    ----------
+        choice : str
+            default : None
+            Can be "model comparison", "parameter comparison" or "degradation
+            comparison". Chosen randomly if not provided.
+        testing : bool
+            default : False
+        processes : int
+            default : None
+            Number of worker processes used to solve the comparisons in parallel.
+
+    Returns
+    -------
+        entry : tuple
+            Of the form - (plot, choice, results), where plot is the path of the
+            rendered GIF or PNG and results the information about the plotted
+            configuration.
+    """
+    cost_estimator = CostEstimator()
+    failure_memo = FailureMemo()
+    # create a random GIF
+    while True:
+        manager = multiprocessing.Manager()
+        return_dict = manager.dict()
+
+        choice_list = [
+            "degradation comparison",
+            "model comparison",
+            "parameter comparison",
+        ]
+        if choice is None:
+            choice = random.choice(choice_list)
+
+        p = Process(
+            target=random_plot_generator,
+            args=(return_dict, choice, None, testing),
+            kwargs={
+                "processes": processes,
+                "points_per_frame": 5,
+                "summary_only": True,
+                "cost_estimator": cost_estimator,
+                "failure_memo": failure_memo,
+                # a degradation comparison varies a single parameter of a single
+                # model, build the 500 cycle experiment only once
+                "sweep": choice == "degradation comparison",
+            },
+        )
+
+        p.start()
+        # time-out
+        p.join(1200)
+
+        if p.is_alive():  # pragma: no cover
+            print(
+                "Simulation is taking too long, "
+                + "KILLING IT and starting a NEW ONE."
+            )
+            p.kill()
+            p.join()
+        else:  # pragma: no cover
+            break
+
+    if os.path.exists("plot.gif"):
+        plot = "plot.gif"
+    elif os.path.exists("plot.png"):
+        plot = "plot.png"
+
+    return plot, choice, dict(return_dict)
+
+
+def prerender(render_queue, number_of_plots, processes=None):
+    """
+    Renders random plots and adds them to a queue, to be tweeted later.
+
+    Parameters
+    ----------
+        render_queue : :class:`utils.render_queue.RenderQueue`
+        number_of_plots : int
+        processes : int
+            default : None
+            Number of worker processes used to solve the comparisons in parallel.
+    """
+    for _ in range(number_of_plots):
+        plot, choice, return_dict = render_random_plot(processes=processes)
+        render_queue.push(plot, describe_plot(choice, return_dict))
+
+
 if __name__ == "__main__":
-    tweet = Tweet()
+    # python -m twitter_api.tweet_plot prerender 5 - adds 5 plots to the queue
+    if len(sys.argv) > 1 and sys.argv[1] == "prerender":
+        prerender(
+            RenderQueue(),
+            int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+            processes=available_cpus(),
+        )
+        sys.exit(0)
+
+    tweet = Tweet(
+        processes=available_cpus(), render_queue=RenderQueue()
+    )
     tweet.upload_init()
     tweet.upload_append()
     tweet.upload_finalize()
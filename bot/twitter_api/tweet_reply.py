@@ -1,10 +1,18 @@
 import os
 import time
 import pybamm
+import logging
 from PIL import Image
 import matplotlib.pyplot as plt
 from twitter_api.upload import Upload
-from utils.custom_process import Process
+from utils.model_cache import ModelCache
+from utils.compiled_function_cache import CompiledFunctionCache
+from utils.solution_cache import SolutionCache
+from utils.cost_estimator import CostEstimator
+from utils.failure_memo import FailureMemo
+from utils.experiment_cache import get_experiment
+from utils.parameter_constraints import check_parameter_value
+from utils.custom_process import Process, available_cpus
 from plotting.random_plot_generator import random_plot_generator
 
 
@@ -17,11 +25,23 @@ class Reply(Upload):
     ----------
         testing : bool
             To be used while testing, so that the function doesn't reply.
+        processes : int
+            default : None
+            Number of worker processes used to solve the requested comparisons in
+            parallel.
     """
 
-    def __init__(self, testing=False):
+    def __init__(self, testing=False, processes=None):
         super().__init__()
         self.testing = testing
+        self.processes = processes
+        # the caches are stored in the working directory
+        self.model_cache = (
+            ModelCache(compiled_cache=CompiledFunctionCache()) if not testing else None
+        )
+        self.solution_cache = SolutionCache() if not testing else None
+        self.cost_estimator = CostEstimator()
+        self.failure_memo = FailureMemo()
 
     def retrieve_tweet_id(self, file_name):
         """
@@ -63,6 +83,27 @@ class Reply(Upload):
             tweet_text : str
                 Text extracted from the tweet.
         """
+        choice, reply_config = self.parse_request(tweet_text)
+        self.render_reply(choice, reply_config, testing=testing)
+
+    def parse_request(self, tweet_text):
+        """
+        Reads the requested simulation from the tweet text, and rejects it if it is
+        predicted to take longer than the time-out. Runs before the rendering
+        process is started, so that a rejected request does not start one.
+
+        Parameters
+        ----------
+            tweet_text : str
+                Text extracted from the tweet.
+
+        Returns
+        -------
+            choice : str
+                "model comparison" or "parameter comparison".
+            reply_config : dict
+                The requested configuration, to be passed to `render_reply`.
+        """
         request_examples = (
             "https://github.com/pybamm-team/BattBot/blob/main/REQUEST_EXAMPLES.md"
         )
@@ -171,10 +212,7 @@ class Reply(Upload):
                         c_rate = float(x[:-1])
                         c_rate_is_present = True
                         params["Current function [A]"] = (
-                            c_rate
-                            * pybamm.ParameterValues(chemistry=chemistry)[
-                                "Nominal cell capacity [A.h]"
-                            ]
+                            c_rate * params["Nominal cell capacity [A.h]"]
                         )
                         break
             except Exception:
@@ -197,7 +235,7 @@ class Reply(Upload):
                     tweet_text[tweet_text.index("["):tweet_text.index("]") + 1]
                 )
                 number = int(tweet_text[tweet_text.index("*") + 2])
-                pybamm.Experiment(cycle * number)
+                experiment = get_experiment(cycle, number)
             except Exception:
                 raise Exception(
                     "Please provide experiment in the format - "
@@ -215,7 +253,7 @@ class Reply(Upload):
                     tweet_text[tweet_text.rindex("["):tweet_text.rindex("]") + 1]
                 )
                 number = int(tweet_text[tweet_text.index("*") + 2])
-                pybamm.Experiment(cycle * number)
+                experiment = get_experiment(cycle, number)
             except Exception:
                 raise Exception(
                     "Please provide experiment in the format - "
@@ -226,6 +264,7 @@ class Reply(Upload):
             is_experiment = False
             cycle = None
             number = None
+            experiment = None
 
         # if "model comparison"
         if "compare" in text_list:
@@ -293,6 +332,16 @@ class Reply(Upload):
                     + f"Some tweet examples - {request_examples}"
                 )
 
+            # reject the non-physical values before any model is built
+            for value in varied_values:
+                try:
+                    check_parameter_value(params, param_to_vary, value)
+                except ValueError as e:
+                    raise Exception(
+                        f"I'm sorry, {e}. Please request physical values. "
+                        + f"Some tweet examples - {request_examples}"
+                    )
+
         reply_config.update(
             {
                 "chemistry": chemistry,
@@ -300,16 +349,101 @@ class Reply(Upload):
                 "is_experiment": is_experiment,
                 "cycle": cycle,
                 "number": number,
+                "experiment": experiment,
                 "params": params,
             }
         )
 
-        # generate the simulation and GIF
+        # reduce the number of cycles of an experiment or reject the request if it is
+        # predicted to take longer than the time-out, with the wall times recorded
+        # by the previous rendering processes
+        self.cost_estimator.calibrate()
+        while (
+            not self.cost_estimator.is_affordable(reply_config, choice)
+            and is_experiment
+            and reply_config["number"] > 1
+        ):
+            reply_config["number"] -= 1
+            logging.getLogger().info(
+                f"Reducing the number of cycles to {reply_config['number']}"
+            )
+        # the cost is predicted from the cycle and the number, only the experiment
+        # which is solved is built
+        if is_experiment and reply_config["number"] != number:
+            reply_config["experiment"] = get_experiment(cycle, reply_config["number"])
+            # the user is told in the reply, see `reply_status`
+            reply_config["requested_number"] = number
+        if not self.cost_estimator.is_affordable(reply_config, choice):
+            raise Exception(
+                "I'm sorry, the requested simulation is predicted to take about "
+                + f"{self.cost_estimator.predict(reply_config, choice) / 60:.0f} "
+                + "minutes, which is more than the 20 minutes limit. Please request "
+                + f"a smaller simulation. Some tweet examples - {request_examples}"
+            )
+
+        return choice, reply_config
+
+    def render_reply(self, choice, reply_config, testing=False):
+        """
+        Generates the GIF of a requested simulation.
+
+        Parameters
+        ----------
+            choice : str
+            reply_config : dict
+                Returned by `parse_request`.
+        """
+        # generate the simulation and GIF, the runs of the tests are not recorded
+        # in the working directory
         return_dict = {}
         random_plot_generator(
-            return_dict, choice, reply_config=reply_config, testing=testing
+            return_dict,
+            choice,
+            reply_config=reply_config,
+            testing=testing,
+            model_cache=self.model_cache,
+            processes=self.processes,
+            sweep=True,
+            solution_cache=self.solution_cache,
+            points_per_frame=5,
+            summary_only=True,
+            cost_estimator=self.cost_estimator if not self.testing else None,
+            failure_memo=self.failure_memo if not self.testing else None,
         )
 
+    def reply_status(self, reply_config, size):
+        """
+        Generates the text of a reply, telling the user how the requested
+        simulation has been scaled down.
+
+        Parameters
+        ----------
+            reply_config : dict
+                Returned by `parse_request`.
+            size : tuple
+                Dimensions of the rendered GIF.
+
+        Returns
+        -------
+            status : str or None
+                None if the simulation has not been scaled down.
+        """
+        notes = []
+        if "requested_number" in reply_config:
+            notes.append(
+                f"This experiment has been run for {reply_config['number']} "
+                + f"cycle{'s' if reply_config['number'] > 1 else ''} instead of "
+                + f"{reply_config['requested_number']}, as the requested simulation "
+                + "is predicted to take more than the 20 minutes limit."
+            )
+        if size[0] < 1440:  # pragma: no cover
+            notes.append(
+                f"This GIF has been rendered at {size[0]}x{size[1]} pixels, to bring its size down to 15 MB (twitter's limit). "  # noqa
+                + "Please request a smaller simulation for a better quality GIF."
+            )
+
+        return " ".join(notes) if notes else None
+
     def reply(self):
         """
         Replies to a tweet where the bot was mentioned with the
@@ -341,8 +475,19 @@ class Reply(Upload):
                     )
                     tweet_text = mention.full_text
 
+                    # an invalid or a too expensive request is rejected before the
+                    # simulation process is started
+                    try:
+                        choice, reply_config = self.parse_request(tweet_text)
+                    except Exception as e:
+                        self.api.update_status(
+                            "@" + mention.user.screen_name + f" {e}",
+                            mention._json["id"],
+                        )
+                        return
+
                     # creating a custom process to generate the requested simulation
-                    p = Process(target=self.generate_reply, args=(tweet_text,))
+                    p = Process(target=self.render_reply, args=(choice, reply_config))
 
                     p.start()
                     # time-out
@@ -391,14 +536,9 @@ class Reply(Upload):
                     self.upload_finalize()
 
                     # reply configuration
-                    img = Image.open("plot.gif").size
-                    if img[0] <= 1080:  # pragma: no cover
-                        status = (
-                            "This GIF has been compressed twice, to bring its size down to 15 MB (twitter's limit). "  # noqa
-                            + "Please request a smaller simulation for a better quality GIF."  # noqa
-                        )
-                    else:
-                        status = None
+                    status = self.reply_status(
+                        reply_config, Image.open("plot.gif").size
+                    )
                     reply = {
                         "status": status,
                         "in_reply_to_status_id": mention._json["id"],
@@ -417,7 +557,21 @@ class Reply(Upload):
 
 
 if __name__ == "__main__":
-    reply = Reply()
+    # the CPUs available to the bot, not all the CPUs of the machine
+    reply = Reply(processes=available_cpus())
+    # build the models most of the requests hit before listening for mentions
+    reply.model_cache.warm_up(
+        [
+            pybamm.lithium_ion.DFN(),
+            pybamm.lithium_ion.SPM(),
+            pybamm.lithium_ion.SPMe(),
+        ],
+        [
+            pybamm.parameter_sets.Chen2020,
+            pybamm.parameter_sets.Marquis2019,
+            pybamm.parameter_sets.Ai2020,
+        ],
+    )
     while True:
         reply.reply()
         time.sleep(60)
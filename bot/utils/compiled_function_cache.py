@@ -0,0 +1,311 @@
+import os
+import time
+import glob
+import shutil
+import casadi
+import pybamm
+import logging
+from utils.config_hash import config_hash
+
+
+class CompiledFunctionCache:
+    """
+    Persistent cache of compiled CasADi functions. The right hand side, the
+    algebraic equations and the events of a built model are generated as C code,
+    compiled to shared libraries once, in the background, and loaded from the
+    libraries in later runs. The libraries are stored in a directory of the pybamm
+    and CasADi versions, and the directories of other versions are removed.
+
+    Parameters
+    ----------
+        path : str
+            default : "compiled_cache"
+            Directory in which the shared libraries are stored.
+        compiler : str
+            default : "gcc"
+            C compiler. The functions are not compiled if it is not available.
+    """
+
+    # the compilation time of the large functions grows quickly with the
+    # optimisation level
+    compiler_flags = ["-fPIC", "-shared", "-O1"]
+
+    # CasADi functions of a built model used by `pybamm.CasadiSolver`
+    function_names = ["casadi_rhs", "casadi_algebraic"]
+
+    # lists of the events of a built model, the events evaluated by the solver are
+    # wrapped in a callable
+    event_names = [
+        "casadi_terminate_events",
+        "terminate_events_eval",
+        "interpolant_extrapolation_events_eval",
+    ]
+
+    # a lock older than this (in seconds) is left by a compiler which was killed,
+    # and its process id may have been reused
+    max_compile_time = 3600
+
+    def __init__(self, path="compiled_cache", compiler="gcc"):
+        self.path = path
+        self.compiler = shutil.which(compiler)
+        # process ids of the compilers running in the background, the object is
+        # pickled with the model cache sent to the worker processes
+        self.compilations = []
+        self.directory = os.path.join(
+            self.path, f"pybamm-{pybamm.__version__}-casadi-{casadi.__version__}"
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+        # the libraries of other versions can not be loaded safely
+        for directory in glob.glob(os.path.join(self.path, "*")):
+            if directory != self.directory:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def key(self, sim, model_key):
+        """
+        Generates the cache key of a built simulation.
+
+        Parameters
+        ----------
+            sim : :class:`pybamm.Simulation`
+            model_key : str
+                Key of the model, chemistry and parameter values, see
+                `utils.model_cache.ModelCache.key`.
+
+        Returns
+        -------
+            key : str
+        """
+        # the mesh decides the size of the discretised model
+        return config_hash(
+            model_key, {str(name): points for name, points in sim.var_pts.items()}
+        )
+
+    def set_up(self, sim, inputs=None):
+        """
+        Sets up the solver of a built simulation, generating the CasADi functions
+        of the built model, as the solver would do while solving it.
+
+        Parameters
+        ----------
+            sim : :class:`pybamm.Simulation`
+            inputs : dict
+                default : None
+                Values of the input parameters of the built model. The generated
+                functions take the input parameters as arguments, they do not
+                depend on the values.
+
+        Returns
+        -------
+            is_set_up : bool
+                False if the solver could not be set up.
+        """
+        model = sim.built_model
+        solver = sim.solver
+        if model in solver.models_set_up:
+            return True
+
+        try:
+            solver.set_up(model, inputs)
+        except Exception:
+            return False
+        solver.models_set_up.update(
+            {model: {"initial conditions": model.concatenated_initial_conditions}}
+        )
+
+        return True
+
+    def compile(self, function, name):
+        """
+        Returns a CasADi function loaded from a shared library. If the library does
+        not exist, the function is generated as C code and compiled in the
+        background. The process id of the compiler is written to a lock file, so
+        that a function is compiled by one process at a time, and the files left
+        by a killed compiler are removed. The first derivatives are compiled as
+        well, as the integrators differentiate the function.
+
+        Parameters
+        ----------
+            function : :class:`casadi.Function`
+            name : str
+                Name of the shared library.
+
+        Returns
+        -------
+            function : :class:`casadi.Function` or None
+                None if the library is not compiled yet.
+        """
+        library = os.path.join(self.directory, name + ".so")
+        if os.path.exists(library):
+            return casadi.external(function.name(), library)
+
+        # the function is being compiled by this or another process
+        lock = os.path.join(self.directory, name + ".lock")
+        self.reap()
+        if self.is_locked(lock):
+            return None
+        try:
+            # created by a single process, the worker processes can compile the
+            # same function
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return None
+
+        # unique names, the files of a killed compiler can still be removed
+        source_name = f"{name}_{os.getpid()}.c"
+        source = os.path.join(self.directory, source_name)
+        partial_library = os.path.join(self.directory, f"{name}_{os.getpid()}.so")
+
+        code_generator = casadi.CodeGenerator(source_name)
+        for derivative in [
+            function,
+            function.jacobian(),
+            function.forward(1),
+            function.reverse(1),
+        ]:
+            code_generator.add(derivative)
+        code_generator.generate(self.directory + os.sep)
+
+        # the library is renamed only once it is complete, the compiler is killed
+        # with the process group of a timed-out worker
+        pid = os.spawnve(
+            os.P_NOWAIT,
+            "/bin/sh",
+            [
+                "sh",
+                "-c",
+                'exec > /dev/null 2>&1; "$COMPILER" $FLAGS "$SOURCE" -o "$PARTIAL" '
+                '&& mv "$PARTIAL" "$LIBRARY"; rm -f "$SOURCE" "$PARTIAL" "$LOCK"',
+            ],
+            {
+                **os.environ,
+                "COMPILER": self.compiler,
+                "FLAGS": " ".join(self.compiler_flags),
+                "SOURCE": source,
+                "PARTIAL": partial_library,
+                "LIBRARY": library,
+                "LOCK": lock,
+            },
+        )
+        with open(lock, "w") as f:
+            f.write(str(pid))
+        self.compilations.append(pid)
+
+        return None
+
+    def is_locked(self, lock):
+        """
+        Checks if a function is being compiled. A lock whose compiler is not
+        running, or which is older than `max_compile_time`, is removed with the
+        files of its compilation.
+
+        Parameters
+        ----------
+            lock : str
+                Path of the lock file of the function.
+
+        Returns
+        -------
+            is_locked : bool
+        """
+        try:
+            with open(lock, "r") as f:
+                content = f.read()
+            age = time.time() - os.path.getmtime(lock)
+        except FileNotFoundError:
+            return False
+
+        if age < self.max_compile_time:
+            if not content:
+                # the compiler is being started
+                return True
+            try:
+                os.kill(int(content), 0)
+                return True
+            except ProcessLookupError:
+                pass
+            except PermissionError:  # pragma: no cover
+                # running, as another user
+                return True
+
+        name = os.path.basename(lock)[: -len(".lock")]
+        for file_name in glob.glob(os.path.join(self.directory, f"{name}_*")):
+            os.remove(file_name)
+        os.remove(lock)
+        return False
+
+    def reap(self):
+        """
+        Collects the compilers started by this object which have finished, so that
+        they are not left as zombie processes.
+        """
+        running = []
+        for pid in self.compilations:
+            try:
+                if os.waitpid(pid, os.WNOHANG) == (0, 0):
+                    running.append(pid)
+            except ChildProcessError:
+                # started by the process from which this object was pickled
+                pass
+        self.compilations = running
+
+    def wait(self):
+        """
+        Waits for the compilers started by this object to finish.
+        """
+        for pid in self.compilations:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.compilations = []
+
+    def load(self, sim, key, inputs=None):
+        """
+        Replaces the CasADi functions of a set up simulation with the compiled
+        ones, if they have been compiled.
+
+        Parameters
+        ----------
+            sim : :class:`pybamm.Simulation`
+            key : str
+                See `key`.
+            inputs : dict
+                default : None
+                Values of the input parameters of the built model.
+        """
+        if self.compiler is None or not self.set_up(sim, inputs):
+            return
+
+        model = sim.built_model
+        try:
+            for function_name in self.function_names:
+                function = getattr(model, function_name, None)
+                if isinstance(function, casadi.Function):
+                    compiled_function = self.compile(
+                        function, f"{key}_{function_name}"
+                    )
+                    if compiled_function is not None:
+                        setattr(model, function_name, compiled_function)
+
+            for event_name in self.event_names:
+                events = getattr(model, event_name, [])
+                for i, event in enumerate(events):
+                    function = getattr(event, "_function", event)
+                    if not isinstance(function, casadi.Function):
+                        continue
+                    compiled_function = self.compile(
+                        function, f"{key}_{event_name}_{i}"
+                    )
+                    if compiled_function is None:
+                        continue
+                    if function is event:
+                        events[i] = compiled_function
+                    else:
+                        events[i] = type(event)(
+                            compiled_function, event.name, event.model
+                        )
+        except Exception as e:  # pragma: no cover
+            # the cache is only an optimisation, the generated functions are
+            # still solved
+            logging.getLogger().info(f"Could not compile the CasADi functions: {e}")
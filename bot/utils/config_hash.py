@@ -0,0 +1,75 @@
+import hashlib
+import numbers
+import numpy as np
+import pybamm
+
+
+def canonical(obj):
+    """
+    Generates a deterministic string representation of a configuration entry,
+    which stays the same across processes and runs.
+
+    Parameters
+    ----------
+        obj : any
+            Can be a number, str, list, tuple, dict, :class:`numpy.ndarray`,
+            :class:`pybamm.ParameterValues`, :class:`pybamm.BaseModel`,
+            :class:`pybamm.Experiment`, a function or a
+            :class:`utils.parameter_value_generator.FunctionLike`.
+
+    Returns
+    -------
+        canonical_str : str
+    """
+    if obj is None or isinstance(obj, (bool, str)):
+        return repr(obj)
+    elif isinstance(obj, numbers.Number):
+        return repr(float(obj))
+    elif isinstance(obj, np.ndarray):
+        return "array(" + hashlib.sha256(obj.tobytes()).hexdigest() + ")"
+    elif isinstance(obj, pybamm.BaseModel):
+        return type(obj).__name__ + "(" + canonical(dict(obj.options or {})) + ")"
+    elif isinstance(obj, pybamm.Experiment):
+        return "Experiment(" + canonical(obj.operating_conditions_strings) + ")"
+    elif isinstance(obj, pybamm.Symbol):
+        return type(obj).__name__ + "(" + str(obj) + ")"
+    elif isinstance(obj, (dict, pybamm.ParameterValues)):
+        return (
+            "{"
+            + ", ".join(
+                canonical(k) + ": " + canonical(v)
+                for k, v in sorted(obj.items(), key=lambda item: str(item[0]))
+            )
+            + "}"
+        )
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(canonical(x) for x in obj) + "]"
+    # parameters scaled by `parameter_value_generator`
+    elif hasattr(obj, "fun") and hasattr(obj, "parameter"):
+        return canonical(obj.parameter) + " * " + canonical(obj.fun)
+    elif callable(obj):
+        return (
+            getattr(obj, "__module__", "")
+            + "."
+            + getattr(obj, "__qualname__", type(obj).__name__)
+        )
+    return repr(obj)
+
+
+def config_hash(*objs):
+    """
+    Hashes the canonical representation of the given configuration entries.
+
+    Parameters
+    ----------
+        objs : any
+            Configuration entries, see `canonical`.
+
+    Returns
+    -------
+        key : str
+            Hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(
+        "|".join(canonical(obj) for obj in objs).encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,253 @@
+import os
+import json
+import pybamm
+import numpy as np
+from utils.experiment_cache import get_experiment
+
+
+class CostEstimator:
+    """
+    Predicts the wall time of a configuration before it is solved. The logarithm
+    of the wall time is modelled as a linear function of the configuration
+    features (see `features`). The weights start from rough hand-set values and
+    are calibrated with the wall times recorded for the past runs.
+
+    Parameters
+    ----------
+        path : str
+            default : "cost_records.jsonl"
+            File in which the features and the wall times of the past runs are
+            recorded, one run per line. The scheduled workflow restores and saves
+            it with a cache, so that the runs of the tweeted plots calibrate the
+            estimator as well.
+        budget : numerical
+            default : 1200
+            Wall time (in seconds) a configuration is allowed to take.
+        regularisation : numerical
+            default : 1
+            Weight of the hand-set values in the calibration. Higher values need
+            more recorded runs to move the weights away from the hand-set values.
+    """
+
+    # hand-set weights of the features, in the order of `features`
+    prior_weights = np.array(
+        [
+            0.0,  # bias, an SPM discharge takes about a second
+            1.0,  # log of the number of permutations
+            1.5,  # DFN
+            0.3,  # SPMe
+            # log of the number of experiment steps, the steps after the first one
+            # start from a converged state and long experiments mostly end on
+            # their termination condition
+            0.5,
+            -0.3,  # log of the C-rate, of the fastest step of an experiment
+            0.2,  # distance from 25 oC, per 10 K
+            1.0,  # degradation
+            0.3,  # Ai2020
+            0.0,  # Marquis2019
+            0.0,  # Mohtat2020
+        ]
+    )
+
+    def __init__(self, path="cost_records.jsonl", budget=1200, regularisation=1):
+        self.path = path
+        self.budget = budget
+        self.regularisation = regularisation
+        self.weights = None
+
+    def features(self, config, choice):
+        """
+        Extracts the features of a configuration.
+
+        Parameters
+        ----------
+            config : dict
+                Configuration generated by `plotting.config_generator` or parsed
+                from a reply.
+            choice : str
+                Can be "model comparison", "parameter comparison" or
+                "degradation comparison".
+
+        Returns
+        -------
+            features : numpy.ndarray
+        """
+        if choice == "degradation comparison":
+            models = [config["model"]]
+            params = config["param_values"][0]
+            number_of_param_sets = len(config["param_values"])
+            is_experiment = True
+        else:
+            models = list(config["models_for_comp"].values())
+            params = config["params"]
+            is_experiment = config["is_experiment"]
+            if choice == "parameter comparison":
+                # at most 3 random varied values
+                number_of_param_sets = (
+                    len(config["varied_values_override"])
+                    if config["varied_values_override"] is not None
+                    else 3
+                )
+            else:
+                number_of_param_sets = 1
+
+        if is_experiment:
+            number_of_steps = (
+                sum(
+                    len(step) if isinstance(step, tuple) else 1
+                    for step in config["cycle"]
+                )
+                * config["number"]
+            )
+            c_rate = experiment_c_rate(
+                config["cycle"], params["Nominal cell capacity [A.h]"]
+            )
+        else:
+            number_of_steps = 1
+            c_rate = (
+                params["Current function [A]"] / params["Nominal cell capacity [A.h]"]
+            )
+
+        model_names = [model.name for model in models]
+        options = models[0].options or {}
+        chemistry = config["chemistry"]
+
+        return np.array(
+            [
+                1,
+                np.log(len(models) * number_of_param_sets),
+                "Doyle-Fuller-Newman model" in model_names,
+                "Single Particle Model with electrolyte" in model_names,
+                np.log(number_of_steps),
+                np.log(max(abs(c_rate), 1e-2)),
+                abs(params["Ambient temperature [K]"] - 298.15) / 10,
+                options.get("SEI", "none") != "none"
+                or options.get("particle mechanics", "none") != "none",
+                chemistry == pybamm.parameter_sets.Ai2020,
+                chemistry == pybamm.parameter_sets.Marquis2019,
+                chemistry == pybamm.parameter_sets.Mohtat2020,
+            ],
+            dtype=float,
+        )
+
+    def records(self):
+        """
+        Reads the recorded runs.
+
+        Returns
+        -------
+            features : numpy.ndarray
+                Of the shape (number of runs, number of features).
+            wall_times : numpy.ndarray
+        """
+        features, wall_times = [], []
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    record = json.loads(line)
+                    # skip the runs recorded with other features
+                    if len(record["features"]) == len(self.prior_weights):
+                        features.append(record["features"])
+                        wall_times.append(record["wall_time"])
+
+        return (
+            np.array(features).reshape(-1, len(self.prior_weights)),
+            np.array(wall_times),
+        )
+
+    def calibrate(self):
+        """
+        Calibrates the weights with the recorded runs (ridge regression of the
+        logarithm of the wall times, towards the hand-set weights).
+        """
+        features, wall_times = self.records()
+        regularisation = self.regularisation * np.eye(len(self.prior_weights))
+        self.weights = np.linalg.solve(
+            features.T @ features + regularisation,
+            features.T @ np.log(wall_times) + regularisation @ self.prior_weights,
+        )
+
+    def record(self, config, choice, wall_time):
+        """
+        Records the wall time of a solved configuration.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+            wall_time : numerical
+                In seconds.
+        """
+        with open(self.path, "a") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "features": self.features(config, choice).tolist(),
+                        "wall_time": max(wall_time, 1e-3),
+                    }
+                )
+                + "\n"
+            )
+        self.weights = None
+
+    def predict(self, config, choice):
+        """
+        Predicts the wall time of a configuration.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+
+        Returns
+        -------
+            wall_time : float
+                In seconds.
+        """
+        if self.weights is None:
+            self.calibrate()
+
+        return float(np.exp(self.features(config, choice) @ self.weights))
+
+    def is_affordable(self, config, choice):
+        """
+        Checks if a configuration is predicted to be solved within the budget.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+
+        Returns
+        -------
+            is_affordable : bool
+        """
+        return self.predict(config, choice) <= self.budget
+
+
+def experiment_c_rate(cycle, nominal_capacity):
+    """
+    Returns the C-rate of the fastest current step of an experiment cycle.
+
+    Parameters
+    ----------
+        cycle : list
+            Single cycle of the experiment, of the form - [tuple] or [str].
+        nominal_capacity : numerical
+            Nominal cell capacity in A.h, to convert the currents to C-rates.
+
+    Returns
+    -------
+        c_rate : float
+            1 if the cycle has no current step (only voltage holds, power steps
+            and rests).
+    """
+    c_rates = []
+    for operating_conditions in get_experiment(cycle, 1).operating_conditions:
+        value, typ = operating_conditions["electric"]
+        if typ == "C":
+            c_rates.append(abs(value))
+        elif typ == "A":
+            c_rates.append(abs(value) / nominal_capacity)
+
+    return max(c_rates, default=0) or 1.0
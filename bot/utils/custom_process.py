@@ -1,11 +1,30 @@
+import os
+import signal
 import traceback
 import multiprocessing
 
 
+def available_cpus():
+    """
+    Returns the number of CPUs available to this process, which can be fewer than
+    the CPUs of the machine. Falls back to the CPUs of the machine where the
+    available ones cannot be read (for example, on macOS).
+
+    Returns
+    -------
+        cpus : int
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 # original code - https://stackoverflow.com/a/33599967/4992248
 class Process(multiprocessing.Process):
     """
-    Class which returns child Exceptions to Parent.
+    Class which returns child Exceptions to Parent. The process is started in its
+    own process group, so that killing it kills the worker processes it started as
+    well.
     """
 
     def __init__(self, *args, **kwargs):
@@ -14,6 +33,9 @@ class Process(multiprocessing.Process):
         self._exception = None
 
     def run(self):
+        # the worker processes (for example, of a multiprocessing.Pool) are
+        # started in this process group
+        os.setpgid(0, 0)
         try:
             multiprocessing.Process.run(self)
             self._child_conn.send(None)  # pragma: no cover
@@ -21,6 +43,16 @@ class Process(multiprocessing.Process):
             tb = traceback.format_exc()
             self._child_conn.send((e, tb))
 
+    def kill(self):
+        """
+        Kills the process and every process of its process group.
+        """
+        try:
+            os.killpg(self.pid, signal.SIGKILL)
+        except ProcessLookupError:  # pragma: no cover
+            # the process group has not been created yet
+            multiprocessing.Process.kill(self)
+
     # the exception can now be accessed in the main process using object
     @property
     def exception(self):
@@ -1,5 +1,6 @@
 import pybamm
 import random
+from types import MappingProxyType
 from utils.parameter_value_generator import parameter_value_generator
 
 
@@ -36,6 +37,267 @@ def graphite_volume_change_Ai2020(sto):
     return t_change
 
 
+def degradation_bundle(parameters):
+    """
+    Validates the degradation parameters of a degradation and freezes them, so that
+    a bundle defined once can be shared by every configuration.
+
+    Parameters
+    ----------
+        parameters : dict
+            Of the form -
+            {
+                parameter: {
+                    "print_name": str,
+                    "bounds": (lower_bound, upper_bound)
+                }
+            }
+
+    Returns
+    -------
+        bundle : :class:`types.MappingProxyType`
+            Read-only view of the parameters.
+    """
+    for parameter, info in parameters.items():
+        lower_bound, upper_bound = info["bounds"]
+        if set(info.keys()) != {"print_name", "bounds"} or (
+            lower_bound is not None
+            and upper_bound is not None
+            and lower_bound > upper_bound
+        ):
+            raise ValueError(f"Invalid degradation parameter - {parameter}")
+
+    return MappingProxyType(
+        {
+            parameter: MappingProxyType(dict(info))
+            for parameter, info in parameters.items()
+        }
+    )
+
+
+# parameters added to the Mohtat2020 parameter set for the degradation models
+mohtat2020_degradation_parameters = MappingProxyType(
+    {
+        # mechanical properties
+        "Positive electrode Poisson's ratio": 0.3,
+        "Positive electrode Young's modulus [Pa]": 375e9,
+        "Positive electrode reference concentration for free of deformation [mol.m-3]": 0,  # noqa
+        "Positive electrode partial molar volume [m3.mol-1]": -7.28e-7,
+        "Positive electrode volume change": lico2_volume_change_Ai2020,
+        "Negative electrode volume change": graphite_volume_change_Ai2020,
+        # Loss of active materials (LAM) model
+        "Positive electrode LAM constant exponential term": 2,
+        "Positive electrode critical stress [Pa]": 375e6,
+        # mechanical properties
+        "Negative electrode Poisson's ratio": 0.3,
+        "Negative electrode Young's modulus [Pa]": 15e9,
+        "Negative electrode reference concentration for free of deformation [mol.m-3]": 0,  # noqa
+        "Negative electrode partial molar volume [m3.mol-1]": 3.1e-6,
+        # Loss of active materials (LAM) model
+        "Negative electrode LAM constant exponential term": 2,
+        "Negative electrode critical stress [Pa]": 60e6,
+        # Other
+        "Cell thermal expansion coefficient [m.K-1]": 1.48e-6,
+        "SEI kinetic rate constant [m.s-1]": 1e-15,
+        "Positive electrode LAM constant proportional term [s-1]": 1e-3 / 3600,
+        "Negative electrode LAM constant proportional term [s-1]": 1e-3 / 3600,
+        "EC diffusivity [m2.s-1]": 2e-18,
+    }
+)
+
+# parameters added to a parameter set for the degradation models, of the form -
+# chemistry citation: parameters
+# the citations are read from the parameter sets, they differ from the names of
+# the parameter sets in some pybamm versions
+chemistry_degradation_parameters = {
+    pybamm.parameter_sets.Mohtat2020["citation"]: mohtat2020_degradation_parameters,
+}
+
+# degradation parameters which can be varied with "particle mechanics", of the
+# form - chemistry citation: bundle
+particle_mechanics_parameters = {
+    pybamm.parameter_sets.Ai2020["citation"]: degradation_bundle(
+        {
+            "Negative electrode Paris' law constant b": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Paris' law constant b": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode Paris' law constant m": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Paris' law constant m": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode Poisson's ratio": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Poisson's ratio": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode Young's modulus [Pa]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Young's modulus [Pa]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode reference concentration for free of deformation [mol.m-3]": {  # noqa
+                "print_name": None,
+                "bounds": (0.0, None),
+            },
+            "Positive electrode reference concentration for free of deformation [mol.m-3]": {  # noqa
+                "print_name": None,
+                "bounds": (None, None),
+            },
+        }
+    ),
+    pybamm.parameter_sets.Mohtat2020["citation"]: degradation_bundle(
+        {
+            "Positive electrode LAM constant proportional term [s-1]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode LAM constant proportional term [s-1]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode Poisson's ratio": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Poisson's ratio": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Negative electrode Young's modulus [Pa]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "Positive electrode Young's modulus [Pa]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+        }
+    ),
+}
+
+# the ambient temperature can be varied with every "SEI"
+temperature_parameter = {
+    "Ambient temperature [K]": {"print_name": None, "bounds": (265, 355)},
+}
+
+# degradation parameters which can be varied with "SEI", of the form -
+# SEI: bundle
+sei_parameters = {
+    "ec reaction limited": degradation_bundle(
+        {
+            "EC initial concentration in electrolyte [mol.m-3]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            "SEI open-circuit potential [V]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            **temperature_parameter,
+        }
+    ),
+    "reaction limited": degradation_bundle(temperature_parameter),
+    "solvent-diffusion limited": degradation_bundle(
+        {
+            "Bulk solvent concentration [mol.m-3]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            **temperature_parameter,
+        }
+    ),
+    "electron-migration limited": degradation_bundle(
+        {
+            "Inner SEI open-circuit potential [V]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            **temperature_parameter,
+        }
+    ),
+    "interstitial-diffusion limited": degradation_bundle(
+        {
+            "Lithium interstitial reference concentration [mol.m-3]": {
+                "print_name": None,
+                "bounds": (None, None),
+            },
+            **temperature_parameter,
+        }
+    ),
+}
+
+
+def degradation_parameter_values(chemistry):
+    """
+    Returns the parameter values of a chemistry with the parameters added for the
+    degradation models.
+
+    Parameters
+    ----------
+        chemistry : dict
+
+    Returns
+    -------
+        params : :class:`pybamm.ParameterValues`
+    """
+    params = pybamm.ParameterValues(chemistry=chemistry)
+    updates = chemistry_degradation_parameters.get(chemistry["citation"])
+    if updates is not None:
+        params.update(dict(updates), check_already_exists=False)
+
+    return params
+
+
+def degradation_parameter_dict(chemistry, degradation_mode, degradation_value):
+    """
+    Generates the parameter values for a degradation and the degradation
+    parameters which can be varied.
+
+    Parameters
+    ----------
+        chemistry : dict
+        degradation_mode : str
+            The degradation option added to a model. Can be "SEI" and
+            "particle mechanics".
+        degradation_value : str
+            Value of the degradation mode.
+
+    Returns
+    -------
+        params : :class:`pybamm.ParameterValues`
+            Parameter values with the degradation parameters.
+        degradation_parameters : :class:`types.MappingProxyType`
+            Read-only bundle of the form -
+            {
+                parameter: {
+                    "print_name": str,
+                    "bounds": (lower_bound, upper_bound)
+                }
+            }
+    """
+    if degradation_mode == "particle mechanics":
+        degradation_parameters = particle_mechanics_parameters[chemistry["citation"]]
+    elif degradation_mode == "SEI":
+        degradation_parameters = sei_parameters[degradation_value]
+
+    return degradation_parameter_values(chemistry), degradation_parameters
+
+
 def degradation_parameter_generator(
     chemistry, number_of_comp, degradation_mode, degradation_value
 ):
@@ -61,158 +323,9 @@ def degradation_parameter_generator(
             Parameter that has been varied.
     """
 
-    params = pybamm.ParameterValues(chemistry=chemistry)
-
-    if chemistry == pybamm.parameter_sets.Mohtat2020:
-        params.update(
-            {
-                # mechanical properties
-                "Positive electrode Poisson's ratio": 0.3,
-                "Positive electrode Young's modulus [Pa]": 375e9,
-                "Positive electrode reference concentration for free of deformation [mol.m-3]": 0,  # noqa
-                "Positive electrode partial molar volume [m3.mol-1]": -7.28e-7,
-                "Positive electrode volume change": lico2_volume_change_Ai2020,
-                "Negative electrode volume change": graphite_volume_change_Ai2020,
-                # Loss of active materials (LAM) model
-                "Positive electrode LAM constant exponential term": 2,
-                "Positive electrode critical stress [Pa]": 375e6,
-                # mechanical properties
-                "Negative electrode Poisson's ratio": 0.3,
-                "Negative electrode Young's modulus [Pa]": 15e9,
-                "Negative electrode reference concentration for free of deformation [mol.m-3]": 0,  # noqa
-                "Negative electrode partial molar volume [m3.mol-1]": 3.1e-6,
-                # Loss of active materials (LAM) model
-                "Negative electrode LAM constant exponential term": 2,
-                "Negative electrode critical stress [Pa]": 60e6,
-                # Other
-                "Cell thermal expansion coefficient [m.K-1]": 1.48e-6,
-                "SEI kinetic rate constant [m.s-1]": 1e-15,
-                "Positive electrode LAM constant proportional term [s-1]": 1e-3 / 3600,
-                "Negative electrode LAM constant proportional term [s-1]": 1e-3 / 3600,
-                "EC diffusivity [m2.s-1]": 2e-18,
-            },
-            check_already_exists=False,
-        )
-    if degradation_mode == "particle mechanics":
-        if chemistry == pybamm.parameter_sets.Ai2020:
-            degradation_parameters = {
-                "Negative electrode Paris' law constant b": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Paris' law constant b": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode Paris' law constant m": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Paris' law constant m": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode Poisson's ratio": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Poisson's ratio": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode Young's modulus [Pa]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Young's modulus [Pa]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode reference concentration for free of deformation [mol.m-3]": {  # noqa
-                    "print_name": None,
-                    "bounds": (0.0, None),
-                },
-                "Positive electrode reference concentration for free of deformation [mol.m-3]": {  # noqa
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-            }
-        elif chemistry == pybamm.parameter_sets.Mohtat2020:
-            degradation_parameters = {
-                "Positive electrode LAM constant proportional term [s-1]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode LAM constant proportional term [s-1]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode Poisson's ratio": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Poisson's ratio": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Negative electrode Young's modulus [Pa]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-                "Positive electrode Young's modulus [Pa]": {
-                    "print_name": None,
-                    "bounds": (None, None),
-                },
-            }
-
-    if degradation_mode == "SEI":
-        degradation_parameters = {}
-        if degradation_value == "ec reaction limited":
-            degradation_parameters.update(
-                {
-                    "EC initial concentration in electrolyte [mol.m-3]": {
-                        "print_name": None,
-                        "bounds": (None, None),
-                    },
-                    "SEI open-circuit potential [V]": {
-                        "print_name": None,
-                        "bounds": (None, None),
-                    },
-                }
-            )
-        elif degradation_value == "solvent-diffusion limited":
-            degradation_parameters.update(
-                {
-                    "Bulk solvent concentration [mol.m-3]": {
-                        "print_name": None,
-                        "bounds": (None, None),
-                    }
-                },
-            )
-        elif degradation_value == "electron-migration limited":
-            degradation_parameters.update(
-                {
-                    "Inner SEI open-circuit potential [V]": {
-                        "print_name": None,
-                        "bounds": (None, None),
-                    },
-                }
-            )
-        elif degradation_value == "interstitial-diffusion limited":
-            degradation_parameters.update(
-                {
-                    "Lithium interstitial reference concentration [mol.m-3]": {
-                        "print_name": None,
-                        "bounds": (None, None),
-                    },
-                }
-            )
-
-        degradation_parameters.update(
-            {
-                "Ambient temperature [K]": {"print_name": None, "bounds": (265, 355)},
-            }
-        )
+    params, degradation_parameters = degradation_parameter_dict(
+        chemistry, degradation_mode, degradation_value
+    )
 
     degradation_parameter = random.choice(list(degradation_parameters.keys()))
 
@@ -1,7 +1,7 @@
 import random
 
 
-def desired_decimal_point_generator(start, stop, step):
+def desired_decimal_point_generator(start, stop, step, rng=random):
     """
     Generates a random number with desired number
     of decimal digits.
@@ -11,10 +11,14 @@ def desired_decimal_point_generator(start, stop, step):
         start : numerical
         stop : numerical
         step : numerical
+        rng : :class:`random.Random`
+            default : random
+            Random number generator, the global one of the `random` module if not
+            provided.
 
     Returns
     -------
         rand_num : numerical
     """
-    rand_num = round(random.uniform(start, stop), step)
+    rand_num = round(rng.uniform(start, stop), step)
     return rand_num
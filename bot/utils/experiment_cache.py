@@ -0,0 +1,80 @@
+import copy
+import pybamm
+
+# experiments built in this process, of the form -
+# {(cycle, number, termination): pybamm.Experiment}
+_experiments = {}
+
+# attributes of a :class:`pybamm.Experiment` with an entry for every cycle or step,
+# repeated to build an experiment from its parsed cycle
+_cycle_attributes = [
+    "operating_conditions_cycles",
+    "cycle_lengths",
+    "operating_conditions_strings",
+    "operating_conditions",
+    "events",
+]
+
+
+def get_experiment(cycle, number, termination=None):
+    """
+    Returns the experiment repeating a cycle. An experiment is built only once per
+    process for the same cycle, number and termination, and every call returns the
+    same object. The steps of the cycle are parsed only once, and their parsed
+    operating conditions are repeated, a cycle repeated 500 times is otherwise
+    parsed 500 times.
+
+    Parameters
+    ----------
+        cycle : list
+            Single cycle of the experiment, of the form - [tuple] or [str].
+        number : int
+            Number of times the cycle is repeated.
+        termination : str
+            default : None
+            Termination condition of the experiment.
+
+    Returns
+    -------
+        experiment : :class:`pybamm.Experiment`
+    """
+    key = (tuple(cycle), number, termination)
+    if key not in _experiments:
+        experiment = (
+            pybamm.Experiment(cycle, termination=termination)
+            if termination is not None
+            else pybamm.Experiment(cycle)
+        )
+        if all(
+            isinstance(getattr(experiment, name, None), list)
+            for name in _cycle_attributes
+        ):
+            repeated_experiment = copy.copy(experiment)
+            for name in _cycle_attributes:
+                # copies, so that the steps of the cycles are never shared
+                setattr(
+                    repeated_experiment,
+                    name,
+                    [
+                        copy.copy(value)
+                        for _ in range(number)
+                        for value in getattr(experiment, name)
+                    ],
+                )
+            _experiments[key] = repeated_experiment
+        else:  # pragma: no cover
+            # another pybamm release, the whole experiment is parsed
+            _experiments[key] = (
+                pybamm.Experiment(cycle * number, termination=termination)
+                if termination is not None
+                else pybamm.Experiment(cycle * number)
+            )
+
+    return _experiments[key]
+
+
+def clear():
+    """
+    Removes all the built experiments.
+    """
+    _experiments.clear()
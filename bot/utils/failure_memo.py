@@ -0,0 +1,275 @@
+import os
+import csv
+import json
+import random
+import numpy as np
+
+
+class FailureMemo:
+    """
+    Persistent index of the configurations which failed to solve. The runs are
+    grouped by (chemistry, models, degradation options, varied parameter, value
+    bucket, experiment shape), and a random configuration of a group which fails
+    often can be skipped or down-weighted before it is solved again. The value
+    bucket is taken from the values actually solved, a configuration whose values
+    are not drawn yet is matched against the groups of all the value buckets.
+
+    Parameters
+    ----------
+        path : str
+            default : "failure_memo.json"
+            File in which the number of runs and failures of every group are
+            stored. The file is not committed, the groups persist with the working
+            directory (the reply loop of a long-running bot), and are restored
+            from the cache of the scheduled CI runs.
+        min_runs : int
+            default : 3
+            Number of runs after which the failure rate of a group is used.
+        skip_rate : numerical
+            default : 0.9
+            Failure rate above which the configurations of a group are always
+            skipped. Below it, a configuration is skipped with a probability
+            equal to the failure rate.
+    """
+
+    # model options varied by `plotting.config_generator`
+    options = [
+        "SEI",
+        "SEI porosity change",
+        "particle mechanics",
+        "loss of active material",
+    ]
+
+    def __init__(self, path="failure_memo.json", min_runs=3, skip_rate=0.9):
+        self.path = path
+        self.min_runs = min_runs
+        self.skip_rate = skip_rate
+
+    def key(self, config, choice, varied_values=None):
+        """
+        Generates the group of a configuration.
+
+        Parameters
+        ----------
+            config : dict
+                Configuration generated by `plotting.config_generator` or parsed
+                from a reply.
+            choice : str
+                Can be "model comparison", "parameter comparison" or
+                "degradation comparison".
+            varied_values : list
+                default : None
+                Values of the varied parameter drawn while solving a "parameter
+                comparison", used instead of the ones of the configuration.
+
+        Returns
+        -------
+            key : list
+                Of the form - [chemistry, models, options, varied parameter,
+                value bucket, experiment shape], where the value bucket is the
+                base 2 exponent of the largest varied value, None if the values
+                are not known.
+        """
+        if choice == "degradation comparison":
+            models = [config["model"]]
+            param_to_vary = config["degradation_parameter"]
+            values = config["varied_values"]
+        else:
+            models = list(config["models_for_comp"].values())
+            param_to_vary = (
+                list(config["param_to_vary_info"].keys())[0]
+                if config["param_to_vary_info"] is not None
+                else None
+            )
+            values = (
+                varied_values
+                if varied_values is not None
+                else config["varied_values_override"]
+            )
+
+        options = models[0].options or {}
+        value_bucket = (
+            int(np.floor(np.log2(max(abs(float(str(value))) for value in values))))
+            if values and max(abs(float(str(value))) for value in values) > 0
+            else None
+        )
+        if config["cycle"] is not None:
+            steps = [
+                step
+                for operating_conditions in config["cycle"]
+                for step in (
+                    operating_conditions
+                    if isinstance(operating_conditions, tuple)
+                    else (operating_conditions,)
+                )
+            ]
+            experiment_shape = (
+                "-".join(step.split(" ")[0] for step in steps)
+                + f" * {config['number']}"
+            )
+        else:
+            experiment_shape = None
+
+        return [
+            config["chemistry"]["citation"],
+            " vs ".join(model.name for model in models),
+            {option: str(options.get(option, "none")) for option in self.options},
+            param_to_vary,
+            value_bucket,
+            experiment_shape,
+        ]
+
+    def load(self):
+        """
+        Reads the stored groups.
+
+        Returns
+        -------
+            memo : dict
+                Of the form - {key: {"runs": int, "failures": int}}, where key is
+                the JSON string of a group.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def record(self, config, choice, failed, varied_values=None):
+        """
+        Records a run of a configuration.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+            failed : bool
+                If the configuration failed to solve.
+            varied_values : list
+                default : None
+                Values of the varied parameter drawn while solving, see `key`.
+        """
+        memo = self.load()
+        key = json.dumps(self.key(config, choice, varied_values), sort_keys=True)
+        counts = memo.setdefault(key, {"runs": 0, "failures": 0})
+        counts["runs"] += 1
+        counts["failures"] += int(failed)
+
+        # replace the file at once, so that it is never read half-written
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(memo, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def failure_rate(self, config, choice):
+        """
+        Returns the failure rate of the group of a configuration, 0 if the group
+        has less than `min_runs` runs. If the values of the configuration are not
+        known, the runs of the groups of all the value buckets are counted.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+
+        Returns
+        -------
+            failure_rate : float
+        """
+        key = self.key(config, choice)
+        runs = 0
+        failures = 0
+        for stored_key, counts in self.load().items():
+            stored_key = json.loads(stored_key)
+            if key[4] is None:
+                # match every value bucket
+                stored_key[4] = None
+            if stored_key == key:
+                runs += counts["runs"]
+                failures += counts["failures"]
+        if runs < self.min_runs:
+            return 0.0
+        return failures / runs
+
+    def accept(self, config, choice):
+        """
+        Decides if a configuration should be solved.
+
+        Parameters
+        ----------
+            config : dict
+            choice : str
+
+        Returns
+        -------
+            accept : bool
+        """
+        failure_rate = self.failure_rate(config, choice)
+        if failure_rate >= self.skip_rate:
+            return False
+        return random.random() >= failure_rate
+
+    def stats(self):
+        """
+        Returns the failure statistics of all the groups, the groups with the
+        highest failure rate first.
+
+        Returns
+        -------
+            stats : list
+                Of the form - [dict]
+        """
+        stats = []
+        for key, counts in self.load().items():
+            (
+                chemistry,
+                models,
+                options,
+                param_to_vary,
+                value_bucket,
+                experiment_shape,
+            ) = json.loads(key)
+            stats.append(
+                {
+                    "chemistry": chemistry,
+                    "models": models,
+                    "options": options,
+                    "param_to_vary": param_to_vary,
+                    "value_bucket": value_bucket,
+                    "experiment_shape": experiment_shape,
+                    "runs": counts["runs"],
+                    "failures": counts["failures"],
+                    "failure_rate": counts["failures"] / counts["runs"],
+                }
+            )
+
+        return sorted(stats, key=lambda x: (-x["failure_rate"], -x["runs"]))
+
+    def export(self, filename="failure_stats.csv"):
+        """
+        Writes the failure statistics to a CSV file.
+
+        Parameters
+        ----------
+            filename : str
+                default : "failure_stats.csv"
+        """
+        fieldnames = [
+            "chemistry",
+            "models",
+            "options",
+            "param_to_vary",
+            "value_bucket",
+            "experiment_shape",
+            "runs",
+            "failures",
+            "failure_rate",
+        ]
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in self.stats():
+                writer.writerow(row)
+
+
+if __name__ == "__main__":
+    # python -m utils.failure_memo - exports the failure statistics
+    FailureMemo().export()
@@ -0,0 +1,39 @@
+def save_initial_conditions(sim):
+    """
+    Saves the initial conditions of the built step models of an experiment.
+    Solving an experiment replaces the initial conditions of a step model with the
+    state at the start of its last step, so that solving the simulation again
+    would start from that state, see `restore_initial_conditions`.
+
+    Parameters
+    ----------
+        sim : :class:`pybamm.Simulation`
+            A simulation built for an experiment.
+
+    Returns
+    -------
+        initial_conditions : dict
+            Of the form - {model: (initial_conditions, concatenated_initial_conditions)}
+    """
+    return {
+        model: (dict(model.initial_conditions), model.concatenated_initial_conditions)
+        for model in sim.op_conds_to_built_models.values()
+    }
+
+
+def restore_initial_conditions(initial_conditions):
+    """
+    Restores the initial conditions of the built step models of an experiment,
+    before solving it again.
+
+    Parameters
+    ----------
+        initial_conditions : dict
+            Saved by `save_initial_conditions`.
+    """
+    for model, (
+        model_initial_conditions,
+        concatenated_initial_conditions,
+    ) in initial_conditions.items():
+        model.initial_conditions = model_initial_conditions
+        model.concatenated_initial_conditions = concatenated_initial_conditions
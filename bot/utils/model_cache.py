@@ -0,0 +1,276 @@
+import os
+import glob
+import numbers
+import logging
+import pybamm
+from utils.config_hash import config_hash
+from utils.parameter_value_generator import FunctionLike
+
+
+class ModelCache:
+    """
+    Persistent cache of built (parameterised, meshed and discretised)
+    simulations. Built simulations are pickled to disk, so that repeated
+    configurations go straight to the solver, and the least recently used
+    entries are evicted once the cache holds more than `max_size` entries.
+
+    The numerical parameters which differ from the default parameter values of the
+    chemistry are built as input parameters, so that configurations which differ
+    only in their values (for example, the random current and temperature) share
+    the same built simulation. The configurations which can not be built with
+    input parameters are remembered on the disk, and are not tried again.
+
+    Parameters
+    ----------
+        path : str
+            default : "model_cache"
+            Directory in which the built simulations are stored.
+        max_size : int
+            default : 16
+            Maximum number of built simulations stored on disk.
+        compiled_cache : :class:`utils.compiled_function_cache.CompiledFunctionCache`
+            default : None
+            If provided, the solvers of the simulations without an experiment are
+            set up before the simulations are stored, and the CasADi functions of
+            the built models are loaded from compiled shared libraries.
+    """
+
+    def __init__(self, path="model_cache", max_size=16, compiled_cache=None):
+        self.path = path
+        self.max_size = max_size
+        self.compiled_cache = compiled_cache
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, model, chemistry, parameter_values, experiment=None):
+        """
+        Generates the cache key for a configuration. The parameter values are
+        a part of the key as they are baked into the discretised model, the input
+        parameters are a part of it only by their names.
+
+        Parameters
+        ----------
+            model : :class:`pybamm.BaseBatteryModel`
+            chemistry : dict
+            parameter_values : :class:`pybamm.ParameterValues`
+                Parameter values with the input parameters, see `input_parameters`.
+            experiment : :class:`pybamm.Experiment`
+                default : None
+
+        Returns
+        -------
+            key : str
+        """
+        return config_hash(model, chemistry, parameter_values, experiment)
+
+    def input_parameters(self, chemistry, parameter_values):
+        """
+        Replaces the numerical parameters which differ from the default parameter
+        values of the chemistry with input parameters. The parameters scaled by
+        `utils.parameter_value_generator` keep their function, scaled by the input
+        parameter.
+
+        Parameters
+        ----------
+            chemistry : dict
+            parameter_values : :class:`pybamm.ParameterValues`
+
+        Returns
+        -------
+            parameter_values : :class:`pybamm.ParameterValues`
+                Copy of the parameter values with the input parameters.
+            inputs : dict
+                Values of the input parameters, to be passed to the solver.
+        """
+        default_parameter_values = pybamm.ParameterValues(chemistry=chemistry)
+        input_parameter_values = parameter_values.copy()
+        inputs = {}
+        for name, value in parameter_values.items():
+            if isinstance(value, FunctionLike) and isinstance(
+                value.parameter, numbers.Number
+            ):
+                input_parameter_values[name] = FunctionLike(
+                    value.fun, pybamm.InputParameter(name)
+                )
+                inputs[name] = value.parameter
+            elif isinstance(value, numbers.Number) and (
+                name not in default_parameter_values.keys()
+                or value != default_parameter_values[name]
+            ):
+                input_parameter_values[name] = "[input]"
+                inputs[name] = value
+
+        return input_parameter_values, inputs
+
+    def get_simulation(self, model, chemistry, parameter_values, experiment=None):
+        """
+        Returns a built simulation for the given configuration, loading it from
+        the disk if it has been built before, and building and storing it
+        otherwise. The parameters which differ from the default parameter values
+        are input parameters of the built simulation, see `input_parameters`, unless
+        the simulation can not be built with them (for example, for a geometric
+        parameter).
+
+        Parameters
+        ----------
+            model : :class:`pybamm.BaseBatteryModel`
+            chemistry : dict
+            parameter_values : :class:`pybamm.ParameterValues`
+            experiment : :class:`pybamm.Experiment`
+                default : None
+
+        Returns
+        -------
+            sim : :class:`pybamm.Simulation`
+            inputs : dict
+                Values of the input parameters, to be passed to `sim.solve`.
+        """
+        input_parameter_values, inputs = self.input_parameters(
+            chemistry, parameter_values
+        )
+        if inputs:
+            failed_file_name = os.path.join(
+                self.path,
+                self.key(model, chemistry, input_parameter_values, experiment)
+                + ".failed",
+            )
+            if not os.path.exists(failed_file_name):
+                try:
+                    sim = self.get_built_simulation(
+                        model, chemistry, input_parameter_values, experiment, inputs
+                    )
+                    return sim, inputs
+                except Exception:
+                    # the parameters are baked into the built simulation instead,
+                    # for this and every later call with the configuration
+                    open(failed_file_name, "w").close()
+
+        sim = self.get_built_simulation(model, chemistry, parameter_values, experiment)
+        return sim, {}
+
+    def warm_up(
+        self,
+        models,
+        chemistries,
+        input_names=("Current function [A]", "Ambient temperature [K]"),
+    ):
+        """
+        Pre-populates the cache with every model and chemistry combination, built
+        with the given parameters as input parameters. These are the simulations
+        hit by the requests without an experiment, which provide their own current
+        and temperature. To be called before listening for the requests.
+
+        Parameters
+        ----------
+            models : list
+                :class:`pybamm.BaseBatteryModel` objects.
+            chemistries : list
+                Chemistries (dict) of the models.
+            input_names : tuple
+                default : ("Current function [A]", "Ambient temperature [K]")
+                Names of the parameters built as input parameters.
+        """
+        for chemistry in chemistries:
+            parameter_values = pybamm.ParameterValues(chemistry=chemistry)
+            input_parameter_values = parameter_values.copy()
+            inputs = {}
+            for name in input_names:
+                input_parameter_values[name] = "[input]"
+                inputs[name] = parameter_values[name]
+            for model in models:
+                self.get_built_simulation(
+                    model, chemistry, input_parameter_values, None, inputs
+                )
+
+    def get_built_simulation(
+        self, model, chemistry, parameter_values, experiment, inputs=None
+    ):
+        """
+        Loads a built simulation from the disk, or builds and stores it.
+
+        Parameters
+        ----------
+            model : :class:`pybamm.BaseBatteryModel`
+            chemistry : dict
+            parameter_values : :class:`pybamm.ParameterValues`
+            experiment : :class:`pybamm.Experiment` or None
+            inputs : dict
+                default : None
+                Values of the input parameters, with which the solver is set up.
+
+        Returns
+        -------
+            sim : :class:`pybamm.Simulation`
+        """
+        key = self.key(model, chemistry, parameter_values, experiment)
+        file_name = os.path.join(self.path, key + ".pkl")
+        # the experiment step models are set up while solving every step
+        compiled_cache = self.compiled_cache if experiment is None else None
+
+        if os.path.exists(file_name):
+            try:
+                sim = pybamm.load_sim(file_name)
+            except Exception:  # pragma: no cover
+                # stale pickle (for example, from another pybamm version)
+                os.remove(file_name)
+            else:
+                self.hits += 1
+                # mark the entry as the most recently used one
+                os.utime(file_name)
+                if compiled_cache is not None:
+                    compiled_cache.load(sim, compiled_cache.key(sim, key), inputs)
+                return sim
+
+        self.misses += 1
+        sim = pybamm.Simulation(
+            model, experiment=experiment, parameter_values=parameter_values
+        )
+        if experiment is None:
+            sim.build()
+        else:
+            sim.build_for_experiment()
+        if compiled_cache is not None:
+            # store the generated CasADi functions with the simulation
+            compiled_cache.set_up(sim, inputs)
+
+        try:
+            sim.save(file_name)
+        except Exception as e:  # pragma: no cover
+            # the cache is only an optimisation, a simulation which cannot be
+            # pickled is still solved
+            logging.getLogger().info(f"Could not cache the built model: {e}")
+            if os.path.exists(file_name):
+                os.remove(file_name)
+        self.evict()
+
+        if compiled_cache is not None:
+            compiled_cache.load(sim, compiled_cache.key(sim, key), inputs)
+
+        return sim
+
+    def evict(self):
+        """
+        Removes the least recently used entries until at most `max_size`
+        entries are left.
+        """
+        entries = sorted(
+            glob.glob(os.path.join(self.path, "*.pkl")), key=os.path.getmtime
+        )
+        for file_name in entries[: max(len(entries) - self.max_size, 0)]:
+            os.remove(file_name)
+
+    def stats(self):
+        """
+        Returns the hit / miss counters of this object and the number of
+        entries on the disk.
+
+        Returns
+        -------
+            stats : dict
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(glob.glob(os.path.join(self.path, "*.pkl"))),
+        }
@@ -0,0 +1,184 @@
+import numpy as np
+
+# physical domains of the parameters which can be varied, of the form -
+# parameter: (lower_bound, upper_bound)
+# the bounds are exclusive and can be None, a function of the parameter values is
+# varied by a scale, which should always be positive
+parameter_domains = {
+    # geometry
+    "Electrode height [m]": (0, None),
+    "Electrode width [m]": (0, None),
+    # transport
+    "Negative electrode conductivity [S.m-1]": (0, None),
+    "Negative electrode Bruggeman coefficient (electrolyte)": (0, None),
+    "Positive electrode Bruggeman coefficient (electrolyte)": (0, None),
+    # volume fractions
+    "Negative electrode porosity": (0, 1),
+    "Positive electrode porosity": (0, 1),
+    "Negative electrode active material volume fraction": (0, 1),
+    "Positive electrode active material volume fraction": (0, 1),
+    # mechanics
+    "Negative electrode Poisson's ratio": (-1, 0.5),
+    "Positive electrode Poisson's ratio": (-1, 0.5),
+    "Negative electrode Young's modulus [Pa]": (0, None),
+    "Positive electrode Young's modulus [Pa]": (0, None),
+    "Negative electrode Paris' law constant b": (0, None),
+    "Positive electrode Paris' law constant b": (0, None),
+    "Negative electrode Paris' law constant m": (0, None),
+    "Positive electrode Paris' law constant m": (0, None),
+    "Negative electrode LAM constant proportional term [s-1]": (0, None),
+    "Positive electrode LAM constant proportional term [s-1]": (0, None),
+    # SEI
+    "EC initial concentration in electrolyte [mol.m-3]": (0, None),
+    "Bulk solvent concentration [mol.m-3]": (0, None),
+    "Lithium interstitial reference concentration [mol.m-3]": (0, None),
+    # thermal
+    "Ambient temperature [K]": (0, None),
+}
+
+# constraints coupling the parameters, of the form -
+# ([parameter1, parameter2, ...], limit)
+# the sum of the parameters should not exceed the limit, which can be a number or
+# another parameter
+coupled_constraints = [
+    # the pores and the active material fill at most the whole electrode
+    (
+        [
+            "Negative electrode porosity",
+            "Negative electrode active material volume fraction",
+        ],
+        1,
+    ),
+    (
+        [
+            "Positive electrode porosity",
+            "Positive electrode active material volume fraction",
+        ],
+        1,
+    ),
+    (
+        [
+            "Negative electrode reference concentration for free of deformation [mol.m-3]"  # noqa
+        ],
+        "Maximum concentration in negative electrode [mol.m-3]",
+    ),
+    (
+        [
+            "Positive electrode reference concentration for free of deformation [mol.m-3]"  # noqa
+        ],
+        "Maximum concentration in positive electrode [mol.m-3]",
+    ),
+]
+
+
+def coupled_upper_bound(params, parameter):
+    """
+    Calculates the largest value of a parameter allowed by the coupled
+    constraints, given the other parameter values.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+
+    Returns
+    -------
+        upper_bound : numerical
+            np.inf if the parameter is not coupled to a numerical parameter.
+    """
+    upper_bound = np.inf
+    for parameters, limit in coupled_constraints:
+        if parameter not in parameters:
+            continue
+        try:
+            others = [params[other] for other in parameters if other != parameter]
+            limit = params[limit] if isinstance(limit, str) else limit
+        except KeyError:
+            continue
+        # the constraint can only be checked between numbers
+        if any(callable(value) for value in others + [limit]):
+            continue
+        upper_bound = min(upper_bound, limit - sum(others))
+
+    return upper_bound
+
+
+def constrain_bounds(params, parameter, bounds):
+    """
+    Clamps the bounds of a parameter to the inside of its physical domain and to
+    the coupled constraints.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+        bounds : tuple
+            Of the form - (lower_bound, upper_bound), where lower_bound and
+            upper_bound are numerical.
+
+    Returns
+    -------
+        bounds : tuple
+    """
+    # the default bounds of a negative parameter are reversed
+    lower_bound, upper_bound = sorted(bounds)
+    if callable(params[parameter]):
+        domain = (0, None)
+    else:
+        domain = parameter_domains.get(parameter, (None, None))
+        upper_bound = min(upper_bound, coupled_upper_bound(params, parameter))
+
+    # the domains are open, clamp to the closest values inside them
+    if domain[0] is not None:
+        lower_bound = max(lower_bound, np.nextafter(domain[0], np.inf))
+    if domain[1] is not None:
+        upper_bound = min(upper_bound, np.nextafter(domain[1], -np.inf))
+
+    if lower_bound > upper_bound:
+        raise ValueError(
+            f"{parameter} has no physical value between {bounds[0]} and {bounds[1]}"
+        )
+
+    return lower_bound, upper_bound
+
+
+def check_parameter_value(params, parameter, value):
+    """
+    Checks if a value of a parameter is in its physical domain and satisfies the
+    coupled constraints.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+        value : numerical
+            Value of the parameter, or the scale of a function.
+
+    Raises
+    ------
+        ValueError
+            If the value is not physical.
+    """
+    if callable(value):
+        value = float(str(value))
+    if callable(params[parameter]):
+        domain = (0, None)
+    else:
+        domain = parameter_domains.get(parameter, (None, None))
+
+    if (domain[0] is not None and value <= domain[0]) or (
+        domain[1] is not None and value >= domain[1]
+    ):
+        raise ValueError(
+            f"{parameter} should be between {domain[0]} and "
+            + f"{domain[1] if domain[1] is not None else np.inf}, got {value}"
+        )
+
+    if not callable(params[parameter]):
+        upper_bound = coupled_upper_bound(params, parameter)
+        # allow for the rounding errors of the sum
+        if value > upper_bound + 1e-12:
+            raise ValueError(
+                f"{parameter} should be at most {upper_bound:g} with the other "
+                + f"parameter values, got {value}"
+            )
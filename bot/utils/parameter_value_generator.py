@@ -1,4 +1,5 @@
 from utils.desired_decimal_point_generator import desired_decimal_point_generator
+from utils.parameter_constraints import constrain_bounds, check_parameter_value
 
 
 # implementation by @tinosulzer
@@ -22,7 +23,9 @@ def parameter_value_generator(
 ):
     """
     Generates random values for given parameters and
-    plugs them in params.
+    plugs them in params. The values are drawn from the physical
+    domain of the parameters, and a ValueError is raised if no
+    physical value can be drawn.
 
     Parameters
     ----------
@@ -43,21 +46,60 @@ def parameter_value_generator(
     """
 
     for parameter, bounds in parameter_dict.items():
-        if callable(params[parameter]):
-            base_value = 1
-            new_parameter_value = desired_decimal_point_generator(
-                bounds[0] if bounds[0] is not None else base_value * 0.5,
-                bounds[1] if bounds[1] is not None else base_value * 2,
-                5,
-            )
-            params[parameter] = FunctionLike(params[parameter], new_parameter_value)
-        else:
-            base_value = params[parameter]
-            new_parameter_value = desired_decimal_point_generator(
-                bounds[0] if bounds[0] is not None else base_value * 0.5,
-                bounds[1] if bounds[1] is not None else base_value * 2,
-                5,
-            )
-            params[parameter] = new_parameter_value
+        lower_bound, upper_bound = parameter_bounds(params, parameter, bounds)
+        new_parameter_value = desired_decimal_point_generator(
+            lower_bound, upper_bound, 5
+        )
+        # the rounding can take the value out of the bounds
+        new_parameter_value = min(max(new_parameter_value, lower_bound), upper_bound)
+        check_parameter_value(params, parameter, new_parameter_value)
+        set_parameter_value(params, parameter, new_parameter_value)
 
     return params
+
+
+def parameter_bounds(params, parameter, bounds):
+    """
+    Fills the missing bounds of a parameter with the default bounds -
+    (base_value / 2, base_value * 2), where the base value is 1 for a function,
+    as the function is scaled. The bounds are then clamped to the physical domain
+    of the parameter, see `utils.parameter_constraints`.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+        bounds : tuple
+            Of the form - (lower_bound, upper_bound), where lower_bound and
+            upper_bound can be either numerical or None.
+
+    Returns
+    -------
+        bounds : tuple
+    """
+    base_value = 1 if callable(params[parameter]) else params[parameter]
+
+    return constrain_bounds(
+        params,
+        parameter,
+        (
+            bounds[0] if bounds[0] is not None else base_value * 0.5,
+            bounds[1] if bounds[1] is not None else base_value * 2,
+        ),
+    )
+
+
+def set_parameter_value(params, parameter, value):
+    """
+    Plugs a value in params. A function is scaled by the value.
+
+    Parameters
+    ----------
+        params : :class:`pybamm.ParameterValues`
+        parameter : str
+        value : numerical
+    """
+    if callable(params[parameter]):
+        params[parameter] = FunctionLike(params[parameter], value)
+    else:
+        params[parameter] = value
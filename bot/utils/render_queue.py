@@ -0,0 +1,110 @@
+import os
+import time
+import glob
+import pickle
+import shutil
+
+
+class RenderQueue:
+    """
+    Disk-backed first-in first-out queue of rendered plots. Every entry is a
+    directory holding the plot (GIF or PNG) and the pickled description of the
+    tweet, so that a scheduled tweet only has to upload a plot which has been
+    rendered beforehand. The description holds only plain Python data (the
+    configuration and the texts of the tweet), which can be read back with other
+    versions of pybamm. The scheduled workflow renders the plot of the next run
+    after tweeting, and keeps the queue in a cache.
+
+    Parameters
+    ----------
+        path : str
+            default : "render_queue"
+            Directory in which the entries are stored.
+    """
+
+    def __init__(self, path="render_queue"):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def entries(self):
+        """
+        Returns the complete entries, oldest first.
+
+        Returns
+        -------
+            entries : list
+                Paths of the entry directories.
+        """
+        # the entries being written start with a "."
+        return sorted(
+            entry
+            for entry in glob.glob(os.path.join(self.path, "*"))
+            if os.path.isdir(entry)
+        )
+
+    def __len__(self):
+        return len(self.entries())
+
+    def push(self, plot, description):
+        """
+        Adds a rendered plot to the queue. The plot is moved into the queue.
+
+        Parameters
+        ----------
+            plot : str
+                Path of the rendered plot.
+            description : dict
+                Configuration and texts of the tweet, see
+                `twitter_api.tweet_plot.describe_plot`.
+        """
+        name = str(time.time_ns())
+        entry = os.path.join(self.path, name)
+        partial_entry = os.path.join(self.path, "." + name)
+        os.makedirs(partial_entry)
+
+        shutil.move(plot, os.path.join(partial_entry, os.path.basename(plot)))
+        with open(os.path.join(partial_entry, "description.pkl"), "wb") as f:
+            pickle.dump(description, f)
+
+        # publish the entry only once it is complete
+        os.rename(partial_entry, entry)
+
+    def first(self):
+        """
+        Returns the oldest plot of the queue, without removing it, so that a plot
+        which could not be tweeted is tweeted by the next run. The entries which
+        can not be read are removed.
+
+        Returns
+        -------
+            entry : tuple or None
+                Of the form - (entry, plot, description), where entry is the path
+                of the entry directory, to be passed to `remove`, and plot the path
+                of the plot in it. None if the queue is empty.
+        """
+        for entry in self.entries():
+            try:
+                with open(os.path.join(entry, "description.pkl"), "rb") as f:
+                    description = pickle.load(f)
+                (plot_name,) = [
+                    name for name in os.listdir(entry) if name != "description.pkl"
+                ]
+            except Exception:  # pragma: no cover
+                # a broken entry (for example, from another version of the bot)
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+
+            return entry, os.path.join(entry, plot_name), description
+
+        return None
+
+    def remove(self, entry):
+        """
+        Removes an entry returned by `first`, once its plot has been tweeted.
+
+        Parameters
+        ----------
+            entry : str
+                Path of the entry directory.
+        """
+        shutil.rmtree(entry, ignore_errors=True)
@@ -1,10 +1,15 @@
+import os
 from PIL import Image
 
 
 # Original code - https://stackoverflow.com/a/41827681/14746647
 def resize_gif(path, resize_to):
     """
-    Resizes the GIF to a given length
+    Resizes the GIF to a given length. The frames are decoded and resized one at
+    a time, and handed to the Pillow GIF writer, which optimises the palette and
+    writes only the region of every frame which differs from the previous one. The
+    writer holds the 8-bit palette frames until the end, not the decoded RGBA
+    frames.
 
     Parameters
     ----------
@@ -13,15 +18,27 @@ def resize_gif(path, resize_to):
         resize_to : tuple
             Dimensions to be resize to.
     """
-
-    all_frames = extract_and_resize_frames(path, resize_to)
-
-    save_as = path
-
-    all_frames[0].save(
-        save_as, optimize=True, save_all=True, append_images=all_frames[1:], loop=1000
+    with Image.open(path) as im:
+        # duration of a frame in milliseconds
+        duration = im.info.get("duration", 100)
+
+    # the resized GIF is written next to the original one, which is still being
+    # read
+    root, extension = os.path.splitext(path)
+    save_as = root + "_resized" + extension
+
+    frames = extract_and_resize_frames(path, resize_to)
+    next(frames).save(
+        save_as,
+        optimize=True,
+        save_all=True,
+        append_images=frames,
+        duration=duration,
+        loop=1000,
     )
 
+    os.replace(save_as, path)
+
 
 def analyseImage(path):
     """
@@ -67,52 +84,44 @@ def extract_and_resize_frames(path, resize_to):
         path : str
             Path of the GIF to resize.
 
-    Returns
-    -------
-        all_frames : list
+    Yields
+    ------
+        frame : :class:`PIL.Image.Image`
+            The resized frames, one at a time.
     """
     mode = analyseImage(path)["mode"]
 
     im = Image.open(path)
 
-    i = 0
     p = im.getpalette()
     last_frame = im.convert("RGBA")
 
-    all_frames = []
-
     try:
         while True:
-            """
-            If the GIF uses local colour tables, each frame will have its own
-            palette. If not, we need to apply the global palette to the new
-            frame.
-            """
+            # If the GIF uses local colour tables, each frame will have its own
+            # palette. If not, we need to apply the global palette to the new
+            # frame.
             if not im.getpalette():  # pragma: no cover
                 im.putpalette(p)
 
             new_frame = Image.new("RGBA", im.size)
 
-            """
-            Is this file a "partial"-mode GIF where frames update a region of
-            a different size to the entire image? If so, we need to construct
-            the new frame by pasting it on top of the preceding frames.
-            """
+            # Is this file a "partial"-mode GIF where frames update a region of
+            # a different size to the entire image? If so, we need to construct
+            # the new frame by pasting it on top of the preceding frames.
             if mode == "partial":  # pragma: no cover
                 new_frame.paste(last_frame)
 
             new_frame.paste(im, (0, 0), im.convert("RGBA"))
 
             new_frame.thumbnail(resize_to, Image.ANTIALIAS)
-            all_frames.append(new_frame)
+            yield new_frame
 
-            i += 1
             last_frame = new_frame
             im.seek(im.tell() + 1)
 
     except EOFError:
         pass
 
-    im.close()
-
-    return all_frames
+    finally:
+        im.close()
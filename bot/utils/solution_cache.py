@@ -0,0 +1,117 @@
+import os
+import glob
+import numpy as np
+from utils.config_hash import config_hash
+
+
+class SolutionCache:
+    """
+    Content-addressed cache of solved outputs. Every entry is a dictionary of
+    numpy arrays (the plotted variables of a configuration), stored as a
+    compressed `.npz` file, and the least recently used entries are evicted once
+    the entries take up more than `max_bytes` on the disk.
+
+    Parameters
+    ----------
+        path : str
+            default : "solution_cache"
+            Directory in which the entries are stored.
+        max_bytes : int
+            default : 209715200 (200 MB)
+            Byte budget of the cache.
+    """
+
+    def __init__(self, path="solution_cache", max_bytes=209715200):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, *config):
+        """
+        Generates the cache key of a configuration.
+
+        Parameters
+        ----------
+            config : any
+                Canonical entries of the configuration, for example - chemistry,
+                models, cycle, number and the parameter values.
+
+        Returns
+        -------
+            key : str
+        """
+        return config_hash(*config)
+
+    def get(self, key):
+        """
+        Returns the stored arrays for the given key.
+
+        Parameters
+        ----------
+            key : str
+
+        Returns
+        -------
+            arrays : dict or None
+                None if there is no entry for the key.
+        """
+        file_name = os.path.join(self.path, key + ".npz")
+
+        if not os.path.exists(file_name):
+            self.misses += 1
+            return None
+
+        with np.load(file_name) as data:
+            arrays = {name: data[name] for name in data.files}
+        self.hits += 1
+        # mark the entry as the most recently used one
+        os.utime(file_name)
+
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Stores the arrays for the given key and evicts the least recently used
+        entries if the byte budget is exceeded.
+
+        Parameters
+        ----------
+            key : str
+            arrays : dict
+                Of the form - {str: numpy.ndarray}
+        """
+        np.savez_compressed(os.path.join(self.path, key + ".npz"), **arrays)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the entries fit in the byte
+        budget.
+        """
+        entries = sorted(
+            glob.glob(os.path.join(self.path, "*.npz")), key=os.path.getmtime
+        )
+        total_bytes = sum(os.path.getsize(file_name) for file_name in entries)
+        for file_name in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= os.path.getsize(file_name)
+            os.remove(file_name)
+
+    def stats(self):
+        """
+        Returns the hit / miss counters of this object and the size of the cache.
+
+        Returns
+        -------
+            stats : dict
+        """
+        entries = glob.glob(os.path.join(self.path, "*.npz"))
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(entries),
+            "bytes": sum(os.path.getsize(file_name) for file_name in entries),
+        }
@@ -1,6 +1,5 @@
 import unittest
 import os
-import pybamm
 from bot.twitter_api.tweet_plot import Tweet
 
 
@@ -14,21 +13,19 @@ class TestTweet(unittest.TestCase):
         self.assertIsInstance(tweet.plot, str)
         assert os.path.exists(tweet.plot)
         self.assertIsNone(tweet.processing_info)
-        self.assertIsInstance(tweet.model, pybamm.BaseModel)
-        self.assertIsInstance(tweet.chemistry, dict)
-        self.assertIsInstance(tweet.is_experiment, bool)
-        self.assertTrue(tweet.is_experiment)
-        self.assertIsInstance(tweet.cycle, list)
-        self.assertIsInstance(tweet.cycle[0], tuple)
-        self.assertIsInstance(tweet.number, int)
-        self.assertIsInstance(tweet.is_comparison, bool)
-        self.assertFalse(tweet.is_comparison)
+        self.assertIsInstance(tweet.config["model options"], dict)
+        self.assertIsInstance(tweet.config["chemistry"], dict)
+        self.assertIsInstance(tweet.config["is_experiment"], bool)
+        self.assertTrue(tweet.config["is_experiment"])
+        self.assertIsInstance(tweet.config["cycle"], list)
+        self.assertIsInstance(tweet.config["cycle"][0], tuple)
+        self.assertIsInstance(tweet.config["number"], int)
+        self.assertIsInstance(tweet.config["is_comparison"], bool)
+        self.assertFalse(tweet.config["is_comparison"])
         self.assertIsInstance(tweet.testing, bool)
-        self.assertIsInstance(tweet.param_to_vary, str)
-        self.assertIsInstance(tweet.varied_values, list)
-        self.assertIsNone(tweet.params)
-        self.assertIsInstance(tweet.degradation_mode, str)
-        self.assertIsInstance(tweet.degradation_value, str)
+        self.assertIsInstance(tweet.config["param_to_vary"], str)
+        self.assertIsInstance(tweet.config["varied_values"], list)
+        self.assertIsInstance(tweet.status, str)
 
         tweet.upload_init()
 
@@ -47,16 +44,14 @@ class TestTweet(unittest.TestCase):
         self.assertIsInstance(tweet.plot, str)
         assert os.path.exists(tweet.plot)
         self.assertIsNone(tweet.processing_info)
-        self.assertIsInstance(tweet.model, dict)
-        self.assertIsInstance(tweet.chemistry, dict)
-        self.assertIsInstance(tweet.is_experiment, bool)
-        self.assertIsInstance(tweet.is_comparison, bool)
-        self.assertTrue(tweet.is_comparison)
+        self.assertIsNone(tweet.config["model options"])
+        self.assertIsInstance(tweet.config["chemistry"], dict)
+        self.assertIsInstance(tweet.config["is_experiment"], bool)
+        self.assertIsInstance(tweet.config["is_comparison"], bool)
+        self.assertTrue(tweet.config["is_comparison"])
         self.assertIsInstance(tweet.testing, bool)
-        self.assertIsInstance(tweet.varied_values, dict)
-        self.assertIsInstance(tweet.params, dict)
-        self.assertIsNone(tweet.degradation_mode, None)
-        self.assertIsNone(tweet.degradation_value, None)
+        self.assertIsInstance(tweet.config["varied_values"], dict)
+        self.assertIsInstance(tweet.status, str)
 
         tweet.upload_init()
 
@@ -78,16 +73,14 @@ class TestTweet(unittest.TestCase):
         self.assertIsInstance(tweet.plot, str)
         assert os.path.exists(tweet.plot)
         self.assertIsNone(tweet.processing_info)
-        self.assertIsInstance(tweet.model, dict)
-        self.assertIsInstance(tweet.chemistry, dict)
-        self.assertIsInstance(tweet.is_experiment, bool)
-        self.assertIsInstance(tweet.is_comparison, bool)
-        self.assertTrue(tweet.is_comparison)
+        self.assertIsNone(tweet.config["model options"])
+        self.assertIsInstance(tweet.config["chemistry"], dict)
+        self.assertIsInstance(tweet.config["is_experiment"], bool)
+        self.assertIsInstance(tweet.config["is_comparison"], bool)
+        self.assertTrue(tweet.config["is_comparison"])
         self.assertIsInstance(tweet.testing, bool)
-        self.assertIsInstance(tweet.varied_values, list)
-        self.assertIsInstance(tweet.params, dict)
-        self.assertIsNone(tweet.degradation_mode, None)
-        self.assertIsNone(tweet.degradation_value, None)
+        self.assertIsInstance(tweet.config["varied_values"], list)
+        self.assertIsInstance(tweet.status, str)
 
         tweet.upload_init()
 
@@ -109,13 +102,10 @@ class TestTweet(unittest.TestCase):
         self.assertIsInstance(tweet.plot, str)
         assert os.path.exists(tweet.plot)
         self.assertIsNone(tweet.processing_info)
-        self.assertTrue(
-            isinstance(tweet.model, dict)
-            or isinstance(tweet.model, pybamm.BaseModel)
-        )
-        self.assertIsInstance(tweet.chemistry, dict)
-        self.assertIsInstance(tweet.is_experiment, bool)
-        self.assertIsInstance(tweet.is_comparison, bool)
+        self.assertIsInstance(tweet.config["model"], str)
+        self.assertIsInstance(tweet.config["chemistry"], dict)
+        self.assertIsInstance(tweet.config["is_experiment"], bool)
+        self.assertIsInstance(tweet.config["is_comparison"], bool)
         self.assertIsInstance(tweet.testing, bool)
 
         tweet.upload_init()
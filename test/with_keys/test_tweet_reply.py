@@ -21,6 +21,13 @@ class TestTweetReply(unittest.TestCase):
         self.assertIsInstance(retrieved_id, int)
         self.assertEqual(retrieved_id, original_id)
 
+        self.assertIsNone(reply.reply_status({"number": 3}, (1440, 700)))
+        self.assertEqual(
+            reply.reply_status({"number": 1, "requested_number": 5}, (1440, 700)),
+            "This experiment has been run for 1 cycle instead of 5, as the requested"
+            " simulation is predicted to take more than the 20 minutes limit.",
+        )
+
         tweet_text = (
             "Compare SPM, SPMe and DFN model with Chen2020 parameters with a 1C"
             " discharge at 278.15K"
@@ -1,6 +1,12 @@
 import unittest
 import pybamm
-from bot.plotting.comparison_generator import ComparisonGenerator
+import shutil
+import numpy as np
+from PIL import Image
+from bot.plotting.comparison_generator import ComparisonGenerator, esoh_has_inputs
+from bot.utils.parameter_value_generator import FunctionLike
+from bot.utils.model_cache import ModelCache
+from bot.utils.solution_cache import SolutionCache
 import os
 
 
@@ -101,6 +107,32 @@ class TestComparisonGenerator(unittest.TestCase):
         self.assertIsInstance(comparison_generator.comparison_dict["params"], dict)
 
         assert os.path.exists("plot.gif")
+        # the frames are rendered directly at the size of Twitter
+        with Image.open("plot.gif") as gif:
+            self.assertEqual(gif.size[0], 1440)
+
+        # the GIF created by pybamm.QuickPlot is resized
+        comparison_generator = ComparisonGenerator(
+            models_for_comp=self.models_for_comp,
+            chemistry=self.chemistry,
+            is_experiment=self.is_experiment,
+            params=self.params,
+            renderer="quickplot",
+        )
+
+        comparison_generator.model_comparison(testing=True)
+
+        with Image.open("plot.gif") as gif:
+            self.assertEqual(gif.size[0], 1440)
+
+        with self.assertRaisesRegex(ValueError, "renderer"):
+            ComparisonGenerator(
+                models_for_comp=self.models_for_comp,
+                chemistry=self.chemistry,
+                is_experiment=self.is_experiment,
+                params=self.params,
+                renderer="matplotlib",
+            )
 
         self.is_experiment = True
         comparison_generator = ComparisonGenerator(
@@ -240,6 +272,317 @@ class TestComparisonGenerator(unittest.TestCase):
 
         assert os.path.exists("plot.gif")
 
+        model_cache = ModelCache(path="test_model_cache")
+        for i in range(2):
+            comparison_generator = ComparisonGenerator(
+                models_for_comp=self.models_for_comp,
+                chemistry=self.chemistry,
+                is_experiment=self.is_experiment,
+                params=self.params,
+                model_cache=model_cache,
+            )
+
+            comparison_generator.model_comparison(testing=True)
+
+        self.assertEqual(model_cache.hits, 2)
+        self.assertEqual(model_cache.misses, 2)
+        assert os.path.exists("plot.gif")
+        shutil.rmtree("test_model_cache")
+
+        # the second comparison is rendered from the solution cache
+        solution_cache = SolutionCache(path="test_solution_cache")
+        for i in range(2):
+            comparison_generator = ComparisonGenerator(
+                models_for_comp=self.model_for_comp,
+                chemistry=self.chemistry,
+                is_experiment=self.is_experiment,
+                param_to_vary_info=self.param_to_vary_info,
+                params=self.params,
+                varied_values_override=[5.2, 5.4],
+                solution_cache=solution_cache,
+            )
+
+            comparison_generator.parameter_comparison(testing=True)
+
+        self.assertEqual(solution_cache.hits, 1)
+        self.assertEqual(solution_cache.misses, 1)
+        assert os.path.exists("plot.gif")
+        shutil.rmtree("test_solution_cache")
+
+        # build the model once and solve it for every varied value
+        comparison_generator = ComparisonGenerator(
+            models_for_comp=self.model_for_comp,
+            chemistry=self.chemistry,
+            is_experiment=self.is_experiment,
+            param_to_vary_info=self.param_to_vary_info,
+            params=self.params,
+            varied_values_override=[5.2, 5.4, 5.6, 5.8],
+            sweep=True,
+        )
+
+        comparison_generator.parameter_comparison(testing=True)
+
+        self.assertEqual(
+            comparison_generator.comparison_dict["varied_values"], [5.2, 5.4, 5.6, 5.8]
+        )
+        self.assertEqual(
+            comparison_generator.comparison_dict["params"][3]["Current function [A]"],
+            5.8,
+        )
+        assert os.path.exists("plot.gif")
+
+        comparison_generator = ComparisonGenerator(
+            models_for_comp=self.model_for_comp,
+            chemistry=self.chemistry,
+            is_experiment=True,
+            cycle=self.cycle,
+            number=self.number,
+            param_to_vary_info={
+                "Negative electrode exchange-current density [A.m-2]": {
+                    "print_name": r"$j_{0,n}$",
+                    "bounds": (None, None),
+                }
+            },
+            params=self.params,
+            sweep=True,
+        )
+
+        comparison_generator.parameter_comparison(testing=True)
+
+        self.assertIsInstance(
+            comparison_generator.comparison_dict["varied_values"], list
+        )
+        assert os.path.exists("plot.gif")
+
+        # sampling the solutions right after solving them
+        comparison_generator = ComparisonGenerator(
+            models_for_comp=self.models_for_comp,
+            chemistry=self.chemistry,
+            is_experiment=True,
+            params=self.params,
+            cycle=self.cycle,
+            number=self.number,
+            points_per_frame=2,
+        )
+        plot_data = comparison_generator.generate_plot_data(
+            {0: self.params}, ["DFN", "SPM"], testing=True
+        )
+        self.assertEqual(len(plot_data["frame_times"]), 3)
+        # the time steps around the step changes are kept
+        self.assertGreater(len(plot_data["t0"]), 6)
+        self.assertGreater(len(plot_data["t1"]), 6)
+
+        # a comparison without an experiment is solved on the uniform time grid
+        comparison_generator = ComparisonGenerator(
+            models_for_comp={"SPM": pybamm.lithium_ion.SPM()},
+            chemistry=self.chemistry,
+            is_experiment=self.is_experiment,
+            param_to_vary_info=self.param_to_vary_info,
+            params=self.params,
+            points_per_frame=2,
+        )
+        batch_study = comparison_generator.solve({0: self.params}, 6)
+        t = batch_study.sims[0].solution["Time [s]"].entries
+        # the last time step ends at the voltage cut-off event
+        np.testing.assert_allclose(np.diff(t[:-1]), t[1] - t[0])
+
+        comparison_generator = ComparisonGenerator(
+            models_for_comp=self.model_for_comp,
+            chemistry=self.chemistry,
+            is_experiment=self.is_experiment,
+            param_to_vary_info=self.param_to_vary_info,
+            params=self.params,
+            varied_values_override=[5.2, 5.4],
+            sweep=True,
+            points_per_frame=2,
+        )
+        comparison_generator.parameter_comparison(testing=True)
+        assert os.path.exists("plot.gif")
+
+        # solving the permutations in worker processes gives the same solutions
+        batch_studies = []
+        for processes in [None, 2]:
+            batch_study = pybamm.BatchStudy(
+                models=self.models_for_comp,
+                parameter_values={0: self.params},
+                permutations=True,
+            )
+            comparison_generator = ComparisonGenerator(
+                models_for_comp=self.models_for_comp,
+                chemistry=self.chemistry,
+                is_experiment=self.is_experiment,
+                params=self.params,
+                processes=processes,
+            )
+            t_end = comparison_generator.calculate_t_end({0: self.params})
+            self.assertEqual(
+                t_end,
+                2
+                * self.params["Nominal cell capacity [A.h]"]
+                / self.params["Current function [A]"]
+                * 3600,
+            )
+            comparison_generator.solve_batch_study(batch_study, [0, t_end])
+            batch_studies.append(batch_study)
+
+        # a zero or negative current never discharges the cell
+        params = self.params.copy()
+        for current in [0, -1]:
+            params["Current function [A]"] = current
+            self.assertEqual(comparison_generator.calculate_t_end({0: params}), 3700)
+            self.assertEqual(
+                comparison_generator.calculate_t_end({0: params, 1: self.params}),
+                t_end,
+            )
+
+        self.assertEqual(len(batch_studies[1].sims), 2)
+        for sim, solution in zip(batch_studies[0].sims, batch_studies[1].sims):
+            np.testing.assert_array_equal(
+                sim.solution["Terminal voltage [V]"].entries,
+                solution["Terminal voltage [V]"].entries,
+            )
+            # the constant current discharges end on the voltage cut-off event
+            self.assertEqual(solution.termination, "event: Minimum voltage")
+            self.assertLess(solution["Time [s]"].entries[-1], t_end)
+
+        # solving all the varied values in a single solver call gives the solutions
+        # in the order of the varied values
+        param_list = []
+        for value in [5.2, 5.4, 5.6]:
+            params = self.params.copy()
+            params["Current function [A]"] = value
+            param_list.append(params)
+        batch_studies = []
+        for processes in [None, 2]:
+            batch_study = pybamm.BatchStudy(
+                models=self.model_for_comp,
+                parameter_values=dict(enumerate(param_list)),
+                permutations=True,
+            )
+            comparison_generator = ComparisonGenerator(
+                models_for_comp=self.model_for_comp,
+                chemistry=self.chemistry,
+                is_experiment=self.is_experiment,
+                param_to_vary_info=self.param_to_vary_info,
+                params=self.params,
+                processes=processes,
+                sweep=True,
+            )
+            t_end = comparison_generator.calculate_t_end(dict(enumerate(param_list)))
+            self.assertTrue(
+                comparison_generator.solve_sweep(batch_study, param_list, [0, t_end])
+            )
+            batch_studies.append(batch_study)
+
+        self.assertEqual(len(batch_studies[1].sims), 3)
+        for expected, solution in zip(batch_studies[0].sims, batch_studies[1].sims):
+            np.testing.assert_array_almost_equal(
+                expected["Terminal voltage [V]"].entries,
+                solution["Terminal voltage [V]"].entries,
+            )
+        # a larger current discharges the cell sooner
+        end_times = [
+            solution["Time [s]"].entries[-1] for solution in batch_studies[1].sims
+        ]
+        self.assertEqual(end_times, sorted(end_times, reverse=True))
+
+        # the varied values of a parameter of the initial conditions are solved one
+        # after another, the solver sets the initial conditions up only once
+        param_to_vary = "Initial concentration in negative electrode [mol.m-3]"
+        param_list = []
+        for value in [25000, 29000]:
+            params = self.params.copy()
+            params[param_to_vary] = value
+            param_list.append(params)
+        batch_study = pybamm.BatchStudy(
+            models={"SPM": pybamm.lithium_ion.SPM()},
+            parameter_values=dict(enumerate(param_list)),
+            permutations=True,
+        )
+        comparison_generator = ComparisonGenerator(
+            models_for_comp={"SPM": pybamm.lithium_ion.SPM()},
+            chemistry=self.chemistry,
+            is_experiment=self.is_experiment,
+            param_to_vary_info={
+                param_to_vary: {"print_name": None, "bounds": (None, None)}
+            },
+            params=self.params,
+            processes=2,
+            sweep=True,
+        )
+        self.assertTrue(
+            comparison_generator.solve_sweep(batch_study, param_list, [0, 3600])
+        )
+        for params, solution in zip(param_list, batch_study.sims):
+            expected = pybamm.Simulation(
+                pybamm.lithium_ion.SPM(), parameter_values=params
+            ).solve([0, 3600])
+            np.testing.assert_array_almost_equal(
+                expected["Terminal voltage [V]"].entries,
+                solution["Terminal voltage [V]"].entries,
+                decimal=5,
+            )
+
+        # the eSOH variables are calculated with an experiment, unless the varied
+        # parameter is a parameter of the eSOH model
+        for param_to_vary, values, has_esoh in [
+            ("Negative electrode diffusivity [m2.s-1]", [3e-14, 4e-14], True),
+            ("Lower voltage cut-off [V]", [2.6, 2.7], False),
+        ]:
+            param_list = []
+            for value in values:
+                params = self.params.copy()
+                params[param_to_vary] = value
+                param_list.append(params)
+            batch_study = pybamm.BatchStudy(
+                models={"SPM": pybamm.lithium_ion.SPM()},
+                parameter_values=dict(enumerate(param_list)),
+                permutations=True,
+            )
+            comparison_generator = ComparisonGenerator(
+                models_for_comp={"SPM": pybamm.lithium_ion.SPM()},
+                chemistry=self.chemistry,
+                is_experiment=True,
+                cycle=self.cycle,
+                number=2,
+                param_to_vary_info={
+                    param_to_vary: {"print_name": None, "bounds": (None, None)}
+                },
+                params=self.params,
+                sweep=True,
+            )
+            self.assertTrue(comparison_generator.solve_sweep(batch_study, param_list))
+            for params, solution in zip(param_list, batch_study.sims):
+                self.assertEqual("C" in solution.summary_variables, has_esoh)
+                # every varied value is solved from the initial conditions, not from
+                # the state at the start of the last step of the first step model
+                expected = pybamm.Simulation(
+                    pybamm.lithium_ion.SPM(),
+                    experiment=pybamm.Experiment(self.cycle * 2),
+                    parameter_values=params,
+                ).solve(calc_esoh=False)
+                np.testing.assert_array_almost_equal(
+                    expected["Terminal voltage [V]"].entries,
+                    solution["Terminal voltage [V]"].entries,
+                    decimal=5,
+                )
+
+        # the eSOH calculation is decided before the sweep is solved
+        for param_to_vary, has_inputs in [
+            ("Negative electrode diffusivity [m2.s-1]", False),
+            ("Upper voltage cut-off [V]", True),
+            ("Negative electrode OCP [V]", True),
+        ]:
+            params = self.params.copy()
+            params[param_to_vary] = (
+                FunctionLike(
+                    params[param_to_vary], pybamm.InputParameter(param_to_vary)
+                )
+                if callable(params[param_to_vary])
+                else "[input]"
+            )
+            self.assertEqual(esoh_has_inputs(params), has_inputs)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import os
+import glob
+import pickle
+import shutil
+import subprocess
+import casadi
+import pybamm
+from bot.utils.model_cache import ModelCache
+from bot.utils.compiled_function_cache import CompiledFunctionCache
+
+
+class TestCompiledFunctionCache(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_compiled_cache"
+        self.model_path = "test_model_cache"
+        self.chemistry = pybamm.parameter_sets.Marquis2019
+        self.params = pybamm.ParameterValues(chemistry=self.chemistry)
+
+    def tearDown(self):
+        for path in [self.path, self.model_path]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def test_compiled_function_cache(self):
+        # the libraries of other versions are removed
+        os.makedirs(os.path.join(self.path, "pybamm-0.0-casadi-0.0"))
+        compiled_cache = CompiledFunctionCache(path=self.path)
+
+        self.assertEqual(
+            os.listdir(self.path), [os.path.basename(compiled_cache.directory)]
+        )
+
+        params = self.params.copy()
+        params["Current function [A]"] = 3
+        model_cache = ModelCache(path=self.model_path, compiled_cache=compiled_cache)
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+        sim.solve([0, 3600], inputs=inputs)
+
+        self.assertIsNotNone(sim.solution)
+        if compiled_cache.compiler is None:  # pragma: no cover
+            return
+
+        # the model cache is sent to the worker processes while the functions are
+        # compiled
+        self.assertNotEqual(compiled_cache.compilations, [])
+        pickle.loads(pickle.dumps(model_cache))
+
+        # the functions and the events are compiled in the background
+        compiled_cache.wait()
+        model = sim.built_model
+        n_libraries = 2 + sum(
+            len(getattr(model, event_name)) for event_name in compiled_cache.event_names
+        )
+        libraries = glob.glob(os.path.join(compiled_cache.directory, "*.so"))
+        self.assertGreater(n_libraries, 2)
+        self.assertEqual(len(libraries), n_libraries)
+
+        # the libraries persist across objects, and are shared by the parameter
+        # values which are input parameters
+        params = self.params.copy()
+        params["Current function [A]"] = 2
+        compiled_cache = CompiledFunctionCache(path=self.path)
+        model_cache = ModelCache(path=self.model_path, compiled_cache=compiled_cache)
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+        self.assertEqual(inputs, {"Current function [A]": 2})
+        sim.solve([0, 3600], inputs=inputs)
+
+        self.assertIsNotNone(sim.solution)
+        self.assertEqual(model_cache.stats()["hits"], 1)
+        self.assertEqual(compiled_cache.compilations, [])
+        self.assertEqual(
+            len(glob.glob(os.path.join(compiled_cache.directory, "*.so"))),
+            n_libraries,
+        )
+        self.assertIsInstance(sim.built_model.casadi_rhs, casadi.Function)
+        self.assertEqual(sim.built_model.casadi_rhs.class_name(), "External")
+        self.assertEqual(
+            sim.built_model.terminate_events_eval[0]._function.class_name(),
+            "External",
+        )
+
+        # the compiled functions give the same solution
+        expected = pybamm.Simulation(
+            pybamm.lithium_ion.SPM(), parameter_values=params
+        ).solve([0, 3600])
+        self.assertAlmostEqual(
+            sim.solution["Terminal voltage [V]"].entries[-1],
+            expected["Terminal voltage [V]"].entries[-1],
+            places=5,
+        )
+
+    def test_stale_lock(self):
+        compiled_cache = CompiledFunctionCache(path=self.path)
+        if compiled_cache.compiler is None:  # pragma: no cover
+            return
+        x = casadi.MX.sym("x")
+        function = casadi.Function("f", [x], [x ** 2])
+
+        # the files of a killed compiler, whose process is not running anymore
+        process = subprocess.Popen(["true"])
+        process.wait()
+        lock = os.path.join(compiled_cache.directory, "f.lock")
+        with open(lock, "w") as f:
+            f.write(str(process.pid))
+        source = os.path.join(compiled_cache.directory, "f_0.c")
+        open(source, "w").close()
+
+        self.assertIsNone(compiled_cache.compile(function, "f"))
+        self.assertFalse(os.path.exists(source))
+        self.assertEqual(len(compiled_cache.compilations), 1)
+
+        # the function is being compiled by this object
+        self.assertIsNone(compiled_cache.compile(function, "f"))
+        self.assertEqual(len(compiled_cache.compilations), 1)
+
+        compiled_cache.wait()
+        self.assertFalse(os.path.exists(lock))
+        compiled_function = compiled_cache.compile(function, "f")
+        self.assertEqual(compiled_function.class_name(), "External")
+        self.assertEqual(float(compiled_function(3)), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
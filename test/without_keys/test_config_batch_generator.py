@@ -0,0 +1,61 @@
+import unittest
+import pybamm
+from bot.plotting.config_batch_generator import config_batch_generator
+
+
+class TestConfigBatchGenerator(unittest.TestCase):
+    def test_config_batch_generator(self):
+        configs = config_batch_generator("parameter comparison", 5, seed=0)
+
+        self.assertEqual(len(configs), 5)
+        for config in configs:
+            self.assertIsInstance(config["chemistry"], dict)
+            self.assertEqual(len(config["models_for_comp"]), 1)
+            for model in config["models_for_comp"].values():
+                self.assertIsInstance(model, pybamm.BaseBatteryModel)
+            self.assertIsInstance(config["params"], pybamm.ParameterValues)
+            self.assertGreaterEqual(config["params"]["Ambient temperature [K]"], 265)
+            self.assertLessEqual(config["params"]["Ambient temperature [K]"], 355)
+            self.assertIsInstance(config["param_to_vary_info"], dict)
+            # the varied values are drawn while solving, as in `config_generator`
+            self.assertIsNone(config["varied_values_override"])
+            if config["is_experiment"]:
+                pybamm.Experiment(config["cycle"] * config["number"])
+            else:
+                self.assertIsNone(config["cycle"])
+                self.assertIsNone(config["number"])
+
+        # the same seed gives the same batch
+        same_configs = config_batch_generator("parameter comparison", 5, seed=0)
+        for config, same_config in zip(configs, same_configs):
+            self.assertEqual(config["cycle"], same_config["cycle"])
+            self.assertEqual(
+                config["params"]["Ambient temperature [K]"],
+                same_config["params"]["Ambient temperature [K]"],
+            )
+            self.assertEqual(
+                config["param_to_vary_info"], same_config["param_to_vary_info"]
+            )
+
+        configs = config_batch_generator("model comparison", 3, seed=1)
+
+        for config in configs:
+            self.assertIn(len(config["models_for_comp"]), [2, 3])
+            self.assertIsNone(config["param_to_vary_info"])
+            self.assertIsNone(config["varied_values_override"])
+
+        configs = config_batch_generator("degradation comparison", 2, seed=2)
+
+        for config in configs:
+            self.assertIsInstance(config["model"], pybamm.lithium_ion.SPM)
+            self.assertEqual(config["chemistry"], pybamm.parameter_sets.Mohtat2020)
+            self.assertEqual(config["number"], 500)
+            pybamm.Experiment(config["cycle"] * config["number"])
+            self.assertIn(len(config["param_values"]), [2, 3])
+            self.assertEqual(len(config["varied_values"]), len(config["param_values"]))
+            for param in config["param_values"]:
+                self.assertIsInstance(param, pybamm.ParameterValues)
+
+
+if __name__ == "__main__":
+    unittest.main()
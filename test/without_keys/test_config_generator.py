@@ -1,6 +1,6 @@
 import unittest
 import pybamm
-from bot.plotting.config_generator import config_generator
+from bot.plotting.config_generator import config_generator, create_model
 
 
 class TestConfigGenerator(unittest.TestCase):
@@ -185,3 +185,8 @@ class TestConfigGenerator(unittest.TestCase):
         self.assertIsNone(config["param_to_vary_info"])
         self.assertIsInstance(config["params"], pybamm.ParameterValues)
         self.assertIsNone(config["varied_values_override"])
+        self.assertEqual(len(config["models_for_comp"]), 2)
+
+        model = create_model((pybamm.lithium_ion.SPM, {"SEI": "ec reaction limited"}))
+        self.assertIsInstance(model, pybamm.lithium_ion.SPM)
+        self.assertEqual(model.options["SEI"], "ec reaction limited")
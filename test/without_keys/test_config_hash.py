@@ -0,0 +1,51 @@
+import unittest
+import pybamm
+from bot.utils.config_hash import canonical, config_hash
+from bot.utils.parameter_value_generator import FunctionLike
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_config_hash(self):
+        chemistry = pybamm.parameter_sets.Chen2020
+        params = pybamm.ParameterValues(chemistry=chemistry)
+
+        self.assertEqual(
+            config_hash(pybamm.lithium_ion.DFN(), chemistry, params),
+            config_hash(
+                pybamm.lithium_ion.DFN(),
+                chemistry,
+                pybamm.ParameterValues(chemistry=chemistry),
+            ),
+        )
+        self.assertNotEqual(
+            config_hash(pybamm.lithium_ion.DFN(), chemistry, params),
+            config_hash(pybamm.lithium_ion.SPM(), chemistry, params),
+        )
+        self.assertNotEqual(
+            config_hash(pybamm.lithium_ion.SPM(), chemistry, params),
+            config_hash(
+                pybamm.lithium_ion.SPM(options={"SEI": "reaction limited"}),
+                chemistry,
+                params,
+            ),
+        )
+
+        new_params = params.copy()
+        new_params["Current function [A]"] = 2.5
+        self.assertNotEqual(config_hash(params), config_hash(new_params))
+
+        self.assertEqual(canonical(1), canonical(1.0))
+        self.assertEqual(canonical({"b": 1, "a": 2}), canonical({"a": 2, "b": 1}))
+        diffusivity = params["Negative electrode diffusivity [m2.s-1]"]
+        self.assertNotEqual(
+            canonical(FunctionLike(diffusivity, 2)),
+            canonical(FunctionLike(diffusivity, 3)),
+        )
+        self.assertEqual(
+            canonical(pybamm.Experiment(["Rest for 1 hour"] * 2)),
+            canonical(pybamm.Experiment(["Rest for 1 hour"] * 2)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import pybamm
+import os
+import numpy as np
+from bot.utils.cost_estimator import CostEstimator
+from bot.plotting.config_generator import config_generator
+
+
+class TestCostEstimator(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_cost_records.jsonl"
+        self.chemistry = pybamm.parameter_sets.Chen2020
+        self.params = pybamm.ParameterValues(chemistry=self.chemistry)
+        self.config = {
+            "chemistry": self.chemistry,
+            "models_for_comp": {
+                0: pybamm.lithium_ion.SPM(),
+                1: pybamm.lithium_ion.DFN(),
+            },
+            "is_experiment": False,
+            "cycle": None,
+            "number": None,
+            "param_to_vary_info": None,
+            "params": self.params,
+            "varied_values_override": None,
+        }
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_cost_estimator(self):
+        cost_estimator = CostEstimator(path=self.path)
+
+        features = cost_estimator.features(self.config, "model comparison")
+        self.assertEqual(len(features), len(CostEstimator.prior_weights))
+        self.assertEqual(features[1], np.log(2))
+        self.assertEqual(features[2], 1)
+        self.assertEqual(features[3], 0)
+
+        # the C-rate of an experiment is the one of its fastest current step
+        experiment_config = dict(
+            self.config,
+            is_experiment=True,
+            cycle=[
+                (
+                    "Discharge at C/10 for 10 hours or until 3.3 V",
+                    "Rest for 1 hour",
+                    "Charge at 1 A until 4.1 V",
+                    "Hold at 4.1 V until 50 mA",
+                )
+            ],
+            number=2,
+        )
+        features = cost_estimator.features(experiment_config, "model comparison")
+        self.assertAlmostEqual(
+            features[5], np.log(1 / self.params["Nominal cell capacity [A.h]"])
+        )
+        self.assertEqual(features[4], np.log(8))
+
+        # the hand-set weights are used without any recorded runs
+        prediction = cost_estimator.predict(self.config, "model comparison")
+        np.testing.assert_allclose(cost_estimator.weights, CostEstimator.prior_weights)
+        self.assertTrue(cost_estimator.is_affordable(self.config, "model comparison"))
+
+        # the recorded runs calibrate the estimator
+        for _ in range(20):
+            cost_estimator.record(self.config, "model comparison", 100 * prediction)
+        self.assertEqual(cost_estimator.records()[0].shape, (20, len(features)))
+        self.assertGreater(
+            cost_estimator.predict(self.config, "model comparison"), 10 * prediction
+        )
+
+        cost_estimator.budget = 0
+        self.assertFalse(cost_estimator.is_affordable(self.config, "model comparison"))
+
+        # the cheapest configuration is returned if all of them are too costly
+        config = config_generator(
+            "model comparison", cost_estimator=cost_estimator, max_attempts=2
+        )
+        self.assertIsInstance(config, dict)
+
+        cost_estimator.budget = np.inf
+        config = config_generator(
+            "degradation comparison", cost_estimator=cost_estimator
+        )
+        self.assertTrue(cost_estimator.is_affordable(config, "degradation comparison"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import os
+import time
 import unittest
-from bot.utils.custom_process import Process
+import multiprocessing
+from bot.utils.custom_process import Process, available_cpus
 
 
 class TestCustomProcess(unittest.TestCase):
@@ -16,11 +19,52 @@ class TestCustomProcess(unittest.TestCase):
         self.assertEqual(str(e), "The test is working")
         self.assertIsInstance(e, Exception)
 
+        # the worker processes are killed with the process
+        parent_conn, child_conn = multiprocessing.Pipe()
+        p = Process(target=start_worker, args=(child_conn,))
+
+        p.start()
+        worker_pid = parent_conn.recv()
+        p.kill()
+        p.join()
+
+        # the killed worker is reaped by init
+        for _ in range(50):
+            if not is_running(worker_pid):
+                break
+            time.sleep(0.1)
+        self.assertFalse(is_running(worker_pid))
+
+    def test_available_cpus(self):
+        self.assertGreaterEqual(available_cpus(), 1)
+        self.assertLessEqual(available_cpus(), os.cpu_count())
+
 
 def call_using_custom_process(is_working):
     if is_working:
         raise Exception("The test is working")
 
 
+def start_worker(conn):
+    worker = multiprocessing.Process(target=time.sleep, args=(60,))
+    worker.start()
+    conn.send(worker.pid)
+    worker.join()
+
+
+def is_running(pid):
+    try:
+        # a finished child of this process is a zombie until it is reaped
+        os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        # not a child of this process, reaped by init
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,13 @@
 import unittest
 import pybamm
-from bot.plotting.degradation_comparison_generator import DegradationComparisonGenerator
+import shutil
+import numpy as np
+from bot.utils.solution_cache import SolutionCache
+from bot.plotting.degradation_comparison_generator import (
+    DegradationComparisonGenerator,
+    solve_degradation_simulation,
+    solve_last_cycle,
+)
 import os
 
 
@@ -63,6 +70,7 @@ class TestDegradationComparisonGenerator(unittest.TestCase):
         self.assertEqual(solutions_and_labels[0][0].termination, "final time")
         self.assertEqual(len(solutions_and_labels[0][0].cycles), 2)
         self.assertEqual(len(solutions_and_labels), 2)
+        expected_solutions = [solution for solution, _ in solutions_and_labels]
 
         degradation_comparison_generator.solve()
 
@@ -75,6 +83,190 @@ class TestDegradationComparisonGenerator(unittest.TestCase):
 
         assert os.path.exists("plot.png")
 
+        degradation_comparison_generator = DegradationComparisonGenerator(
+            self.model,
+            self.chemistry,
+            self.param_values_mohtat,
+            self.degradation_parameter,
+            self.cycle,
+            self.number,
+            processes=2,
+        )
+        degradation_comparison_generator.solve()
+
+        self.assertIsNone(degradation_comparison_generator.solutions)
+        self.assertEqual(len(degradation_comparison_generator.summary_variables), 2)
+        self.assertEqual(
+            degradation_comparison_generator.labels,
+            [
+                "Inner SEI open-circuit potential [V]: 5.00000e-02",
+                "Inner SEI open-circuit potential [V]: 9.00000e-02",
+            ],
+        )
+        for summary_variables in degradation_comparison_generator.summary_variables:
+            self.assertIsInstance(summary_variables, dict)
+            self.assertEqual(len(summary_variables["Cycle number"]), 2)
+
+        degradation_comparison_generator.generate_summary_variables()
+
+        assert os.path.exists("plot.png")
+
+        # only the first and the last cycle are stored in full
+        degradation_comparison_generator = DegradationComparisonGenerator(
+            self.model,
+            self.chemistry,
+            self.param_values_mohtat,
+            self.degradation_parameter,
+            self.cycle,
+            3,
+            summary_only=True,
+        )
+        self.assertEqual(degradation_comparison_generator.save_at_cycles(), [1, 3])
+        degradation_comparison_generator.solve()
+
+        for solution in degradation_comparison_generator.solutions:
+            self.assertEqual(len(solution.summary_variables["Cycle number"]), 3)
+            self.assertEqual(
+                len([cycle for cycle in solution.cycles if cycle is not None]), 2
+            )
+            self.assertIsNotNone(solution.cycles[0])
+
+        degradation_comparison_generator.generate_summary_variables()
+
+        assert os.path.exists("plot.png")
+
+        # the last solved cycle is stored even if it is not in save_at_cycles, as
+        # when the capacity termination stops the experiment early
+        experiment = pybamm.Experiment(self.cycle * 3)
+        sim = solve_degradation_simulation(
+            self.model, self.chemistry, self.param_values_mohtat[0], experiment, [1]
+        )
+        self.assertIsNone(sim.solution.cycles[-1])
+        solve_last_cycle(sim)
+
+        expected = solve_degradation_simulation(
+            self.model, self.chemistry, self.param_values_mohtat[0], experiment
+        )
+        np.testing.assert_array_almost_equal(
+            sim.solution.cycles[-1]["Terminal voltage [V]"].entries,
+            expected.solution.cycles[-1]["Terminal voltage [V]"].entries,
+            decimal=5,
+        )
+
+        # the simulation is built once and solved for every varied value
+        degradation_comparison_generator = DegradationComparisonGenerator(
+            self.model,
+            self.chemistry,
+            self.param_values_mohtat,
+            self.degradation_parameter,
+            self.cycle,
+            self.number,
+            sweep=True,
+        )
+        solutions_and_labels = degradation_comparison_generator.solve_sweep(
+            self.experiment
+        )
+
+        self.assertEqual(len(solutions_and_labels), 2)
+        self.assertEqual(
+            solutions_and_labels[0][1],
+            "Inner SEI open-circuit potential [V]: 9.00000e-02",
+        )
+        for solution, _ in solutions_and_labels:
+            self.assertIsInstance(solution, pybamm.Solution)
+            self.assertEqual(len(solution.cycles), 2)
+        self.assertFalse(
+            np.array_equal(
+                solutions_and_labels[0][0].summary_variables[
+                    "Loss of lithium inventory [%]"
+                ],
+                solutions_and_labels[1][0].summary_variables[
+                    "Loss of lithium inventory [%]"
+                ],
+            )
+        )
+        # the same solutions as a simulation for every parameter values
+        for (solution, _), expected in zip(solutions_and_labels, expected_solutions):
+            np.testing.assert_allclose(
+                solution.summary_variables["Capacity [A.h]"],
+                expected.summary_variables["Capacity [A.h]"],
+                rtol=1e-6,
+            )
+
+        degradation_comparison_generator.solve()
+
+        self.assertEqual(
+            degradation_comparison_generator.labels,
+            [
+                "Inner SEI open-circuit potential [V]: 5.00000e-02",
+                "Inner SEI open-circuit potential [V]: 9.00000e-02",
+            ],
+        )
+        degradation_comparison_generator.generate_summary_variables()
+
+        assert os.path.exists("plot.png")
+
+        # the built simulation is solved for the varied values in worker processes
+        degradation_comparison_generator = DegradationComparisonGenerator(
+            self.model,
+            self.chemistry,
+            self.param_values_mohtat,
+            self.degradation_parameter,
+            self.cycle,
+            self.number,
+            processes=2,
+            sweep=True,
+        )
+        summary_variables_and_labels = (
+            degradation_comparison_generator.solve_sweep_in_pool(self.experiment)
+        )
+
+        self.assertEqual(
+            [label for _, label in summary_variables_and_labels],
+            [label for _, label in solutions_and_labels],
+        )
+        for (summary_variables, _), expected in zip(
+            summary_variables_and_labels, expected_solutions
+        ):
+            np.testing.assert_allclose(
+                summary_variables["Capacity [A.h]"],
+                expected.summary_variables["Capacity [A.h]"],
+                rtol=1e-6,
+            )
+
+        degradation_comparison_generator.solve()
+
+        self.assertIsNone(degradation_comparison_generator.solutions)
+        self.assertEqual(len(degradation_comparison_generator.summary_variables), 2)
+
+        solution_cache = SolutionCache(path="test_solution_cache")
+        summary_variables = []
+        for i in range(2):
+            degradation_comparison_generator = DegradationComparisonGenerator(
+                self.model,
+                self.chemistry,
+                self.param_values_mohtat,
+                self.degradation_parameter,
+                self.cycle,
+                self.number,
+                solution_cache=solution_cache,
+            )
+            degradation_comparison_generator.solve()
+            summary_variables.append(degradation_comparison_generator.summary_variables)
+
+        self.assertEqual(solution_cache.hits, 1)
+        self.assertEqual(solution_cache.misses, 1)
+        self.assertIsNone(degradation_comparison_generator.solutions)
+        np.testing.assert_array_equal(
+            summary_variables[0][1]["Capacity [A.h]"],
+            summary_variables[1][1]["Capacity [A.h]"],
+        )
+
+        degradation_comparison_generator.generate_summary_variables()
+
+        assert os.path.exists("plot.png")
+        shutil.rmtree("test_solution_cache")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,9 @@ import pybamm
 import unittest
 from bot.utils.degradation_parameter_generator import (
     degradation_parameter_generator,
+    degradation_parameter_dict,
+    degradation_bundle,
+    mohtat2020_degradation_parameters,
     lico2_volume_change_Ai2020,
     graphite_volume_change_Ai2020,
 )
@@ -98,6 +101,32 @@ class TestDegradationParameterGenerator(unittest.TestCase):
         self.assertEqual(len(param_values), 2)
         self.assertIsInstance(degradation_parameter, str)
 
+        # the bundles are shared and read-only
+        params, degradation_parameters = degradation_parameter_dict(
+            pybamm.parameter_sets.Mohtat2020, "particle mechanics", "swelling only"
+        )
+        self.assertEqual(params["Negative electrode Poisson's ratio"], 0.3)
+        self.assertIs(
+            degradation_parameter_dict(
+                pybamm.parameter_sets.Mohtat2020, "particle mechanics", "swelling only"
+            )[1],
+            degradation_parameters,
+        )
+        with self.assertRaises(TypeError):
+            degradation_parameters["Negative electrode Poisson's ratio"] = {}
+        with self.assertRaises(TypeError):
+            mohtat2020_degradation_parameters["Negative electrode Poisson's ratio"] = 0
+        params["Negative electrode Poisson's ratio"] = 0.2
+        self.assertEqual(
+            degradation_parameter_dict(
+                pybamm.parameter_sets.Mohtat2020, "SEI", "reaction limited"
+            )[0]["Negative electrode Poisson's ratio"],
+            0.3,
+        )
+
+        with self.assertRaises(ValueError):
+            degradation_bundle({"Ambient temperature [K]": {"bounds": (355, 265)}})
+
         t_change = lico2_volume_change_Ai2020(5)
         # self.assertAlmostEqual(
         #     t_change,
@@ -0,0 +1,56 @@
+import unittest
+import pybamm
+from bot.utils import experiment_cache
+from bot.utils.experiment_cache import get_experiment
+
+
+class TestExperimentCache(unittest.TestCase):
+    def setUp(self):
+        experiment_cache.clear()
+        self.cycle = [
+            (
+                "Discharge at C/10 for 10 hours or until 3.3 V",
+                "Rest for 1 hour",
+                "Charge at 1 A until 4.1 V",
+                "Hold at 4.1 V until 50 mA",
+                "Rest for 1 hour",
+            )
+        ]
+
+    def test_get_experiment(self):
+        experiment = get_experiment(self.cycle, 3)
+
+        self.assertIsInstance(experiment, pybamm.Experiment)
+        self.assertIs(get_experiment(self.cycle, 3), experiment)
+        self.assertIsNot(get_experiment(self.cycle, 2), experiment)
+        self.assertIsNot(
+            get_experiment(self.cycle, 3, termination="80% capacity"), experiment
+        )
+
+        # the same experiment as the one parsed by pybamm
+        expected = pybamm.Experiment(self.cycle * 3)
+        self.assertEqual(
+            experiment.operating_conditions_strings,
+            expected.operating_conditions_strings,
+        )
+        self.assertEqual(experiment.operating_conditions, expected.operating_conditions)
+        self.assertEqual(experiment.events, expected.events)
+        self.assertEqual(vars(experiment), vars(expected))
+
+        # the steps of the cycles are not shared
+        self.assertIsNot(
+            experiment.operating_conditions[0], experiment.operating_conditions[5]
+        )
+
+        expected = pybamm.Experiment(self.cycle * 2, termination="80% capacity")
+        self.assertEqual(
+            vars(get_experiment(self.cycle, 2, termination="80% capacity")),
+            vars(expected),
+        )
+
+        experiment_cache.clear()
+        self.assertIsNot(get_experiment(self.cycle, 3), experiment)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import pybamm
+import os
+import csv
+from bot.utils.failure_memo import FailureMemo
+from bot.plotting.config_generator import config_generator
+
+
+class TestFailureMemo(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_failure_memo.json"
+        self.filename = "test_failure_stats.csv"
+        self.chemistry = pybamm.parameter_sets.Ai2020
+        self.params = pybamm.ParameterValues(chemistry=self.chemistry)
+        self.config = {
+            "chemistry": self.chemistry,
+            "models_for_comp": {0: pybamm.lithium_ion.SPM()},
+            "is_experiment": True,
+            "cycle": [
+                (
+                    "Discharge at C/10 for 10 hours or until 3.3 V",
+                    "Rest for 1 hour",
+                    "Charge at 1 A until 4.1 V",
+                    "Hold at 4.1 V until 50 mA",
+                    "Rest for 1 hour",
+                )
+            ],
+            "number": 2,
+            "param_to_vary_info": {
+                "Electrode height [m]": {
+                    "print_name": None,
+                    "bounds": (0.1, None),
+                }
+            },
+            "params": self.params,
+            "varied_values_override": [0.1, 0.5],
+        }
+
+    def tearDown(self):
+        for path in [self.path, self.filename]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_failure_memo(self):
+        failure_memo = FailureMemo(path=self.path)
+
+        key = failure_memo.key(self.config, "parameter comparison")
+        self.assertEqual(key[0], self.chemistry["citation"])
+        self.assertEqual(key[1], "Single Particle Model")
+        self.assertEqual(key[2]["SEI"], "none")
+        self.assertEqual(key[3], "Electrode height [m]")
+        self.assertEqual(key[4], -1)
+        self.assertEqual(key[5], "Discharge-Rest-Charge-Hold-Rest * 2")
+
+        # not enough runs to use the failure rate
+        failure_memo.record(self.config, "parameter comparison", failed=True)
+        self.assertEqual(
+            failure_memo.failure_rate(self.config, "parameter comparison"), 0
+        )
+        self.assertTrue(failure_memo.accept(self.config, "parameter comparison"))
+
+        for _ in range(2):
+            failure_memo.record(self.config, "parameter comparison", failed=True)
+        self.assertEqual(
+            failure_memo.failure_rate(self.config, "parameter comparison"), 1
+        )
+        self.assertFalse(failure_memo.accept(self.config, "parameter comparison"))
+
+        # a different value bucket is a different group
+        self.config["varied_values_override"] = [2, 5]
+        self.assertEqual(
+            failure_memo.failure_rate(self.config, "parameter comparison"), 0
+        )
+        failure_memo.record(self.config, "parameter comparison", failed=False)
+
+        # the values drawn while solving are used instead of the ones of the
+        # configuration
+        self.assertEqual(
+            failure_memo.key(self.config, "parameter comparison", [0.1, 0.5])[4], -1
+        )
+
+        # a configuration whose values are not drawn yet counts the runs of all
+        # the value buckets
+        self.config["varied_values_override"] = None
+        self.assertEqual(
+            failure_memo.failure_rate(self.config, "parameter comparison"), 0.75
+        )
+        self.config["varied_values_override"] = [2, 5]
+
+        stats = failure_memo.stats()
+        self.assertEqual(len(stats), 2)
+        self.assertEqual(stats[0]["failure_rate"], 1)
+        self.assertEqual(stats[0]["runs"], 3)
+        self.assertEqual(stats[1]["failure_rate"], 0)
+
+        failure_memo.export(self.filename)
+        with open(self.filename, "r") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["chemistry"], self.chemistry["citation"])
+        self.assertEqual(rows[0]["failures"], "3")
+
+        config = config_generator(
+            "degradation comparison", failure_memo=failure_memo, max_attempts=2
+        )
+        key = failure_memo.key(config, "degradation comparison")
+        self.assertEqual(key[0], pybamm.parameter_sets.Mohtat2020["citation"])
+        self.assertEqual(key[3], config["degradation_parameter"])
+
+
+if __name__ == "__main__":
+    unittest.main()
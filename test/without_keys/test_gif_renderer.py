@@ -0,0 +1,104 @@
+import unittest
+import pybamm
+import numpy as np
+import os
+from PIL import Image
+from bot.plotting.gif_renderer import (
+    extract_plot_data,
+    render_gif,
+    render_gif_to_budget,
+    render_frames,
+    sample_solution,
+    gif_encodings,
+)
+
+
+class TestGifRenderer(unittest.TestCase):
+    def setUp(self):
+        self.solutions = []
+        for model in [pybamm.lithium_ion.SPM(), pybamm.lithium_ion.SPMe()]:
+            sim = pybamm.Simulation(model)
+            sim.solve([0, 3700])
+            self.solutions.append(sim.solution)
+
+    def tearDown(self):
+        os.remove("plot.gif")
+
+    def test_gif_renderer(self):
+        plot_data = extract_plot_data(self.solutions, ["SPM", "SPMe"], 3)
+
+        self.assertEqual(list(plot_data["labels"]), ["SPM", "SPMe"])
+        self.assertEqual(len(plot_data["frame_times"]), 3)
+        self.assertIn("Terminal voltage [V]", plot_data["variables"])
+        for i in range(2):
+            for j, var in enumerate(plot_data["variables"]):
+                if var == "Terminal voltage [V]":
+                    self.assertEqual(
+                        plot_data[f"y{i}_{j}"].shape, plot_data[f"t{i}"].shape
+                    )
+                elif var == "Electrolyte concentration [mol.m-3]":
+                    self.assertEqual(
+                        plot_data[f"y{i}_{j}"].shape,
+                        (3, len(plot_data[f"x{i}_{j}"])),
+                    )
+
+        render_gif(plot_data, duration=1)
+
+        gif = Image.open("plot.gif")
+        self.assertEqual(gif.n_frames, 3)
+        # the frames are drawn at the size of Twitter
+        self.assertEqual(gif.size, (1440, 672))
+        gif.close()
+
+        render_gif(plot_data, duration=1, size=1080)
+
+        gif = Image.open("plot.gif")
+        self.assertEqual(gif.size, (1080, 504))
+        gif.close()
+
+        # the frames rendered by worker processes are the same, and in order
+        images = list(render_frames(plot_data, size=720))
+        parallel_images = list(
+            render_frames(plot_data, size=720, processes=2, slice_size=1)
+        )
+        self.assertEqual(len(parallel_images), 3)
+        for image, parallel_image in zip(images, parallel_images):
+            self.assertEqual(image.shape, (336, 720, 4))
+            np.testing.assert_array_equal(image, parallel_image)
+
+        # the best encoding which fits in the budget
+        self.assertEqual(render_gif_to_budget(plot_data, duration=1), gif_encodings[0])
+        max_bytes = os.path.getsize("plot.gif")
+        encoding = render_gif_to_budget(plot_data, duration=1, max_bytes=max_bytes)
+
+        self.assertNotEqual(encoding, gif_encodings[0])
+        self.assertLess(os.path.getsize("plot.gif"), max_bytes)
+        gif = Image.open("plot.gif")
+        self.assertEqual(gif.size[0], encoding[0])
+        gif.close()
+
+        # samples on a uniform time grid give the same frames
+        samples = [
+            sample_solution(solution, number_of_points=12)
+            for solution in self.solutions
+        ]
+        self.assertEqual(len(samples[0]["t"]), 12)
+        self.assertEqual(samples[0]["t"][-1], self.solutions[0]["Time [s]"].entries[-1])
+        sampled_plot_data = extract_plot_data(samples, ["SPM", "SPMe"], 3)
+        self.assertEqual(
+            list(sampled_plot_data["variables"]), list(plot_data["variables"])
+        )
+        np.testing.assert_array_equal(
+            sampled_plot_data["frame_times"], plot_data["frame_times"]
+        )
+        for i in range(2):
+            for j in range(len(plot_data["variables"])):
+                y = sampled_plot_data[f"y{i}_{j}"]
+                if y.ndim == 1:
+                    self.assertEqual(y.shape, (12,))
+                else:
+                    self.assertEqual(y.shape, plot_data[f"y{i}_{j}"].shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
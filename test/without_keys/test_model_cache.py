@@ -0,0 +1,111 @@
+import unittest
+import shutil
+import pybamm
+from bot.utils.model_cache import ModelCache
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_model_cache"
+        self.chemistry = pybamm.parameter_sets.Marquis2019
+        self.params = pybamm.ParameterValues(chemistry=self.chemistry)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_model_cache(self):
+        model_cache = ModelCache(path=self.path, max_size=2)
+
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, self.params
+        )
+
+        self.assertIsNotNone(sim.built_model)
+        self.assertEqual(inputs, {})
+        self.assertEqual(model_cache.stats(), {"hits": 0, "misses": 1, "size": 1})
+
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, self.params
+        )
+        sim.solve([0, 3600], inputs=inputs)
+
+        self.assertIsNotNone(sim.solution)
+        self.assertEqual(model_cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+        # the parameters which differ from the default parameter values are input
+        # parameters, and the configurations which differ only in their values
+        # share the built simulation
+        params = self.params.copy()
+        params["Current function [A]"] = 1
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+
+        self.assertEqual(inputs, {"Current function [A]": 1})
+        self.assertEqual(model_cache.stats(), {"hits": 1, "misses": 2, "size": 2})
+
+        params["Current function [A]"] = 2
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+        sim.solve([0, 3600], inputs=inputs)
+
+        self.assertEqual(inputs, {"Current function [A]": 2})
+        self.assertEqual(model_cache.stats(), {"hits": 2, "misses": 2, "size": 2})
+
+        # the solution is the same as the one with the baked parameter values
+        expected = pybamm.Simulation(
+            pybamm.lithium_ion.SPM(), parameter_values=params
+        ).solve([0, 3600])
+        self.assertAlmostEqual(
+            sim.solution["Terminal voltage [V]"].entries[-1],
+            expected["Terminal voltage [V]"].entries[-1],
+            places=5,
+        )
+
+        # a geometric parameter can not be an input parameter and is baked into
+        # the built simulation
+        params = self.params.copy()
+        params["Negative electrode thickness [m]"] = 2e-4
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+
+        self.assertEqual(inputs, {})
+        self.assertIsNotNone(sim.built_model)
+
+        # the least recently used entry is evicted
+        self.assertEqual(model_cache.stats(), {"hits": 2, "misses": 4, "size": 2})
+
+        # the cache persists across objects, and the failed build with the input
+        # parameter is not tried again
+        model_cache = ModelCache(path=self.path, max_size=2)
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+
+        self.assertEqual(inputs, {})
+        self.assertEqual(model_cache.stats(), {"hits": 1, "misses": 0, "size": 2})
+
+    def test_warm_up(self):
+        model_cache = ModelCache(path=self.path)
+        model_cache.warm_up([pybamm.lithium_ion.SPM()], [self.chemistry])
+
+        self.assertEqual(model_cache.stats(), {"hits": 0, "misses": 1, "size": 1})
+
+        # a request with its own current and temperature hits the built simulation
+        params = self.params.copy()
+        params["Current function [A]"] = 1
+        params["Ambient temperature [K]"] = 300
+        sim, inputs = model_cache.get_simulation(
+            pybamm.lithium_ion.SPM(), self.chemistry, params
+        )
+
+        self.assertEqual(
+            inputs, {"Current function [A]": 1, "Ambient temperature [K]": 300}
+        )
+        self.assertEqual(model_cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
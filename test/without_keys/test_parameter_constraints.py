@@ -0,0 +1,78 @@
+import unittest
+import pybamm
+import numpy as np
+from bot.utils.parameter_constraints import constrain_bounds, check_parameter_value
+from bot.utils.parameter_value_generator import (
+    parameter_value_generator,
+    parameter_bounds,
+)
+
+
+class TestParameterConstraints(unittest.TestCase):
+    def test_constrain_bounds(self):
+        chemistry = pybamm.parameter_sets.Chen2020
+        params = pybamm.ParameterValues(chemistry=chemistry)
+
+        # the pores and the active material fill the whole negative electrode
+        porosity = params["Negative electrode porosity"]
+        lower_bound, upper_bound = parameter_bounds(
+            params, "Negative electrode porosity", (None, None)
+        )
+        self.assertEqual(lower_bound, porosity * 0.5)
+        self.assertAlmostEqual(
+            upper_bound,
+            1 - params["Negative electrode active material volume fraction"],
+        )
+
+        for _ in range(10):
+            new_params = parameter_value_generator(
+                params.copy(), {"Negative electrode porosity": (None, None)}
+            )
+            self.assertLessEqual(
+                new_params["Negative electrode porosity"]
+                + new_params["Negative electrode active material volume fraction"],
+                1 + 1e-12,
+            )
+
+        with self.assertRaises(ValueError):
+            constrain_bounds(params, "Negative electrode porosity", (1.1, 1.5))
+
+        # a function is scaled by a positive value
+        self.assertEqual(
+            constrain_bounds(
+                params, "Negative electrode exchange-current density [A.m-2]", (-1, 2)
+            ),
+            (np.nextafter(0, 1), 2),
+        )
+
+        chemistry = pybamm.parameter_sets.Ai2020
+        params = pybamm.ParameterValues(chemistry=chemistry)
+
+        lower_bound, upper_bound = parameter_bounds(
+            params, "Negative electrode Poisson's ratio", (None, None)
+        )
+        # the bounds are inside the open domain
+        self.assertLess(upper_bound, 0.5)
+        check_parameter_value(params, "Negative electrode Poisson's ratio", upper_bound)
+
+    def test_check_parameter_value(self):
+        chemistry = pybamm.parameter_sets.Chen2020
+        params = pybamm.ParameterValues(chemistry=chemistry)
+
+        check_parameter_value(params, "Negative electrode porosity", 0.2)
+        check_parameter_value(params, "Lower voltage cut-off [V]", -1)
+
+        with self.assertRaises(ValueError):
+            check_parameter_value(params, "Negative electrode porosity", 1.2)
+        with self.assertRaises(ValueError):
+            check_parameter_value(params, "Negative electrode porosity", 0.5)
+        with self.assertRaises(ValueError):
+            check_parameter_value(params, "Electrode height [m]", 0)
+        with self.assertRaises(ValueError):
+            check_parameter_value(
+                params, "Negative electrode exchange-current density [A.m-2]", -2
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
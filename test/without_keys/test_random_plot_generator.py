@@ -74,6 +74,12 @@ class TestRandomPlotGenerator(unittest.TestCase):
         self.assertEqual(return_dict["degradation_value"], "reaction limited")
         pybamm.Experiment(return_dict["cycle"] * return_dict["number"])
 
+        # a failing reply configuration is not retried
+        with self.assertRaises(KeyError):
+            random_plot_generator(
+                {}, "degradation comparison", {"model": model}, testing=True
+            )
+
         manager = multiprocessing.Manager()
         return_dict = manager.dict()
 
@@ -0,0 +1,57 @@
+import unittest
+import shutil
+import os
+from bot.utils.render_queue import RenderQueue
+
+
+class TestRenderQueue(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_render_queue"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        for plot in ["plot.gif", "plot.png"]:
+            if os.path.exists(plot):
+                os.remove(plot)
+
+    def test_render_queue(self):
+        render_queue = RenderQueue(path=self.path)
+
+        self.assertEqual(len(render_queue), 0)
+        self.assertIsNone(render_queue.first())
+
+        for plot, choice in [
+            ("plot.gif", "model comparison"),
+            ("plot.png", "degradation comparison"),
+        ]:
+            with open(plot, "wb") as f:
+                f.write(b"plot")
+            render_queue.push(plot, {"choice": choice, "config": {"number": 500}})
+            # the plot is moved into the queue
+            assert not os.path.exists(plot)
+
+        self.assertEqual(len(render_queue), 2)
+
+        # the oldest plot is returned first, and stays in the queue until it is
+        # removed
+        entry, plot, description = render_queue.first()
+        self.assertEqual(plot, os.path.join(entry, "plot.gif"))
+        assert os.path.exists(plot)
+        self.assertEqual(
+            description, {"choice": "model comparison", "config": {"number": 500}}
+        )
+        self.assertEqual(render_queue.first()[0], entry)
+        self.assertEqual(len(render_queue), 2)
+
+        render_queue.remove(entry)
+        self.assertEqual(len(render_queue), 1)
+
+        entry, plot, description = render_queue.first()
+        self.assertEqual(plot, os.path.join(entry, "plot.png"))
+        self.assertEqual(description["choice"], "degradation comparison")
+        render_queue.remove(entry)
+        self.assertIsNone(render_queue.first())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,8 @@ class TestResizeGif(unittest.TestCase):
 
         gif = Image.open("plot.gif")
         width, height = gif.size
+        # every frame is written
+        self.assertEqual(gif.n_frames, 3)
         gif.close()
 
         del gif
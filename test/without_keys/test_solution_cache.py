@@ -0,0 +1,52 @@
+import unittest
+import shutil
+import numpy as np
+from bot.utils.solution_cache import SolutionCache
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.path = "test_solution_cache"
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_solution_cache(self):
+        solution_cache = SolutionCache(path=self.path)
+
+        key = solution_cache.key("Chen2020", [("Discharge at 1C until 3.3 V",)], 2)
+
+        self.assertEqual(
+            key, solution_cache.key("Chen2020", [("Discharge at 1C until 3.3 V",)], 2)
+        )
+        self.assertNotEqual(
+            key, solution_cache.key("Chen2020", [("Discharge at 1C until 3.3 V",)], 3)
+        )
+        self.assertIsNone(solution_cache.get(key))
+
+        arrays = {
+            "labels": np.array(["SPM", "DFN"]),
+            "y0_0": np.linspace(0, 1, 100),
+            "y1_0": np.ones((3, 20)),
+        }
+        solution_cache.put(key, arrays)
+        cached_arrays = solution_cache.get(key)
+
+        self.assertEqual(list(cached_arrays["labels"]), ["SPM", "DFN"])
+        np.testing.assert_array_equal(cached_arrays["y0_0"], arrays["y0_0"])
+        np.testing.assert_array_equal(cached_arrays["y1_0"], arrays["y1_0"])
+        self.assertEqual(solution_cache.stats()["hits"], 1)
+        self.assertEqual(solution_cache.stats()["misses"], 1)
+        self.assertEqual(solution_cache.stats()["size"], 1)
+
+        # the least recently used entries are evicted to fit in the byte budget
+        solution_cache.max_bytes = solution_cache.stats()["bytes"]
+        solution_cache.put("new_key", arrays)
+
+        self.assertEqual(solution_cache.stats()["size"], 1)
+        self.assertIsNone(solution_cache.get(key))
+        self.assertIsNotNone(solution_cache.get("new_key"))
+
+
+if __name__ == "__main__":
+    unittest.main()